@@ -0,0 +1,50 @@
+"""
+Разрешение зависимости: строковый ключ через IoC.resolve против ключа-типа
+через IoCContainer.resolve.
+
+Запуск:
+    python -m benchmarks.homework_5.bench_ioc_container
+"""
+
+import threading
+import time
+
+from homeworks.homework_5 import IoC, IoCContainer
+
+CALLS = 1_000_000
+KEYS = 200
+
+
+def setup() -> list[type]:
+    IoC._strategies.clear()
+    IoC._scopes.clear()
+    IoC._current_scope = threading.local()
+    types = [type(f"Service{number}", (), {}) for number in range(KEYS)]
+    for service in types:
+        IoC.resolve("IoC.RegisterGlobal", f"Services.{service.__name__}", service).execute()
+        IoCContainer.register_global(service, service)
+    IoC.resolve("Scopes.New", "game").execute()
+    IoC.resolve("Scopes.Current", "game").execute()
+    return types
+
+
+def per_call(resolve, key) -> float:
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        resolve(key)
+    return (time.perf_counter() - start) / CALLS
+
+
+def main() -> None:
+    service = setup()[KEYS // 2]
+    string_key = f"Services.{service.__name__}"
+    string_time = per_call(IoC.resolve, string_key)
+    typed_time = per_call(IoCContainer.resolve, service)
+    print("ns per resolve")
+    print(f"string key (IoC.resolve):        {string_time * 1e9:5.0f}")
+    print(f"type key (IoCContainer.resolve): {typed_time * 1e9:5.0f}", end="")
+    print(f"  (x{string_time / typed_time:.2f})")
+
+
+if __name__ == "__main__":
+    main()
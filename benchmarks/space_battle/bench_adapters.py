@@ -0,0 +1,48 @@
+"""
+Вызовы адаптера: написанный вручную RotatableObjectAdapter против сгенерированного
+generate_adapter(RotatableObjectInterface), плюс стоимость генерации класса.
+
+Запуск:
+    python -m benchmarks.space_battle.bench_adapters
+"""
+
+import time
+from collections.abc import Callable
+
+from homeworks.space_battle.adapters import RotatableObjectAdapter, generate_adapter
+from homeworks.space_battle.interfaces import RotatableObjectInterface
+from homeworks.space_battle.models import Angle
+from homeworks.space_battle.uobject import UObject
+
+CALLS = 1_000_000
+
+
+def per_call(operation: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        operation()
+    return (time.perf_counter() - start) / CALLS
+
+
+def main() -> None:
+    start = time.perf_counter()
+    generated_cls = generate_adapter.__wrapped__(RotatableObjectInterface)
+    generation = time.perf_counter() - start
+
+    ship = UObject()
+    ship.set_property("angle", Angle(10))
+    hand_written = RotatableObjectAdapter(ship)
+    generated = generated_cls(ship)
+    angle = Angle(20)
+    print(f"class generation: {generation * 1e6:.0f} us (once per interface)")
+    print("ns per call: hand-written / generated")
+    for name, before, after in (
+        ("get_angle", hand_written.get_angle, generated.get_angle),
+        ("set_angle", lambda: hand_written.set_angle(angle), lambda: generated.set_angle(angle)),
+        ("construct", lambda: RotatableObjectAdapter(ship), lambda: generated_cls(ship)),
+    ):
+        print(f"{name}: {per_call(before) * 1e9:5.0f} / {per_call(after) * 1e9:5.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Задержка IoC.resolve: цепочка сравнений и поиск по скоупам на каждый вызов
+против таблицы встроенных команд и кеша разрешения текущего потока.
+Пропускная способность resolve при росте числа потоков-читателей и фоновых регистрациях.
+Стоимость смены скоупа и resolve при хранении скоупа в threading.local и в contextvars.
+Число живых скоупов после череды игр, скоупы которых привязаны к объекту игры.
+Скомпилированный ключ (IoC.compile) против resolve и прямого вызова фабрики.
+Стоимость resolve с включённым и выключенным IoCInstrumentation.
+
+Запуск:
+    python -m benchmarks.space_battle.bench_ioc
+"""
+
+import threading
+import time
+from typing import Any
+
+from homeworks.space_battle.ioc import (
+    ClearScopeCommand,
+    IoC,
+    NewScopeCommand,
+    RegisterCommand,
+    RegisterGlobalCommand,
+    SetCurrentScopeCommand,
+)
+from homeworks.space_battle.ioc_instrumentation import IoCInstrumentation
+
+CALLS = 1_000_000
+KEYS = 50
+
+
+class LegacyIoC(IoC):
+    """Прежняя реализация resolve без таблицы встроенных команд и без кеша."""
+
+    @classmethod
+    def resolve(cls, key: str, *args, **kwargs) -> Any:
+        if key == "IoC.Register":
+            return RegisterCommand(*args, **kwargs)
+        if key == "IoC.RegisterGlobal":
+            return RegisterGlobalCommand(*args, **kwargs)
+        if key == "Scopes.New":
+            return NewScopeCommand(*args, **kwargs)
+        if key == "Scopes.Current":
+            return SetCurrentScopeCommand(*args, **kwargs)
+        if key == "Scopes.Clear":
+            return ClearScopeCommand(*args, **kwargs)
+        return cls._resolve_dependency(key, *args, **kwargs)
+
+    @classmethod
+    def _resolve_dependency(cls, key: str, *args, **kwargs) -> Any:
+        scope_data = cls._get_scope_data(cls._get_current_scope_id())
+        if key in scope_data:
+            strategy = scope_data[key]
+            return strategy(*args, **kwargs) if callable(strategy) else strategy
+        if key in cls._strategies:
+            strategy = cls._strategies[key]
+            return strategy(*args, **kwargs) if callable(strategy) else strategy
+        raise ValueError(f"Зависимость '{key}' не найдена")
+
+
+def setup() -> None:
+    IoC._strategies.clear()
+    IoC._scopes.clear()
+    IoC._current_scope = threading.local()
+    for number in range(KEYS):
+        IoC.resolve("IoC.RegisterGlobal", f"global.{number}", number).execute()
+    IoC.resolve("Scopes.New", "game").execute()
+    IoC.resolve("Scopes.Current", "game").execute()
+    IoC.resolve("IoC.Register", "Game.Speed", lambda: 5).execute()
+
+
+def latency(ioc: type[IoC], key: str) -> float:
+    resolve = ioc.resolve
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        resolve(key)
+    return (time.perf_counter() - start) / CALLS
+
+
+def threaded_throughput(threads: int) -> float:
+    """Число resolve в секунду суммарно по всем читателям, пока писатель регистрирует ключи."""
+    calls = CALLS // threads
+    stop = threading.Event()
+
+    def reader() -> None:
+        IoC.resolve("Scopes.Current", "game").execute()
+        for _ in range(calls):
+            IoC.resolve("Game.Speed")
+
+    def writer() -> None:
+        number = 0
+        while not stop.wait(0.001):
+            IoC.resolve("IoC.RegisterGlobal", f"writer.{number % KEYS}", number).execute()
+            number += 1
+
+    writer_thread = threading.Thread(target=writer)
+    readers = [threading.Thread(target=reader) for _ in range(threads)]
+    writer_thread.start()
+    start = time.perf_counter()
+    for thread in readers:
+        thread.start()
+    for thread in readers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    writer_thread.join()
+    return calls * threads / elapsed
+
+
+def scope_costs() -> tuple[float, float]:
+    """Время Scopes.Current и resolve в скоупе для текущего хранилища скоупа, нс."""
+    set_scope = IoC.resolve("Scopes.Current", "game")
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        set_scope.execute()
+    switch = (time.perf_counter() - start) / CALLS
+    return switch, latency(IoC, "Game.Speed")
+
+
+class Game:
+    """Владелец скоупа: пока объект игры жив, жив и её скоуп."""
+
+
+def scope_churn(games: int) -> tuple[int, int]:
+    """Сыграть games игр подряд, каждая со своим скоупом; вернуть (живых скоупов, байт)."""
+    for number in range(games):
+        game = Game()
+        IoC.resolve("Scopes.New", f"game.{number}", owner=game).execute()
+        IoC.resolve("Scopes.Current", f"game.{number}").execute()
+        IoC.resolve("IoC.Register", "Game.Speed", number).execute()
+        IoC.resolve("Game.Speed")
+    IoC.resolve("Scopes.Current", "root").execute()
+    stats = IoC.scope_stats()
+    return stats.live, stats.bytes
+
+
+def compiled_costs() -> tuple[float, float, float]:
+    """Время создания команды через resolve, через скомпилированный ключ и напрямую, нс."""
+
+    def factory(uobj: object) -> tuple[object]:
+        return (uobj,)
+
+    IoC.resolve("IoC.Register", "Commands.MoveWithFuel", factory).execute()
+    resolver = IoC.compile("Commands.MoveWithFuel")
+    ship = object()
+    timings = []
+    for call in (
+        lambda: IoC.resolve("Commands.MoveWithFuel", ship),
+        lambda: resolver(ship),
+        lambda: factory(ship),
+    ):
+        start = time.perf_counter()
+        for _ in range(CALLS):
+            call()
+        timings.append((time.perf_counter() - start) / CALLS)
+    return timings[0], timings[1], timings[2]
+
+
+def main() -> None:
+    setup()
+    print("ns per resolve")
+    for key in ("Game.Speed", "global.0"):
+        before = latency(LegacyIoC, key)
+        after = latency(IoC, key)
+        print(f"{key:<11} legacy {before * 1e9:6.0f}  cached {after * 1e9:6.0f}", end="")
+        print(f"  (x{before / after:.2f})")
+
+    thread_switch, thread_resolve = scope_costs()
+    IoC.use_context_scopes()
+    context_switch, context_resolve = scope_costs()
+    IoC.use_thread_scopes()
+    print("ns per scope switch / resolve")
+    print(f"threading.local: {thread_switch * 1e9:5.0f} / {thread_resolve * 1e9:5.0f}")
+    print(f"contextvars:     {context_switch * 1e9:5.0f} / {context_resolve * 1e9:5.0f}")
+
+    IoC.resolve("Scopes.Current", "game").execute()
+    disabled = latency(IoC, "Game.Speed")
+    instrumentation = IoCInstrumentation()
+    instrumentation.enable()
+    enabled = latency(IoC, "Game.Speed")
+    instrumentation.disable()
+    print("ns per resolve with instrumentation")
+    print(f"disabled: {disabled * 1e9:5.0f}")
+    print(f"enabled:  {enabled * 1e9:5.0f}")
+
+    resolve_time, compiled_time, direct_time = compiled_costs()
+    print("ns per command construction")
+    print(f"IoC.resolve: {resolve_time * 1e9:5.0f}")
+    print(f"IoC.compile: {compiled_time * 1e9:5.0f}")
+    print(f"direct call: {direct_time * 1e9:5.0f}")
+
+    for games in (1_000, 10_000):
+        live, size = scope_churn(games)
+        print(f"after {games:>6} owned games: {live} live scopes, {size} bytes")
+
+    print("resolves per second with a concurrent writer")
+    for threads in (1, 2, 4, 8):
+        print(f"{threads} reader threads: {threaded_throughput(threads):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Время потока игрового цикла на LogCommand: print на каждую ошибку против буфера LogSink.
+
+Запуск:
+    python -m benchmarks.space_battle.bench_log_sink
+
+Вывод идёт в канал к дочернему процессу с построчной буферизацией, как stdout в терминале:
+print делает системный вызов на каждую строку, LogSink — один на пачку записей.
+Для сравнения тот же замер с выводом в os.devnull без построчной буферизации:
+там ввод-вывод почти бесплатен, и фоновый поток лишь делит GIL с потоком цикла.
+"""
+
+import contextlib
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import TextIO
+
+from homeworks.space_battle.commands import LogCommand
+from homeworks.space_battle.interfaces import CommandInterface
+from homeworks.space_battle.log_sink import LogSink
+
+RECORDS = 200_000
+
+
+class MoveCommand(CommandInterface):
+    def execute(self) -> None:
+        pass
+
+
+def make_commands(sink: LogSink | None) -> list[LogCommand]:
+    command = MoveCommand()
+    return [
+        LogCommand(exc=RuntimeError(f"fail {number}"), command=command, sink=sink)
+        for number in range(RECORDS)
+    ]
+
+
+def bench(commands: list[LogCommand]) -> float:
+    start = time.perf_counter()
+    for command in commands:
+        command.execute()
+    return time.perf_counter() - start
+
+
+def bench_stream(stream: TextIO) -> tuple[float, float]:
+    with contextlib.redirect_stdout(stream):
+        printed = bench(make_commands(None))
+    with LogSink(stream, capacity=65_536) as sink:
+        buffered = bench(make_commands(sink))
+    return printed, buffered
+
+
+def bench_pipe() -> tuple[float, float]:
+    reader = subprocess.Popen(  # noqa: S603
+        [sys.executable, "-c", "import sys\nfor _ in sys.stdin.buffer: pass"],
+        stdin=subprocess.PIPE,
+        text=True,
+    )
+    reader.stdin.reconfigure(line_buffering=True)
+    try:
+        return bench_stream(reader.stdin)
+    finally:
+        reader.stdin.close()
+        reader.wait()
+
+
+def main() -> None:
+    print(f"{RECORDS} LogCommand, ns per record on the loop thread")
+    with Path(os.devnull).open("w") as devnull:
+        rows = (("line-buffered pipe", bench_pipe()), ("devnull", bench_stream(devnull)))
+    for name, (printed, buffered) in rows:
+        print(
+            f"{name:<18} print {printed / RECORDS * 1e9:7.0f}"
+            f"  LogSink {buffered / RECORDS * 1e9:7.0f}  (x{printed / buffered:.2f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Память и скорость Point/Vector/Angle: прежние dataclass без __slots__ против текущих.
+
+Запуск:
+    python -m benchmarks.space_battle.bench_models
+"""
+
+import math
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeworks.space_battle.models import Angle, Point, Vector
+
+OBJECTS = 100_000
+REPEAT = 1_000_000
+
+
+@dataclass
+class LegacyPoint:
+    x: int
+    y: int
+
+    def __add__(self, other: "LegacyVector") -> "LegacyPoint":
+        if not isinstance(other, LegacyVector):
+            return NotImplemented
+        return LegacyPoint(int(self.x + other.x), int(self.y + other.y))
+
+
+@dataclass
+class LegacyVector:
+    x: int
+    y: int
+
+
+@dataclass(frozen=True)
+class LegacyAngle:
+    degrees: int
+
+    def radians(self) -> float:
+        return math.radians(self.degrees)
+
+    def __add__(self, other: "LegacyAngle") -> "LegacyAngle":
+        if isinstance(other, LegacyAngle):
+            return LegacyAngle(self.degrees + other.degrees)
+        return NotImplemented
+
+
+def allocated_bytes(factory: Callable[[int], object]) -> int:
+    tracemalloc.start()
+    objects = [factory(number) for number in range(OBJECTS)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def throughput(operation: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        operation()
+    return REPEAT / (time.perf_counter() - start)
+
+
+def legacy_move_step(location: LegacyPoint, velocity: LegacyVector) -> LegacyPoint:
+    # Прежний Move: копия в get_location, сложение, копия в set_location
+    moved = LegacyPoint(int(location.x), int(location.y)) + velocity
+    return LegacyPoint(int(moved.x), int(moved.y))
+
+
+def main() -> None:
+    legacy_memory = allocated_bytes(lambda number: LegacyPoint(number, number))
+    memory = allocated_bytes(lambda number: Point(number, number))
+    print(f"{OBJECTS} points, bytes per object")
+    print(f"legacy dataclass: {legacy_memory / OBJECTS:6.1f}")
+    print(f"slotted:          {memory / OBJECTS:6.1f}")
+
+    legacy_point, legacy_vector = LegacyPoint(1, 2), LegacyVector(3, 4)
+    point, vector = Point(1, 2), Vector(3, 4)
+    legacy_angle, legacy_delta = LegacyAngle(10), LegacyAngle(5)
+    angle, delta = Angle(10), Angle(5)
+    rows = (
+        ("Point + Vector", lambda: legacy_point + legacy_vector, lambda: point + vector),
+        ("Angle + Angle", lambda: legacy_angle + legacy_delta, lambda: angle + delta),
+        (
+            "Move step",
+            lambda: legacy_move_step(legacy_point, legacy_vector),
+            lambda: point + vector,
+        ),
+    )
+    print("ops per second")
+    for name, legacy, current in rows:
+        before = throughput(legacy)
+        after = throughput(current)
+        print(f"{name}: legacy {before:>12,.0f}  current {after:>12,.0f}  (x{after / before:.2f})")
+
+
+if __name__ == "__main__":
+    main()
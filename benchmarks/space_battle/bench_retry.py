@@ -0,0 +1,164 @@
+"""
+Повторы команд при временной ошибке.
+
+Запуск:
+    python -m benchmarks.space_battle.bench_retry
+
+Все обработчики зарегистрированы в ExceptionsStorage, команды выполняет GameServer.
+
+1) Немедленная постановка повтора в очередь против отложенной: FLAKY команд падают
+первые OUTAGE секунд, параллельно каждый тик приходит HEALTHY исправных команд,
+ошибки обрабатывает RetryIfExceptionHandler. Считается, сколько раз упавшие команды
+выполнялись впустую и сколько исправных команд успело выполниться за то же время.
+
+2) Цепочка обёрток RetryTwiceThenLogExceptionHandler против одной обёртки-счётчика
+RetryNThenLogExceptionHandler: COMMANDS команд падают трижды — два повтора и запись
+в лог; время на команду, включая её выполнения сервером.
+
+3) Повторы без предохранителя и с CircuitBreakerExceptionHandler, когда команда одного
+типа падает всегда: каждый тик приходит BROKEN таких команд и HEALTHY исправных.
+"""
+
+import contextlib
+import os
+import time
+from pathlib import Path
+
+from homeworks.space_battle.circuit_breaker import (
+    CircuitBreakerConfig,
+    CircuitBreakerExceptionHandler,
+)
+from homeworks.space_battle.handlers import (
+    ExceptionsStorage,
+    RetryExceptionHandler,
+    RetryIfExceptionHandler,
+    RetryNThenLogExceptionHandler,
+    RetryTwiceThenLogExceptionHandler,
+)
+from homeworks.space_battle.interfaces import CommandInterface
+from homeworks.space_battle.retry import Backoff, RetryScheduler
+from homeworks.space_battle.server import GameServer, SoftStopCommand, TickConfig
+
+FLAKY = 2_000
+HEALTHY = 200
+OUTAGE = 0.2
+DURATION = 0.4
+TICK_BUDGET = 0.002
+COMMANDS = 100_000
+BROKEN = 50
+
+
+class FlakyCommand(CommandInterface):
+    available_at = 0.0
+    failures = 0
+
+    def execute(self) -> None:
+        if time.perf_counter() < FlakyCommand.available_at:
+            FlakyCommand.failures += 1
+            raise RuntimeError("temporarily unavailable")
+
+
+class BrokenCommand(CommandInterface):
+    failures = 0
+
+    def execute(self) -> None:
+        BrokenCommand.failures += 1
+        raise RuntimeError("config error")
+
+
+class HealthyCommand(CommandInterface):
+    executed = 0
+
+    def execute(self) -> None:
+        HealthyCommand.executed += 1
+
+
+def bench(*, scheduler_enabled: bool) -> tuple[int, int]:
+    server = GameServer(tick_config=TickConfig(budget=TICK_BUDGET))
+    if scheduler_enabled:
+        server.retry_scheduler = RetryScheduler(server.queue)
+    handler = RetryIfExceptionHandler(
+        queue=server.queue,
+        scheduler=server.retry_scheduler,
+        backoff=Backoff(base=0.01, max_delay=0.1),
+    )
+    ExceptionsStorage.clear()
+    ExceptionsStorage.register(FlakyCommand, RuntimeError, handler)
+    FlakyCommand.failures = HealthyCommand.executed = 0
+    healthy = HealthyCommand()
+    for _ in range(FLAKY):
+        server.put(FlakyCommand())
+    start = time.perf_counter()
+    FlakyCommand.available_at = start + OUTAGE
+    while time.perf_counter() - start < DURATION:
+        for _ in range(HEALTHY):
+            server.put(healthy)
+        server.run_tick()
+    ExceptionsStorage.clear()
+    return FlakyCommand.failures, HealthyCommand.executed
+
+
+def bench_handler(handler_cls: type[RetryExceptionHandler], **kwargs) -> float:
+    """Каждая команда падает трижды: два повтора и запись в лог."""
+    server = GameServer()
+    ExceptionsStorage.clear()
+    ExceptionsStorage.register(
+        BrokenCommand, RuntimeError, handler_cls(queue=server.queue, **kwargs)
+    )
+    for _ in range(COMMANDS):
+        server.put(BrokenCommand())
+    server.put(SoftStopCommand(server=server))
+    with Path(os.devnull).open("w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        server.run()
+        elapsed = time.perf_counter() - start
+    ExceptionsStorage.clear()
+    return elapsed
+
+
+def bench_breaker(*, breaker_enabled: bool) -> tuple[int, int]:
+    server = GameServer(tick_config=TickConfig(budget=TICK_BUDGET))
+    handler = RetryNThenLogExceptionHandler(queue=server.queue, retries=3)
+    if breaker_enabled:
+        handler = CircuitBreakerExceptionHandler(
+            handler, config=CircuitBreakerConfig(failure_threshold=20, window=0.1)
+        )
+    ExceptionsStorage.clear()
+    ExceptionsStorage.register(BrokenCommand, RuntimeError, handler)
+    BrokenCommand.failures = HealthyCommand.executed = 0
+    healthy = HealthyCommand()
+    # LogCommand после исчерпания повторов печатает в stdout
+    with Path(os.devnull).open("w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        while time.perf_counter() - start < DURATION:
+            for _ in range(BROKEN):
+                server.put(BrokenCommand())
+            for _ in range(HEALTHY):
+                server.put(healthy)
+            server.run_tick()
+    ExceptionsStorage.clear()
+    return BrokenCommand.failures, HealthyCommand.executed
+
+
+def main() -> None:
+    print(f"{FLAKY} flaky commands, outage {OUTAGE * 1e3:.0f} ms, {DURATION * 1e3:.0f} ms of ticks")
+    for name, enabled in (("immediate retry", False), ("delayed + backoff", True)):
+        failures, executed = bench(scheduler_enabled=enabled)
+        print(f"{name:<18} failed attempts {failures:>9,}  healthy executed {executed:>9,}")
+
+    print(f"{COMMANDS} commands x 3 failures")
+    for name, handler_cls, kwargs in (
+        ("wrapper chain", RetryTwiceThenLogExceptionHandler, {}),
+        ("attempt counter", RetryNThenLogExceptionHandler, {"retries": 2}),
+    ):
+        elapsed = bench_handler(handler_cls, **kwargs)
+        print(f"{name:<15} {elapsed / COMMANDS * 1e9:7.0f} ns/command")
+
+    print(f"{BROKEN} always failing + {HEALTHY} healthy commands per tick, RetryN(3)")
+    for name, enabled in (("no breaker", False), ("circuit breaker", True)):
+        failures, executed = bench_breaker(breaker_enabled=enabled)
+        print(f"{name:<18} failed attempts {failures:>9,}  healthy executed {executed:>9,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Пропускная способность игрового цикла GameServer.
+
+Запуск:
+    python -m benchmarks.space_battle.bench_server
+
+Накладные расходы цикла на команду считаются как разница с «голым» циклом,
+который просто вызывает execute() у команд из списка.
+"""
+
+import time
+
+from homeworks.space_battle.interfaces import CommandInterface
+from homeworks.space_battle.server import GameServer, SoftStopCommand
+
+COMMANDS = 500_000
+
+
+class NoopCommand(CommandInterface):
+    def execute(self) -> None:
+        pass
+
+
+def bench_bare_loop(commands: list[CommandInterface]) -> float:
+    start = time.perf_counter()
+    for command in commands:
+        command.execute()
+    return time.perf_counter() - start
+
+
+def bench_server(commands: list[CommandInterface], workers: int) -> float:
+    server = GameServer(workers=workers)
+    for command in commands:
+        server.put(command)
+    server.put(SoftStopCommand(server=server))
+    start = time.perf_counter()
+    if workers == 1:
+        server.run()
+    else:
+        server.start()
+        server.join()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    command = NoopCommand()
+    commands = [command] * COMMANDS
+    bare = bench_bare_loop(commands)
+    print(
+        f"bare loop:         {COMMANDS / bare:>12,.0f} cmd/s  {bare / COMMANDS * 1e9:>7.0f} ns/cmd"
+    )
+    for workers in (1, 4):
+        elapsed = bench_server(commands, workers)
+        overhead = (elapsed - bare) / COMMANDS * 1e9
+        print(
+            f"server, {workers} worker(s): {COMMANDS / elapsed:>12,.0f} cmd/s"
+            f"  {elapsed / COMMANDS * 1e9:>7.0f} ns/cmd  (+{overhead:.0f} ns overhead)"
+        )
+
+
+if __name__ == "__main__":
+    main()
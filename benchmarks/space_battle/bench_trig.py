@@ -0,0 +1,61 @@
+"""
+Тик движения 10k кораблей: тригонометрия на каждый вызов против таблиц и кеша вектора скорости.
+
+Запуск:
+    python -m benchmarks.space_battle.bench_trig
+"""
+
+import math
+import time
+
+from homeworks.space_battle.actions import Move
+from homeworks.space_battle.adapters import MovingObjectAdapter
+from homeworks.space_battle.models import Angle, Point, Vector
+from homeworks.space_battle.uobject import UObject
+
+SHIPS = 10_000
+TICKS = 20
+
+
+class MathMovingObjectAdapter(MovingObjectAdapter):
+    """Прежняя реализация: radians/cos/sin на каждый вызов get_velocity."""
+
+    def get_velocity(self) -> Vector | None:
+        angle: Angle = self.uobj.get_property("angle")
+        velocity: float = self.uobj.get_property("velocity")
+        if angle is not None and velocity is not None:
+            radian = angle.radians()
+            return Vector(x=int(velocity * math.cos(radian)), y=int(velocity * math.sin(radian)))
+        return None
+
+
+def make_ships() -> list[UObject]:
+    ships = []
+    for number in range(SHIPS):
+        ship = UObject()
+        ship.set_property("location", Point(number, -number))
+        ship.set_property("angle", Angle(number % 360))
+        ship.set_property("velocity", 1 + number % 17)
+        ships.append(ship)
+    return ships
+
+
+def bench(adapter_cls: type[MovingObjectAdapter]) -> float:
+    moves = [Move(adapter_cls(ship)) for ship in make_ships()]
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        for move in moves:
+            move.execute()
+    return (time.perf_counter() - start) / TICKS
+
+
+def main() -> None:
+    before = bench(MathMovingObjectAdapter)
+    after = bench(MovingObjectAdapter)
+    print(f"{SHIPS} ships, ms per Move tick")
+    print(f"math.cos/sin per call:     {before * 1e3:8.2f}")
+    print(f"trig table + cached vector: {after * 1e3:7.2f}  (x{before / after:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+UObject со словарём против UObject со схемой: память на корабль и скорость тика Move.
+Флот из шаблона-прототипа против полных копий свойств: память и время создания.
+
+Запуск:
+    python -m benchmarks.space_battle.bench_uobject
+"""
+
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from homeworks.space_battle.actions import Move
+from homeworks.space_battle.adapters import MovingObjectAdapter
+from homeworks.space_battle.models import Angle, Point
+from homeworks.space_battle.uobject import UObject, UObjectSchema
+
+SHIPS = 10_000
+TICKS = 20
+# Кеш вектора скорости адаптер пишет в объект, поэтому он тоже объявлен в схеме
+SHIP = UObjectSchema(
+    ("location", "angle", "velocity", "fuel", "fuel_burn_rate"),
+)
+
+
+def make_dict_ship(number: int) -> UObject:
+    ship = UObject()
+    ship.set_property("location", Point(number, -number))
+    ship.set_property("angle", Angle(number % 360))
+    ship.set_property("velocity", 1 + number % 17)
+    ship.set_property("fuel", 100)
+    ship.set_property("fuel_burn_rate", 1)
+    return ship
+
+
+def make_schema_ship(number: int) -> UObject:
+    return SHIP.create(
+        location=Point(number, -number),
+        angle=Angle(number % 360),
+        velocity=1 + number % 17,
+        fuel=100,
+        fuel_burn_rate=1,
+    )
+
+
+def allocated_bytes(factory: Callable[[int], UObject]) -> int:
+    tracemalloc.start()
+    ships = [factory(number) for number in range(SHIPS)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del ships
+    return size
+
+
+def move_tick(factory: Callable[[int], UObject]) -> float:
+    moves = [Move(MovingObjectAdapter(factory(number))) for number in range(SHIPS)]
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        for move in moves:
+            move.execute()
+    return (time.perf_counter() - start) / TICKS
+
+
+def make_template() -> UObject:
+    template = UObject()
+    template.set_property("angle", Angle(0))
+    template.set_property("velocity", 5)
+    template.set_property("fuel", 100)
+    template.set_property("fuel_burn_rate", 1)
+    return template
+
+
+def make_fleet_copies(template: UObject) -> list[UObject]:
+    ships = []
+    for number in range(SHIPS):
+        ship = UObject()
+        for property_ in ("angle", "velocity", "fuel", "fuel_burn_rate"):
+            ship.set_property(property_, template.get_property(property_))
+        ship.set_property("location", Point(number, -number))
+        ships.append(ship)
+    return ships
+
+
+def make_fleet_from_prototype(template: UObject) -> list[UObject]:
+    ships = []
+    for number in range(SHIPS):
+        ship = UObject(prototype=template)
+        ship.set_property("location", Point(number, -number))
+        ships.append(ship)
+    return ships
+
+
+def spawn(factory: Callable[[UObject], list[UObject]]) -> tuple[float, float]:
+    template = make_template()
+    tracemalloc.start()
+    start = time.perf_counter()
+    ships = factory(template)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del ships
+    return size / SHIPS, elapsed
+
+
+def main() -> None:
+    dict_memory = allocated_bytes(make_dict_ship)
+    schema_memory = allocated_bytes(make_schema_ship)
+    print(f"{SHIPS} ships, bytes per ship")
+    print(f"dict UObject:   {dict_memory / SHIPS:6.1f}")
+    print(f"schema UObject: {schema_memory / SHIPS:6.1f}")
+
+    dict_tick = move_tick(make_dict_ship)
+    schema_tick = move_tick(make_schema_ship)
+    print("ms per Move tick")
+    print(f"dict UObject:   {dict_tick * 1e3:6.2f}")
+    print(f"schema UObject: {schema_tick * 1e3:6.2f}  (x{dict_tick / schema_tick:.2f})")
+
+    copies_memory, copies_time = spawn(make_fleet_copies)
+    prototype_memory, prototype_time = spawn(make_fleet_from_prototype)
+    print("fleet spawn: bytes per ship, ms per fleet")
+    print(f"copied properties: {copies_memory:6.1f}  {copies_time * 1e3:6.2f}")
+    print(f"prototype:         {prototype_memory:6.1f}  {prototype_time * 1e3:6.2f}")
+
+
+if __name__ == "__main__":
+    main()
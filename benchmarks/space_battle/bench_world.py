@@ -0,0 +1,112 @@
+"""
+Движение флота: покомандные Move/MoveWithFuelMacroCommand через адаптеры
+против пакетных MoveAllCommand/MoveWithFuelBatchCommand.
+
+Запуск:
+    python -m benchmarks.space_battle.bench_world
+"""
+
+import time
+
+from homeworks.space_battle.actions import Move
+from homeworks.space_battle.adapters import MovingObjectAdapter
+from homeworks.space_battle.commands import (
+    MoveAllCommand,
+    MoveWithFuelBatchCommand,
+    MoveWithFuelMacroCommand,
+    RotateBatchCommand,
+)
+from homeworks.space_battle.exceptions import CommandException
+from homeworks.space_battle.models import Angle, Point
+from homeworks.space_battle.uobject import UObject
+from homeworks.space_battle.world import World
+
+SHIPS = 10_000
+TICKS = 20
+
+
+def make_ships() -> list[UObject]:
+    ships = []
+    for number in range(SHIPS):
+        ship = UObject()
+        ship.set_property("location", Point(number, -number))
+        ship.set_property("angle", Angle(number % 360))
+        ship.set_property("velocity", 1 + number % 17)
+        # Половине флота топлива не хватит уже на первом тике
+        ship.set_property("fuel", 10**6 if number % 2 else 0)
+        ship.set_property("fuel_burn_rate", 1)
+        ships.append(ship)
+    return ships
+
+
+def bench_per_object(ships: list[UObject]) -> float:
+    moves = [Move(MovingObjectAdapter(ship)) for ship in ships]
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        for move in moves:
+            move.execute()
+    return (time.perf_counter() - start) / TICKS
+
+
+def bench_batch(world: World) -> float:
+    move_all = MoveAllCommand(world=world)
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        move_all.execute()
+    return (time.perf_counter() - start) / TICKS
+
+
+def bench_rotate_batch(world: World) -> float:
+    rotate = RotateBatchCommand(world=world, delta_angle=Angle(5))
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        rotate.execute()
+    return (time.perf_counter() - start) / TICKS
+
+
+def bench_fuel_per_object(ships: list[UObject]) -> float:
+    commands = [
+        MoveWithFuelMacroCommand(uobj=ship, moving=MovingObjectAdapter(ship)) for ship in ships
+    ]
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        failed = []
+        for command in commands:
+            try:
+                command.execute()
+            except CommandException:
+                failed.append(command)
+    return (time.perf_counter() - start) / TICKS
+
+
+def bench_fuel_batch(world: World) -> float:
+    command = MoveWithFuelBatchCommand(world=world)
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        command.execute()
+    return (time.perf_counter() - start) / TICKS
+
+
+def main() -> None:
+    ships = make_ships()
+    world = World()
+    for number, ship in enumerate(ships):
+        world.add(number, ship)
+    per_object = bench_per_object(ships)
+    batch = bench_batch(world)
+    rotate = bench_rotate_batch(world)
+    fuel_per_object = bench_fuel_per_object(ships)
+    fuel_batch = bench_fuel_batch(world)
+    print(f"{SHIPS} ships, ms per tick")
+    print(f"Move per object:    {per_object * 1e3:8.2f}")
+    print(f"MoveAllCommand:     {batch * 1e3:8.2f}  (x{per_object / batch:.1f})")
+    print(f"RotateBatchCommand: {rotate * 1e3:8.2f}")
+    print(f"MoveWithFuelMacroCommand per object: {fuel_per_object * 1e3:8.2f}")
+    print(
+        f"MoveWithFuelBatchCommand:            {fuel_batch * 1e3:8.2f}"
+        f"  (x{fuel_per_object / fuel_batch:.1f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+from collections.abc import Callable
+from typing import TypeVar
+
+from homeworks.space_battle.interfaces import CommandInterface
+from homeworks.space_battle.ioc import (
+    IoC,
+    Lifetime,
+    NewScopeCommand,
+    RegisterCommand,
+    RegisterGlobalCommand,
+)
+from homeworks.space_battle.ioc import SetCurrentScopeCommand as CurrentScopeCommand
+
+T = TypeVar("T")
+
+Command = CommandInterface
+
+__all__ = [
+    "Command",
+    "CurrentScopeCommand",
+    "IoC",
+    "IoCContainer",
+    "NewScopeCommand",
+    "RegisterCommand",
+]
+
+
+class IoCContainer:
+    """
+    Типизированный фасад IoC: ключом зависимости служит тип, resolve возвращает объект этого типа.
+
+    Регистрации хранятся в тех же скоупах, что и строковые ключи IoC: работают Scopes.New,
+    Scopes.Current, наследование скоупов, время жизни и кеш разрешения текущего потока.
+    Тип — хешируемый объект с хешем по адресу, поэтому поиск занимает O(1) без хеширования строк,
+    а resolve не проверяет встроенные команды, ключи которых всегда строки.
+    """
+
+    @classmethod
+    def register(
+        cls,
+        key: type[T],
+        strategy: Callable[..., T] | T,
+        lifetime: Lifetime = Lifetime.TRANSIENT,
+    ) -> None:
+        """Зарегистрировать стратегию для типа в текущем скоупе."""
+        RegisterCommand(key, strategy, lifetime).execute()
+
+    @classmethod
+    def register_global(
+        cls,
+        key: type[T],
+        strategy: Callable[..., T] | T,
+        lifetime: Lifetime = Lifetime.TRANSIENT,
+    ) -> None:
+        """Зарегистрировать стратегию для типа во всех скоупах."""
+        RegisterGlobalCommand(key, strategy, lifetime).execute()
+
+    @classmethod
+    def resolve(cls, key: type[T], *args, **kwargs) -> T:
+        """
+        Разрешить зависимость по типу.
+
+        Args:
+            key: Тип зависимости
+            *args: Аргументы для создания объекта
+            **kwargs: Именованные аргументы для создания объекта
+
+        Returns:
+            Объект зависимости
+        """
+        strategy = IoC._strategy_for(key)
+        if callable(strategy):
+            return strategy(*args, **kwargs)
+        return strategy
+
+    @classmethod
+    def compile(cls, key: type[T]) -> Callable[..., T]:
+        """Скомпилировать тип в функцию разрешения, см. IoC.compile."""
+        return IoC.compile(key)
@@ -1,43 +1,187 @@
-import math
+from abc import ABC
+from collections.abc import Callable
+from functools import cache, partial
+from typing import Any
 
 from homeworks.space_battle.interfaces import MovingObjectInterface, RotatableObjectInterface
+from homeworks.space_battle.ioc import IoC
 from homeworks.space_battle.models import Angle, Point, Vector
 from homeworks.space_battle.uobject import UObject
 
+# Ключ UObject.cache с кешем вектора скорости: (angle, velocity, Vector)
+VELOCITY_CACHE = "velocity_cache"
+
+# Ключ IoC, по которому регистрируется create_adapter
+ADAPTER_KEY = "Adapter"
+
+
+def _is_int_point(point: Point) -> bool:
+    return type(point) is Point and type(point.x) is int and type(point.y) is int
+
 
 class MovingObjectAdapter(MovingObjectInterface):
     def __init__(self, u_obj: UObject):
         self.uobj = u_obj
+        # Доступ к свойствам связывается один раз, а не ищется по строке на каждый вызов
+        self._get_location = u_obj.property_getter("location")
+        self._set_location = u_obj.property_setter("location")
+        self._get_angle = u_obj.property_getter("angle")
+        self._get_velocity = u_obj.property_getter("velocity")
+        # Кеш хранится вне свойств, чтобы не попадать в дельты для клиентов
+        cache = u_obj.cache
+        self._get_velocity_cache = partial(cache.get, VELOCITY_CACHE)
+        self._set_velocity_cache = partial(cache.__setitem__, VELOCITY_CACHE)
 
     def get_location(self) -> Point | None:
-        location = self.uobj.get_property("location")
-        if location is not None:
-            return Point(x=int(location.x), y=int(location.y))
-        return location
+        location = self._get_location()
+        if location is None or _is_int_point(location):
+            # Point неизменяемый — целочисленную точку можно вернуть без копии
+            return location
+        return Point(x=int(location.x), y=int(location.y))
 
     def get_velocity(self) -> Vector | None:
-        angle: Angle = self.uobj.get_property("angle")
-        velocity: float = self.uobj.get_property("velocity")
-        if angle is not None and velocity is not None:
-            radian = angle.radians()
-            vx = int(velocity * math.cos(radian))
-            vy = int(velocity * math.sin(radian))
-            return Vector(x=vx, y=vy)
-        return None
+        """
+        Вектор скорости кешируется в объекте и пересчитывается, только если
+        изменились свойства angle или velocity. Возвращаемый Vector нельзя менять.
+        """
+        angle: Angle = self._get_angle()
+        velocity: float = self._get_velocity()
+        if angle is None or velocity is None:
+            return None
+        cache = self._get_velocity_cache()
+        if cache is not None and cache[0] is angle and cache[1] is velocity:
+            return cache[2]
+        vector = Vector(x=int(velocity * angle.cos()), y=int(velocity * angle.sin()))
+        self._set_velocity_cache((angle, velocity, vector))
+        return vector
 
     def set_location(self, new_point: Point):
-        self.uobj.set_property(
-            property_="location",
-            value=Point(x=int(new_point.x), y=int(new_point.y)),
-        )
+        if not _is_int_point(new_point):
+            new_point = Point(x=int(new_point.x), y=int(new_point.y))
+        self._set_location(new_point)
 
 
 class RotatableObjectAdapter(RotatableObjectInterface):
     def __init__(self, uobj: UObject):
         self.uobj = uobj
+        self._get_angle = uobj.property_getter("angle")
+        self._set_angle = uobj.property_setter("angle")
 
     def get_angle(self) -> Angle:
-        return self.uobj.get_property("angle")
+        return self._get_angle()
 
     def set_angle(self, new_angle: Angle) -> None:
-        self.uobj.set_property(property_="angle", value=new_angle)
+        self._set_angle(new_angle)
+
+
+def _property_method(method_name: str, property_: str) -> Callable[..., Any]:
+    if method_name.startswith("get_"):
+
+        def getter(self) -> Any:
+            return self.uobj.get_property(property_)
+
+        getter.__name__ = method_name
+        return getter
+
+    def setter(self, value: Any) -> None:
+        self.uobj.set_property(property_, value)
+
+    setter.__name__ = method_name
+    return setter
+
+
+def _override(scope_id: str, key: str) -> Callable[..., Any] | None:
+    """Стратегия, переопределяющая метод доступа к свойству, или None."""
+    try:
+        return IoC._find_strategy(scope_id, key)
+    except ValueError:
+        return None
+
+
+def _operation_method(method_name: str, key: str) -> Callable[..., Any]:
+    def operation(self, *args, **kwargs) -> Any:
+        return IoC.resolve(key, self.uobj, *args, **kwargs)
+
+    operation.__name__ = method_name
+    return operation
+
+
+# Адаптеры, в которых методы не сводятся к чтению и записи свойства как есть:
+# MovingObjectAdapter вычисляет вектор скорости и приводит координаты к int
+_HAND_WRITTEN: dict[type[ABC], type[ABC]] = {
+    MovingObjectInterface: MovingObjectAdapter,
+}
+
+
+@cache
+def generate_adapter(interface: type[ABC]) -> type[ABC]:
+    """
+    Построить класс адаптера UObject к интерфейсу. Класс строится один раз на интерфейс.
+
+    Абстрактные методы get_<свойство> и set_<свойство> читают и записывают свойство UObject.
+    При создании адаптера они заменяются в экземпляре связанными функциями доступа
+    UObject.property_getter/property_setter, поэтому вызов не дороже, чем у написанного вручную.
+    Если на момент создания адаптера в IoC зарегистрирован ключ "<Интерфейс>.<метод>",
+    метод вызывает эту стратегию с аргументами (uobj, *args) — так задаются вычисляемые
+    свойства и преобразования значений.
+    Остальные абстрактные методы разрешают через IoC ключ "<Интерфейс>.<метод>"
+    с аргументами (uobj, *args, **kwargs).
+    """
+    accessors: list[tuple[str, str, str]] = []
+    namespace: dict[str, Any] = {
+        "__module__": __name__,
+        "__doc__": f"Сгенерированный адаптер UObject к {interface.__name__}.",
+    }
+    for method_name in sorted(interface.__abstractmethods__):
+        key = f"{interface.__name__}.{method_name}"
+        if method_name.startswith(("get_", "set_")):
+            accessors.append((method_name, method_name[4:], key))
+            namespace[method_name] = _property_method(method_name, method_name[4:])
+        else:
+            namespace[method_name] = _operation_method(method_name, key)
+
+    def bind_accessors(scope_id: str) -> tuple[tuple[str, str, bool, Any], ...]:
+        return tuple(
+            (method_name, property_, method_name.startswith("get_"), _override(scope_id, key))
+            for method_name, property_, key in accessors
+        )
+
+    # Переопределения ищутся заново только после изменения регистраций или смены скоупа;
+    # поколение, скоуп и результат хранятся одним кортежем, его замена атомарна
+    bound: tuple[int, str, tuple[tuple[str, str, bool, Any], ...]] = (-1, "", ())
+
+    def __init__(self, uobj: UObject) -> None:  # noqa: N807
+        nonlocal bound
+        self.uobj = uobj
+        generation, scope_id, bindings = bound
+        current_generation = IoC._generation
+        current_scope_id = IoC._get_current_scope_id()
+        if generation != current_generation or scope_id != current_scope_id:
+            bindings = bind_accessors(current_scope_id)
+            bound = (current_generation, current_scope_id, bindings)
+        attributes = self.__dict__
+        for method_name, property_, is_getter, strategy in bindings:
+            if strategy is not None:
+                attributes[method_name] = partial(strategy, uobj)
+            elif is_getter:
+                attributes[method_name] = uobj.property_getter(property_)
+            else:
+                attributes[method_name] = uobj.property_setter(property_)
+
+    namespace["__init__"] = __init__
+    return type(f"Generated{interface.__name__}Adapter", (interface,), namespace)
+
+
+def create_adapter(interface: type[ABC], uobj: UObject) -> ABC:
+    """
+    Стратегия для ключа IoC "Adapter":
+    IoC.resolve("IoC.RegisterGlobal", ADAPTER_KEY, create_adapter).execute()
+    adapter = IoC.resolve(ADAPTER_KEY, MovingObjectInterface, ship)
+
+    Для интерфейсов с вычисляемыми методами возвращается написанный вручную адаптер
+    (MovingObjectAdapter), для остальных — сгенерированный.
+    """
+    adapter_cls = _HAND_WRITTEN.get(interface)
+    if adapter_cls is None:
+        adapter_cls = generate_adapter(interface)
+    return adapter_cls(uobj)
@@ -0,0 +1,106 @@
+import asyncio
+from collections import deque
+
+from homeworks.space_battle.handlers import LogExceptionHandler
+from homeworks.space_battle.interfaces import (
+    AsyncCommandInterface,
+    CommandInterface,
+    ExceptionHandlerInterface,
+)
+from homeworks.space_battle.server import BaseGameServer, ServerState
+
+__all__ = [
+    "AsyncCommandQueue",
+    "AsyncGameServer",
+]
+
+
+class AsyncCommandQueue:
+    """
+    Очередь команд для цикла asyncio.
+
+    put() синхронный, поэтому обработчики исключений из handlers.py кладут в неё
+    команды так же, как в queue.Queue. Вызывать только из потока цикла событий.
+    """
+
+    def __init__(self) -> None:
+        self._items: deque[CommandInterface | AsyncCommandInterface] = deque()
+        self._not_empty = asyncio.Event()
+
+    def put(self, command: CommandInterface | AsyncCommandInterface) -> None:
+        self._items.append(command)
+        self._not_empty.set()
+
+    def get_nowait(self) -> CommandInterface | AsyncCommandInterface:
+        return self._items.popleft()
+
+    async def get(self) -> CommandInterface | AsyncCommandInterface:
+        await self.wait()
+        return self._items.popleft()
+
+    async def wait(self) -> None:
+        """Ждёт, пока в очереди появится хотя бы одна команда."""
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+
+class AsyncGameServer(BaseGameServer):
+    """
+    Игровой цикл одной игры поверх asyncio.
+
+    Тысячи игр выполняются в одном цикле событий как отдельные задачи run(),
+    без передачи команд между потоками. Синхронные команды вызываются напрямую:
+    execute() синхронной команды возвращает None, асинхронной — awaitable,
+    поэтому на горячем пути остаётся одна проверка результата.
+
+    Чтобы одна загруженная игра не монополизировала цикл, после batch_size
+    команд управление отдаётся другим задачам.
+    """
+
+    def __init__(
+        self,
+        *,
+        queue: AsyncCommandQueue | None = None,
+        default_handler: ExceptionHandlerInterface | None = None,
+        batch_size: int = 256,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("Размер пакета должен быть положительным")
+        self.queue = queue if queue is not None else AsyncCommandQueue()
+        self._default_handler = default_handler or LogExceptionHandler(queue=self.queue)
+        self._batch_size = batch_size
+        self._control: ServerState | None = None
+        self._resumed = asyncio.Event()
+        self._resumed.set()
+
+    async def run(self) -> None:
+        queue = self.queue
+        get = queue.get_nowait
+        handle_exception = self._handle_exception
+        while True:
+            await queue.wait()
+            for _ in range(min(self._batch_size, queue.qsize())):
+                command = get()
+                try:
+                    result = command.execute()
+                    if result is not None:
+                        await result
+                except Exception as exc:
+                    handle_exception(command, exc)
+                if self._control is not None and await self._should_exit():
+                    return
+            await asyncio.sleep(0)
+
+    async def _should_exit(self) -> bool:
+        control = self._control
+        if control is ServerState.PAUSED:
+            await self._resumed.wait()
+            control = self._control
+        return self._stop_requested(control)
@@ -0,0 +1,187 @@
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+
+from homeworks.space_battle.commands import unwrap_command
+from homeworks.space_battle.interfaces import CommandInterface, ExceptionHandlerInterface
+
+__all__ = [
+    "CircuitBreakerConfig",
+    "CircuitBreakerExceptionHandler",
+    "CircuitState",
+    "CircuitStats",
+]
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True, slots=True)
+class CircuitBreakerConfig:
+    """
+    Настройки предохранителя.
+
+    failure_threshold — сколько ошибок за window секунд размыкают цепь;
+    window — окно подсчёта ошибок, а также время без ошибок, после которого
+    полуоткрытая цепь замыкается;
+    open_timeout — сколько секунд цепь разомкнута до пробной ошибки.
+    """
+
+    failure_threshold: int = 5
+    window: float = 1.0
+    open_timeout: float = 5.0
+
+    def __post_init__(self) -> None:
+        if self.failure_threshold < 1:
+            raise ValueError("Порог ошибок должен быть положительным")
+
+
+@dataclass(frozen=True, slots=True)
+class CircuitStats:
+    """
+    Метрики цепи одного типа команды.
+
+    opened и closed — сколько раз цепь размыкалась и замыкалась;
+    rejected — сколько ошибок отклонено, пока цепь разомкнута.
+    """
+
+    state: CircuitState
+    opened: int
+    closed: int
+    rejected: int
+
+
+_CLOSED = CircuitStats(state=CircuitState.CLOSED, opened=0, closed=0, rejected=0)
+
+
+class _Circuit:
+    __slots__ = ("changed_at", "closed", "failures", "opened", "rejected", "state")
+
+    def __init__(self, threshold: int):
+        self.state = CircuitState.CLOSED
+        # Время последних threshold ошибок: скользящее окно за O(1) на ошибку
+        self.failures: deque[float] = deque(maxlen=threshold)
+        self.changed_at = 0.0
+        self.opened = 0
+        self.closed = 0
+        self.rejected = 0
+
+
+class CircuitBreakerExceptionHandler(ExceptionHandlerInterface):
+    """
+    Предохранитель для обработчика исключений по типу команды.
+
+    Пока цепь замкнута, ошибки передаются обработчику handler. Если у одного типа команды
+    за window секунд набирается failure_threshold ошибок (см. CircuitBreakerConfig),
+    цепь размыкается: ошибки этого типа не передаются handler, а отклоняются —
+    уходят в fallback, если он задан.
+    Так повторы не умножают нагрузку, когда команда падает для всех объектов.
+
+    Через open_timeout секунд цепь становится полуоткрытой: первая ошибка в этом состоянии
+    передаётся handler как пробная, её повтор проверит, восстановилась ли команда.
+    Ещё одна ошибка в полуоткрытом состоянии снова размыкает цепь, а если за window секунд
+    ошибок не было, цепь замыкается — в том числе когда ошибок не было совсем.
+
+    Обработчик видит только ошибки, поэтому частота ошибок считается по времени,
+    а не как доля от выполненных команд.
+    """
+
+    def __init__(
+        self,
+        handler: ExceptionHandlerInterface,
+        *,
+        config: CircuitBreakerConfig | None = None,
+        fallback: ExceptionHandlerInterface | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.config = config = config or CircuitBreakerConfig()
+        self._handler = handler
+        self._threshold = config.failure_threshold
+        self._window = config.window
+        self._open_timeout = config.open_timeout
+        self._fallback = fallback
+        self._clock = clock
+        self._circuits: dict[type, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def handle(self, exc: Exception | type[Exception], command: CommandInterface):
+        # Повторители и LogCommand относятся к цепи исходной команды
+        command_type = type(unwrap_command(command))
+        now = self._clock()
+        with self._lock:
+            circuit = self._circuits.get(command_type)
+            if circuit is None:
+                circuit = self._circuits[command_type] = _Circuit(self._threshold)
+            accepted = self._on_failure(circuit, now)
+            if not accepted:
+                circuit.rejected += 1
+        if accepted:
+            self._handler.handle(exc=exc, command=command)
+        elif self._fallback is not None:
+            self._fallback.handle(exc=exc, command=command)
+
+    def _on_failure(self, circuit: _Circuit, now: float) -> bool:
+        """Учитывает ошибку и решает, передавать ли её обработчику."""
+        self._refresh(circuit, now)
+        state = circuit.state
+        if state is CircuitState.CLOSED:
+            failures = circuit.failures
+            failures.append(now)
+            if len(failures) == self._threshold and now - failures[0] <= self._window:
+                self._open(circuit, now)
+                return False
+            return True
+        if state is CircuitState.OPEN:
+            return False
+        if not circuit.failures:
+            # Пробная ошибка: повтор покажет, восстановилась ли команда
+            circuit.failures.append(now)
+            circuit.changed_at = now
+            return True
+        # Повторная ошибка в полуоткрытом состоянии — команда не восстановилась
+        self._open(circuit, now)
+        return False
+
+    def _refresh(self, circuit: _Circuit, now: float) -> None:
+        """Переходы по времени: OPEN → HALF_OPEN и HALF_OPEN → CLOSED."""
+        if circuit.state is CircuitState.OPEN and now - circuit.changed_at >= self._open_timeout:
+            circuit.state = CircuitState.HALF_OPEN
+            circuit.changed_at += self._open_timeout
+        if circuit.state is CircuitState.HALF_OPEN and now - circuit.changed_at > self._window:
+            circuit.state = CircuitState.CLOSED
+            circuit.changed_at = now
+            circuit.failures.clear()
+            circuit.closed += 1
+
+    @staticmethod
+    def _open(circuit: _Circuit, now: float) -> None:
+        circuit.state = CircuitState.OPEN
+        circuit.changed_at = now
+        circuit.failures.clear()
+        circuit.opened += 1
+
+    def state(self, command_type: type[CommandInterface]) -> CircuitState:
+        """Текущее состояние цепи типа команды."""
+        return self.metrics().get(command_type, _CLOSED).state
+
+    def metrics(self) -> dict[type, CircuitStats]:
+        """Метрики всех цепей, в которых были ошибки."""
+        now = self._clock()
+        with self._lock:
+            for circuit in self._circuits.values():
+                self._refresh(circuit, now)
+            return {
+                command_type: CircuitStats(
+                    state=circuit.state,
+                    opened=circuit.opened,
+                    closed=circuit.closed,
+                    rejected=circuit.rejected,
+                )
+                for command_type, circuit in self._circuits.items()
+            }
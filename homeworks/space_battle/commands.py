@@ -1,12 +1,21 @@
-import math
+from array import array
+from collections.abc import Hashable, Iterable
+from itertools import compress, repeat
+from operator import add, ge, mul, not_, sub
 
 from homeworks.space_battle.actions import Move as MoveAction
 from homeworks.space_battle.actions import Rotate as RotateAction
 from homeworks.space_battle.adapters import MovingObjectAdapter, RotatableObjectAdapter
 from homeworks.space_battle.exceptions import CommandException
-from homeworks.space_battle.interfaces import CommandInterface, ExceptionHandlerInterface
+from homeworks.space_battle.interfaces import (
+    AsyncCommandInterface,
+    CommandInterface,
+    ExceptionHandlerInterface,
+)
+from homeworks.space_battle.log_sink import LogSink
 from homeworks.space_battle.models import Angle, Vector
 from homeworks.space_battle.uobject import UObject
+from homeworks.space_battle.world import World
 
 
 class Command(CommandInterface):
@@ -16,7 +25,7 @@ class Command(CommandInterface):
     у дочерних объектов
     """
 
-    _exception_handler: ExceptionHandlerInterface
+    _exception_handler: ExceptionHandlerInterface | None = None
 
     def __init__(self, *, command: CommandInterface):
         self.command = command
@@ -25,7 +34,19 @@ class Command(CommandInterface):
         try:
             self.command.execute()
         except Exception as exc:
-            self._exception_handler.handle(exc=exc, command=self.command)
+            handler = self._exception_handler
+            if handler is None:
+                # Сервер выберет обработчик по исходной команде (см. unwrap_command),
+                # а передаст ему эту обёртку: так повторители видят, какая попытка упала
+                raise
+            handler.handle(exc=exc, command=self.command)
+
+
+def unwrap_command(command: CommandInterface) -> CommandInterface:
+    """Исходная команда под повторителями и LogCommand."""
+    while isinstance(command, Command):
+        command = command.command
+    return command
 
 
 class RetryIfExceptionCommand(Command):
@@ -42,13 +63,42 @@ class SecondRetryIfExceptionCommand(Command):
 
 
 class LogCommand(Command):
-    def __init__(self, *, exc: Exception, command: CommandInterface):
+    """
+    Пишет в лог исключение команды.
+    Если задан sink — запись уходит в буфер LogSink без форматирования,
+    иначе печатается в stdout сразу.
+    """
+
+    sink: LogSink | None = None
+
+    def __init__(self, *, exc: Exception, command: CommandInterface, sink: LogSink | None = None):
         super().__init__(command=command)
         self.exc = exc
         self.command = command
+        if sink is not None:
+            self.sink = sink
+
+    def execute(self) -> None:
+        sink = self.sink
+        if sink is not None:
+            sink.write(self.command, self.exc)
+        else:
+            print(f"[LOG] Exception in {type(self.command).__name__}: {self.exc}")
+
+
+class LowPriorityCommand(CommandInterface):
+    """
+    Команда с низким приоритетом.
+    При перегрузке игрового цикла отбрасывается, либо заменяется
+    упрощённой версией degraded, если она задана.
+    """
+
+    def __init__(self, *, command: CommandInterface, degraded: CommandInterface | None = None):
+        self.command = command
+        self.degraded = degraded
 
     def execute(self) -> None:
-        print(f"[LOG] Exception in {type(self.command).__name__}: {self.exc}")
+        self.command.execute()
 
 
 class MacroCommand(CommandInterface):
@@ -70,15 +120,40 @@ class MacroCommand(CommandInterface):
                 ) from exc
 
 
+class AsyncMacroCommand(AsyncCommandInterface):
+    """
+    Асинхронная макрокоманда: последовательно выполняет синхронные и асинхронные команды.
+    Синхронные вызываются напрямую, без обёрток: execute() синхронной команды
+    возвращает None, асинхронной — awaitable, которого и дожидаемся.
+    При исключении прерывает цепочку и выбрасывает CommandException.
+    """
+
+    def __init__(self, *, commands: list[CommandInterface | AsyncCommandInterface]):
+        self._commands = commands
+
+    async def execute(self) -> None:
+        for cmd in self._commands:
+            try:
+                result = cmd.execute()
+                if result is not None:
+                    await result
+            except Exception as exc:
+                raise CommandException(
+                    f"AsyncMacroCommand failed on {type(cmd).__name__}: {exc}"
+                ) from exc
+
+
 class CheckFuelCommand(CommandInterface):
     """Проверяет, что топлива достаточно: fuel >= fuel_burn_rate, иначе CommandException."""
 
     def __init__(self, *, uobj: UObject):
         self._uobj = uobj
+        self._get_fuel = uobj.property_getter("fuel")
+        self._get_burn_rate = uobj.property_getter("fuel_burn_rate")
 
     def execute(self) -> None:
-        fuel = self._uobj.get_property("fuel")
-        burn_rate = self._uobj.get_property("fuel_burn_rate")
+        fuel = self._get_fuel()
+        burn_rate = self._get_burn_rate()
         if fuel is None or burn_rate is None:
             raise CommandException("Не заданы параметры топлива: fuel или fuel_burn_rate")
         if fuel < burn_rate:
@@ -90,14 +165,17 @@ class BurnFuelCommand(CommandInterface):
 
     def __init__(self, *, uobj: UObject):
         self._uobj = uobj
+        self._get_fuel = uobj.property_getter("fuel")
+        self._set_fuel = uobj.property_setter("fuel")
+        self._get_burn_rate = uobj.property_getter("fuel_burn_rate")
 
     def execute(self) -> None:
-        fuel = self._uobj.get_property("fuel")
-        burn_rate = self._uobj.get_property("fuel_burn_rate")
+        fuel = self._get_fuel()
+        burn_rate = self._get_burn_rate()
         if fuel is None or burn_rate is None:
             raise CommandException("Не заданы параметры топлива: fuel или fuel_burn_rate")
         new_value = max(0, int(fuel) - int(burn_rate))
-        self._uobj.set_property("fuel", new_value)
+        self._set_fuel(new_value)
 
 
 class MoveCommand(CommandInterface):
@@ -131,18 +209,20 @@ class ModifyVelocityOnRotateCommand(CommandInterface):
 
     def __init__(self, *, uobj: UObject):
         self._uobj = uobj
+        self._get_speed = uobj.property_getter("velocity")
+        self._get_angle = uobj.property_getter("angle")
+        self._set_velocity_vector = uobj.property_setter("velocity_vector")
 
     def execute(self) -> None:
-        speed = self._uobj.get_property("velocity")
-        angle = self._uobj.get_property("angle")
+        speed = self._get_speed()
+        angle = self._get_angle()
         if speed is None or angle is None:
             return  # нечего модифицировать
         if int(speed) == 0:
             return
-        rad = angle.radians()
-        vx = int(int(speed) * math.cos(rad))
-        vy = int(int(speed) * math.sin(rad))
-        self._uobj.set_property("velocity_vector", Vector(x=vx, y=vy))
+        vx = int(int(speed) * angle.cos())
+        vy = int(int(speed) * angle.sin())
+        self._set_velocity_vector(Vector(x=vx, y=vy))
 
 
 class MoveWithFuelMacroCommand(MacroCommand):
@@ -168,3 +248,69 @@ class RotateWithVelocityMacroCommand(MacroCommand):
                 ModifyVelocityOnRotateCommand(uobj=uobj),
             ]
         )
+
+
+class MoveAllCommand(CommandInterface):
+    """Пакетное движение: сдвигает все корабли мира на их вектор скорости за один проход."""
+
+    def __init__(self, *, world: World):
+        self._world = world
+
+    def execute(self) -> None:
+        world = self._world
+        world.x[:] = array("q", map(add, world.x, world.vx))
+        world.y[:] = array("q", map(add, world.y, world.vy))
+
+
+class RotateBatchCommand(CommandInterface):
+    """
+    Пакетный поворот на delta_angle: всех кораблей мира или только object_ids.
+    Вектор скорости повёрнутых кораблей пересчитывается тут же.
+    """
+
+    def __init__(
+        self,
+        *,
+        world: World,
+        delta_angle: Angle,
+        object_ids: Iterable[Hashable] | None = None,
+    ):
+        self._world = world
+        self._delta = delta_angle.degrees
+        self._object_ids = None if object_ids is None else list(object_ids)
+
+    def execute(self) -> None:
+        world = self._world
+        if self._object_ids is None:
+            world.angle[:] = array("q", map(add, world.angle, repeat(self._delta)))
+            world.recompute_velocities()
+            return
+        # Строки ищем при выполнении: remove() переставляет строки местами
+        rows = world.rows(self._object_ids)
+        angle = world.angle
+        for row in rows:
+            angle[row] += self._delta
+        world.recompute_velocities(rows)
+
+
+class MoveWithFuelBatchCommand(CommandInterface):
+    """
+    Пакетный аналог MoveWithFuelMacroCommand для всего мира: CheckFuel -> Move -> BurnFuel.
+
+    Маска «топлива хватает» (fuel >= fuel_burn_rate) считается за один проход,
+    двигаются и расходуют топливо только корабли из маски. Вместо CommandException
+    на каждый корабль идентификаторы не сдвинувшихся кораблей собираются в failed_ids.
+    """
+
+    def __init__(self, *, world: World):
+        self._world = world
+        self.failed_ids: list[Hashable] = []
+
+    def execute(self) -> None:
+        world = self._world
+        mask = array("q", map(ge, world.fuel, world.fuel_burn_rate))
+        world.x[:] = array("q", map(add, world.x, map(mul, world.vx, mask)))
+        world.y[:] = array("q", map(add, world.y, map(mul, world.vy, mask)))
+        burned = map(sub, world.fuel, map(mul, world.fuel_burn_rate, mask))
+        world.fuel[:] = array("q", map(max, repeat(0), burned))
+        self.failed_ids = list(compress(world.ids, map(not_, mask)))
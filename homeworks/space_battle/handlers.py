@@ -1,6 +1,9 @@
+import threading
 from queue import Queue
+from typing import ClassVar
 
 from homeworks.space_battle.commands import (
+    Command,
     LogCommand,
     RetryIfExceptionCommand,
     SecondRetryIfExceptionCommand,
@@ -10,22 +13,81 @@ from homeworks.space_battle.interfaces import (
     ExceptionHandlerInterface,
     ExceptionsStorageInterface,
 )
+from homeworks.space_battle.retry import Backoff, RetryScheduler
 
 
 class ExceptionsStorage(ExceptionsStorageInterface):
+    """
+    Обработчики исключений по паре (тип команды, тип исключения).
+
+    resolve ищет обработчик по MRO обоих типов: сначала самый точный тип команды со всеми
+    базовыми типами исключения, затем базовые типы команды. Найденный результат, в том числе
+    отсутствие обработчика, кешируется в плоской таблице по паре типов, поэтому повторная
+    ошибка разрешается одним поиском в словаре. Размер хранилища и кеша зависит
+    от числа типов, а не от числа упавших команд.
+    """
+
+    _storage: ClassVar[
+        dict[type[CommandInterface], dict[type[Exception], ExceptionHandlerInterface]]
+    ] = {}
+    _cache: ClassVar[dict[tuple[type, type], ExceptionHandlerInterface | None]] = {}
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
     @classmethod
-    def resolve(cls, command: CommandInterface, exc: Exception) -> ExceptionHandlerInterface | None:
-        return cls._storage.get(command, {}).get(exc)
+    def resolve(
+        cls,
+        command: CommandInterface | type[CommandInterface],
+        exc: Exception | type[Exception],
+    ) -> ExceptionHandlerInterface | None:
+        key = (_as_type(command), _as_type(exc))
+        # Кеш читается один раз: register подменяет его новым словарём,
+        # и результат, найденный по старому хранилищу, не попадёт в новый кеш
+        cache = cls._cache
+        try:
+            return cache[key]
+        except KeyError:
+            handler = cache[key] = cls._lookup(*key)
+            return handler
+
+    @classmethod
+    def _lookup(cls, command_type: type, exc_type: type) -> ExceptionHandlerInterface | None:
+        storage = cls._storage
+        for command_base in command_type.__mro__:
+            handlers = storage.get(command_base)
+            if handlers is None:
+                continue
+            for exc_base in exc_type.__mro__:
+                handler = handlers.get(exc_base)
+                if handler is not None:
+                    return handler
+        return None
 
     @classmethod
     def register(
-        cls, command: CommandInterface, exc: Exception, handler: ExceptionHandlerInterface
-    ) -> CommandInterface:
-        if command not in cls._storage:
-            cls._storage[command] = {}
-        cls._storage[command][exc] = handler
+        cls,
+        command: CommandInterface | type[CommandInterface],
+        exc: Exception | type[Exception],
+        handler: ExceptionHandlerInterface,
+    ) -> CommandInterface | type[CommandInterface]:
+        """
+        Зарегистрировать обработчик для типа команды и типа исключения.
+        Вместо типов можно передать экземпляры — используются их типы.
+        """
+        with cls._lock:
+            cls._storage.setdefault(_as_type(command), {})[_as_type(exc)] = handler
+            cls._cache = {}
         return command
 
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._storage.clear()
+            cls._cache = {}
+
+
+def _as_type(obj: object) -> type:
+    return obj if isinstance(obj, type) else type(obj)
+
 
 class LogExceptionHandler(ExceptionHandlerInterface):
     """
@@ -41,15 +103,38 @@ class LogExceptionHandler(ExceptionHandlerInterface):
 
 
 class RetryExceptionHandler(ExceptionHandlerInterface):
-    def __init__(self, *args, queue: Queue, **kwargs) -> None:
+    """
+    Базовый обработчик с повтором команды.
+
+    Без планировщика повтор сразу ставится в очередь. С планировщиком RetryScheduler
+    повтор откладывается на задержку из backoff, растущую с номером попытки, поэтому
+    команда, падающая из-за временной причины, не вытесняет из очереди остальные.
+    """
+
+    def __init__(
+        self,
+        *args,
+        queue: Queue,
+        scheduler: RetryScheduler | None = None,
+        backoff: Backoff | None = None,
+        **kwargs,
+    ) -> None:
         super().__init__(*args, **kwargs)
         self._queue = queue
+        self._scheduler = scheduler
+        self._backoff = backoff or Backoff()
 
     def handle(
         self, exc: Exception | type[Exception], command: CommandInterface
     ) -> CommandInterface:
         pass
 
+    def _retry(self, command: CommandInterface, attempt: int) -> None:
+        if self._scheduler is None:
+            self._queue.put(command)
+        else:
+            self._scheduler.schedule(command, self._backoff.delay(attempt))
+
 
 class RetryIfExceptionHandler(RetryExceptionHandler):
     """
@@ -58,7 +143,13 @@ class RetryIfExceptionHandler(RetryExceptionHandler):
     """
 
     def handle(self, exc: Exception | type[Exception], command: CommandInterface):  # noqa: ARG002
-        self._queue.put(RetryIfExceptionCommand(command=command))
+        # Номер попытки — глубина вложенности повторителей
+        attempt = 1
+        inner = command
+        while isinstance(inner, RetryIfExceptionCommand):
+            attempt += 1
+            inner = inner.command
+        self._retry(RetryIfExceptionCommand(command=command), attempt)
 
 
 class RetryOnceThenLogExceptionHandler(RetryExceptionHandler):
@@ -74,7 +165,7 @@ class RetryOnceThenLogExceptionHandler(RetryExceptionHandler):
             self._queue.put(LogCommand(exc=exc, command=command.command))
         else:
             # 1) Первый — ставим один повтор
-            self._queue.put(RetryIfExceptionCommand(command=command))
+            self._retry(RetryIfExceptionCommand(command=command), 1)
 
 
 class RetryTwiceThenLogExceptionHandler(RetryExceptionHandler):
@@ -90,7 +181,54 @@ class RetryTwiceThenLogExceptionHandler(RetryExceptionHandler):
             self._queue.put(LogCommand(exc=exc, command=command.command))
         elif isinstance(command, RetryIfExceptionCommand):
             # 2) первый повтор не удался — ставим второй повтор
-            self._queue.put(SecondRetryIfExceptionCommand(command=command.command))
+            self._retry(SecondRetryIfExceptionCommand(command=command.command), 2)
         else:
             # 1) исходная команда упала — ставим первый повтор
-            self._queue.put(RetryIfExceptionCommand(command=command))
+            self._retry(RetryIfExceptionCommand(command=command), 1)
+
+
+class _AttemptCommand(Command):
+    """
+    Повтор команды из RetryNThenLogExceptionHandler: хранит номер попытки.
+
+    Создаётся при первой ошибке команды и переиспользуется всеми её повторами.
+    Упавший повтор сервер передаёт обработчику исходной команды вместе с этой обёрткой,
+    успешный просто выполняется: следующая ошибка команды начнёт новую серию попыток.
+    """
+
+    def __init__(self, *, command: CommandInterface):
+        super().__init__(command=command)
+        self.attempt = 0
+
+
+class RetryNThenLogExceptionHandler(RetryExceptionHandler):
+    """
+    Стратегия:
+        1) при первых retries исключениях — повторить
+        2) при следующем — записать в лог
+
+    Номер попытки хранится в обёртке-повторе, которая создаётся один раз на серию ошибок
+    и ставится в очередь снова при каждом следующем повторе. Поэтому повторы после первого
+    ничего не создают, решение принимается за O(1), и нет таблицы попыток, которую
+    нужно очищать или ограничивать.
+    """
+
+    def __init__(self, *args, retries: int, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        if retries < 0:
+            raise ValueError("Количество повторов не может быть отрицательным")
+        self.retries = retries
+
+    def handle(self, exc: Exception | type[Exception], command: CommandInterface):
+        if type(command) is _AttemptCommand:
+            retry = command
+        elif self.retries:
+            retry = _AttemptCommand(command=command)
+        else:
+            self._queue.put(LogCommand(exc=exc, command=command))
+            return
+        if retry.attempt >= self.retries:
+            self._queue.put(LogCommand(exc=exc, command=retry.command))
+            return
+        retry.attempt += 1
+        self._retry(retry, retry.attempt)
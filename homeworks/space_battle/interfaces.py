@@ -33,6 +33,30 @@ class CommandInterface(ABC):
         pass
 
 
+class AsyncCommandInterface(ABC):
+    @abstractmethod
+    async def execute(self) -> None:
+        pass
+
+
+class GameServerInterface(ABC):
+    @abstractmethod
+    def hard_stop(self) -> None:
+        pass
+
+    @abstractmethod
+    def soft_stop(self) -> None:
+        pass
+
+    @abstractmethod
+    def pause(self) -> None:
+        pass
+
+    @abstractmethod
+    def resume(self) -> None:
+        pass
+
+
 class ExceptionHandlerInterface(ABC):
     @abstractmethod
     def handle(
@@ -42,16 +66,23 @@ class ExceptionHandlerInterface(ABC):
 
 
 class ExceptionsStorageInterface(ABC):
-    _storage: dict[CommandInterface, dict[Exception, ExceptionHandlerInterface]]
+    _storage: dict[type[CommandInterface], dict[type[Exception], ExceptionHandlerInterface]]
 
     @classmethod
     @abstractmethod
-    def resolve(cls, command: CommandInterface, exc: Exception) -> ExceptionHandlerInterface | None:
+    def resolve(
+        cls,
+        command: CommandInterface | type[CommandInterface],
+        exc: Exception | type[Exception],
+    ) -> ExceptionHandlerInterface | None:
         pass
 
     @classmethod
     @abstractmethod
     def register(
-        cls, command: CommandInterface, exc: Exception, handler: ExceptionHandlerInterface
-    ) -> CommandInterface:
+        cls,
+        command: CommandInterface | type[CommandInterface],
+        exc: Exception | type[Exception],
+        handler: ExceptionHandlerInterface,
+    ) -> CommandInterface | type[CommandInterface]:
         pass
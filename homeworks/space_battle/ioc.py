@@ -1,77 +1,397 @@
+import itertools
+import sys
 import threading
-from collections.abc import Callable
+import weakref
+from collections import OrderedDict, deque
+from collections.abc import Callable, Hashable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import Enum
+from types import MappingProxyType
 from typing import Any, ClassVar, TypeVar
 
 from homeworks.space_battle.interfaces import CommandInterface
 
 T = TypeVar("T")
 
+_MISSING = object()
+_EMPTY_SCOPE: Mapping[str, Any] = MappingProxyType({})
+
 __all__ = [
     "ClearScopeCommand",
+    "ContextScope",
     "IoC",
+    "Lifetime",
     "NewScopeCommand",
     "RegisterCommand",
     "RegisterGlobalCommand",
+    "ScopeStats",
     "SetCurrentScopeCommand",
 ]
 
 
+@dataclass(frozen=True, slots=True)
+class ScopeStats:
+    """Статистика скоупов: сколько живо, сколько занимают и сколько удалено автоматически."""
+
+    live: int
+    bytes: int
+    evicted: int
+    reclaimed: int
+
+
+class Lifetime(Enum):
+    """
+    Время жизни объекта, создаваемого стратегией.
+    TRANSIENT — стратегия вызывается при каждом resolve.
+    SINGLETON — объект создаётся при первом resolve и дальше переиспользуется.
+    SCOPED — один объект на скоуп, из которого идёт resolve; сбрасывается при очистке скоупа.
+    """
+
+    TRANSIENT = "transient"
+    SINGLETON = "singleton"
+    SCOPED = "scoped"
+
+
+class _SingletonStrategy:
+    """Стратегия-одиночка: фабрика вызывается один раз, с аргументами первого resolve."""
+
+    __slots__ = ("_factory", "_instance", "_lock")
+
+    def __init__(self, factory: Callable[..., Any]):
+        self._factory = factory
+        self._instance: Any = _MISSING
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs) -> Any:
+        instance = self._instance
+        if instance is not _MISSING:
+            return instance
+        # Двойная проверка: фабрику вызывает только первый поток, захвативший блокировку
+        with self._lock:
+            if self._instance is _MISSING:
+                self._instance = self._factory(*args, **kwargs)
+            return self._instance
+
+
+class _ScopedStrategy:
+    """
+    Стратегия с объектом на скоуп: экземпляры хранятся в IoC._scoped_instances.
+    Объекты создаются только для существующих скоупов: разрешение из удалённого
+    или не созданного скоупа — ошибка, иначе его запись никто бы не удалил.
+    """
+
+    __slots__ = ("_factory", "_lock")
+
+    def __init__(self, factory: Callable[..., Any]):
+        self._factory = factory
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs) -> Any:
+        scope_id = IoC._get_current_scope_id()
+        instances = IoC._scoped_instances.get(scope_id)
+        if instances is not None:
+            instance = instances.get(self, _MISSING)
+            if instance is not _MISSING:
+                return instance
+        # Фабрика вызывается под блокировкой стратегии, а не под общей IoC._lock:
+        # пользовательский код не задерживает регистрации и другие стратегии
+        with self._lock:
+            instances = IoC._scoped_instances.get(scope_id)
+            if instances is not None:
+                instance = instances.get(self, _MISSING)
+                if instance is not _MISSING:
+                    return instance
+            _check_live_scope(scope_id)
+            instance = self._factory(*args, **kwargs)
+            with IoC._lock:
+                # Скоуп мог быть удалён, пока работала фабрика
+                _check_live_scope(scope_id)
+                return IoC._scoped_instances.setdefault(scope_id, {}).setdefault(self, instance)
+
+
+def _check_live_scope(scope_id: str) -> None:
+    if scope_id != "root" and scope_id not in IoC._scopes:
+        raise ValueError(f"Скоуп '{scope_id}' не существует")
+
+
+def _constant(value: Any) -> Callable[..., Any]:
+    """Стратегия, которая при любых аргументах возвращает одно и то же значение."""
+
+    def strategy(*_args, **_kwargs) -> Any:
+        return value
+
+    return strategy
+
+
+def _apply_lifetime(strategy: Any, lifetime: Lifetime) -> Any:
+    """Обернуть стратегию в соответствии со временем жизни. Не-callable значения не меняются."""
+    if lifetime is Lifetime.TRANSIENT or not callable(strategy):
+        return strategy
+    if lifetime is Lifetime.SINGLETON:
+        return _SingletonStrategy(strategy)
+    return _ScopedStrategy(strategy)
+
+
+class ContextScope:
+    """
+    Хранилище текущего скоупа на contextvars вместо threading.local.
+    Каждая asyncio-задача работает в копии контекста, поэтому скоуп, выбранный в задаче,
+    не виден другим задачам того же цикла событий. Интерфейс совпадает с thread-local:
+    IoC читает и записывает атрибуты scope_id и resolution_cache.
+    Доступ через свойства и ContextVar.get медленнее атрибутов threading.local,
+    см. IoC.use_context_scopes.
+    """
+
+    __slots__ = ("_resolution_cache", "_scope_id")
+
+    def __init__(self):
+        self._scope_id: ContextVar[str] = ContextVar("ioc_scope_id", default="root")
+        self._resolution_cache: ContextVar[tuple[int | None, dict]] = ContextVar(
+            "ioc_resolution_cache", default=(None, {})
+        )
+
+    @property
+    def scope_id(self) -> str:
+        return self._scope_id.get()
+
+    @scope_id.setter
+    def scope_id(self, scope_id: str) -> None:
+        self._scope_id.set(scope_id)
+
+    @property
+    def resolution_cache(self) -> tuple[int | None, dict]:
+        return self._resolution_cache.get()
+
+    @resolution_cache.setter
+    def resolution_cache(self, cache: tuple[int | None, dict]) -> None:
+        self._resolution_cache.set(cache)
+
+
+class _ScopeData(dict):
+    """
+    Опубликованный снимок регистраций скоупа.
+    Кроме самих регистраций хранит связь с родителем, список дочерних скоупов
+    и плоское представление: регистрации скоупа вместе со всеми унаследованными.
+    """
+
+    __slots__ = ("children", "flattened", "parent_id")
+
+    def __init__(
+        self, registrations: Mapping[str, Any] = _EMPTY_SCOPE, parent_id: str | None = None
+    ):
+        super().__init__(registrations)
+        self.parent_id = parent_id
+        self.children: set[str] = set()
+        self.flattened: Mapping[str, Any] | None = None
+
+
 class IoC:
     """
     IoC контейнер для разрешения зависимостей.
     Поддерживает скоупы и регистрацию стратегий разрешения зависимостей.
+
+    Запись идёт по принципу copy-on-write: команды регистрации под _lock собирают новый
+    словарь скоупа или глобальных стратегий и публикуют его одним присваиванием.
+    Опубликованные словари больше не изменяются, поэтому resolve читает их без блокировок
+    и никогда не видит скоуп в промежуточном состоянии.
+
+    Скоуп может наследовать регистрации родителя (игра → игрок → сессия). Для каждого скоупа
+    лениво строится плоское представление со всеми унаследованными ключами, поэтому поиск
+    не зависит от глубины вложенности. При изменении скоупа сбрасываются представления
+    только его потомков.
     """
 
     _strategies: ClassVar[dict[str, Callable[..., Any]]] = {}
-    _scopes: ClassVar[dict[str, dict[str, Any]]] = {}
-    _current_scope: ClassVar[threading.local] = threading.local()
+    _scopes: ClassVar[dict[str, _ScopeData]] = {}
+    # Объекты стратегий с Lifetime.SCOPED: {скоуп: {стратегия: объект}}
+    _scoped_instances: ClassVar[dict[str, dict[Any, Any]]] = {}
+    _current_scope: ClassVar[threading.local | ContextScope] = threading.local()
+    _lock: ClassVar[threading.RLock] = threading.RLock()
+    # Поколение регистраций: меняется при каждом изменении стратегий или скоупов.
+    # Каждое значение уникально, поэтому кеш, собранный при другом поколении, не используется
+    _generations: ClassVar[itertools.count] = itertools.count(1)
+    _generation: ClassVar[int] = 0
+    # Жизненный цикл скоупов: порядок последних изменений для вытеснения, финализаторы
+    # владельцев и скоупы, владельцы которых уже собраны сборщиком мусора
+    _scope_usage: ClassVar[OrderedDict[str, None]] = OrderedDict()
+    _scope_owners: ClassVar[dict[str, weakref.finalize]] = {}
+    _orphaned_scopes: ClassVar[deque[str]] = deque()
+    _scope_limit: ClassVar[int | None] = None
+    _evicted_scopes: ClassVar[int] = 0
+    _reclaimed_scopes: ClassVar[int] = 0
 
     @classmethod
-    def resolve(cls, key: str, *args, **kwargs) -> T:
+    def resolve(cls, key: Hashable, *args, **kwargs) -> T:
         """
         Разрешить зависимость по ключу.
 
         Args:
-            key: Ключ зависимости
+            key: Ключ зависимости: строка или любой другой хешируемый объект, например тип
             *args: Аргументы для создания объекта
             **kwargs: Именованные аргументы для создания объекта
 
         Returns:
             Объект зависимости
         """
-        if key == "IoC.Register":
-            return RegisterCommand(*args, **kwargs)
-        if key == "IoC.RegisterGlobal":
-            return RegisterGlobalCommand(*args, **kwargs)
-        if key == "Scopes.New":
-            return NewScopeCommand(*args, **kwargs)
-        if key == "Scopes.Current":
-            return SetCurrentScopeCommand(*args, **kwargs)
-        if key == "Scopes.Clear":
-            return ClearScopeCommand(*args, **kwargs)
+        builtin = _BUILTIN_COMMANDS.get(key)
+        if builtin is not None:
+            return builtin(*args, **kwargs)
 
-        return cls._resolve_dependency(key, *args, **kwargs)
+        strategy = cls._strategy_for(key)
+        if callable(strategy):
+            return strategy(*args, **kwargs)
+        return strategy
 
     @classmethod
-    def _resolve_dependency(cls, key: str, *args, **kwargs) -> T:
-        """Разрешить зависимость из скоупов или глобальных стратегий."""
-        current_scope_id = cls._get_current_scope_id()
-        scope_data = cls._get_scope_data(current_scope_id)
+    def _strategy_for(cls, key: Hashable) -> Any:
+        """
+        Стратегия ключа в текущем скоупе без учёта встроенных команд.
+        Общий поиск для IoC.resolve, IoCContainer.resolve и инструментирования.
+        """
+        # Быстрый путь: стратегия из кеша текущего потока, собранного в актуальном поколении
+        local = cls._current_scope
+        try:
+            generation, views = local.resolution_cache
+            strategy = views[local.scope_id][key]
+        except (AttributeError, KeyError):
+            return cls._lookup_strategy(key)
+        if generation != cls._generation:
+            return cls._lookup_strategy(key)
+        return strategy
 
-        if key in scope_data:
-            strategy = scope_data[key]
-            if callable(strategy):
-                return strategy(*args, **kwargs)
-            return strategy
+    @classmethod
+    def compile(cls, key: Hashable) -> Callable[..., Any]:
+        """
+        Скомпилировать ключ в функцию разрешения для горячих путей.
+        Функция привязана к скоупу, текущему в момент компиляции: она один раз находит
+        стратегию и дальше вызывает её напрямую, без поиска по строке и без встроенных
+        команд. После любой регистрации стратегия ищется заново при следующем вызове.
 
-        if key in cls._strategies:
-            strategy = cls._strategies[key]
-            if callable(strategy):
-                return strategy(*args, **kwargs)
-            return strategy
+        Returns:
+            Функция с теми же аргументами, что и стратегия, возвращающая объект зависимости
+        """
+        scope_id = cls._get_current_scope_id()
+        # Поколение и цель хранятся одним кортежем: его замена атомарна для других потоков
+        bound: tuple[int | None, Callable[..., Any] | None] = (None, None)
+
+        def resolver(*args, **kwargs) -> Any:
+            nonlocal bound
+            generation, target = bound
+            if generation != cls._generation:
+                generation = cls._generation
+                strategy = cls._find_strategy(scope_id, key)
+                target = strategy if callable(strategy) else _constant(strategy)
+                bound = (generation, target)
+            return target(*args, **kwargs)
+
+        resolver.__qualname__ = resolver.__name__ = f"resolve_{key}"
+        return resolver
 
+    @classmethod
+    def _lookup_strategy(cls, key: Hashable) -> Any:
+        """
+        Найти стратегию и положить её в кеш текущего потока.
+        Кеш хранится в thread-local рядом с текущим скоупом как пара (поколение, {скоуп: {ключ:
+        стратегия}}) и целиком заменяется, когда поколение регистраций изменилось.
+        """
+        local = cls._current_scope
+        generation = cls._generation
+        scope_id = cls._get_current_scope_id()
+        cached_generation, views = getattr(local, "resolution_cache", (None, None))
+        if cached_generation != generation:
+            views = {}
+            local.resolution_cache = (generation, views)
+
+        view = views.get(scope_id)
+        if view is None:
+            view = views[scope_id] = {}
+        strategy = view.get(key, _MISSING)
+        if strategy is _MISSING:
+            strategy = cls._find_strategy(scope_id, key)
+            view[key] = strategy
+        return strategy
+
+    @classmethod
+    def _find_strategy(cls, scope_id: str, key: Hashable) -> Any:
+        """Найти стратегию в скоупе с учётом предков, затем среди глобальных, без кеша."""
+        scope_data = cls._get_flattened_scope(scope_id)
+        if key in scope_data:
+            return scope_data[key]
+        if key in cls._strategies:
+            return cls._strategies[key]
         raise ValueError(f"Зависимость '{key}' не найдена")
 
+    @classmethod
+    @contextmanager
+    def scope(cls, scope_id: str, parent_id: str | None = None) -> Iterator[str]:
+        """
+        Скоуп на время блока with: создаётся и становится текущим на входе,
+        на выходе удаляется, а текущим снова становится прежний скоуп.
+        """
+        previous_scope_id = cls._get_current_scope_id()
+        NewScopeCommand(scope_id, parent_id).execute()
+        SetCurrentScopeCommand(scope_id).execute()
+        try:
+            yield scope_id
+        finally:
+            ClearScopeCommand(scope_id).execute()
+            cls._current_scope.scope_id = previous_scope_id
+
+    @classmethod
+    def set_scope_limit(cls, limit: int | None) -> None:
+        """
+        Ограничить число скоупов. При превышении вытесняются скоупы, которые дольше всех
+        не создавались и не изменялись. Скоуп root не вытесняется. None снимает ограничение.
+        """
+        if limit is not None and limit < 1:
+            raise ValueError("Лимит скоупов должен быть положительным")
+        with cls._lock:
+            cls._scope_limit = limit
+            cls._enforce_scope_limit()
+
+    @classmethod
+    def scope_stats(cls) -> ScopeStats:
+        """Число живых скоупов, их примерный размер в байтах и счётчики автоматического удаления."""
+        with cls._lock:
+            cls._reclaim_orphaned_scopes()
+            size = 0
+            for scope_data in cls._scopes.values():
+                size += sys.getsizeof(scope_data)
+                if scope_data.flattened is not None and scope_data.flattened is not scope_data:
+                    size += sys.getsizeof(scope_data.flattened)
+            size += sum(sys.getsizeof(instances) for instances in cls._scoped_instances.values())
+            return ScopeStats(
+                live=len(cls._scopes),
+                bytes=size,
+                evicted=cls._evicted_scopes,
+                reclaimed=cls._reclaimed_scopes,
+            )
+
+    @classmethod
+    def use_context_scopes(cls) -> None:
+        """
+        Хранить текущий скоуп в contextvars: у каждой asyncio-задачи свой скоуп.
+        Выбранные ранее текущие скоупы сбрасываются в root.
+
+        Цена — каждое чтение скоупа и кеша разрешения идёт через свойство и ContextVar.get,
+        поэтому переключение скоупа и разрешение из кеша дороже, чем с threading.local,
+        вплоть до двух раз (см. benchmarks/space_battle/bench_ioc.py). Режим стоит включать,
+        только если скоупы действительно нужны на уровне asyncio-задач.
+        """
+        cls._current_scope = ContextScope()
+
+    @classmethod
+    def use_thread_scopes(cls) -> None:
+        """Хранить текущий скоуп в threading.local: один скоуп на поток (по умолчанию)."""
+        cls._current_scope = threading.local()
+
+    @classmethod
+    def _invalidate(cls) -> None:
+        """Сбросить кеши разрешения во всех потоках. Вызывается после изменения регистраций."""
+        cls._generation = next(cls._generations)
+
     @classmethod
     def _get_current_scope_id(cls) -> str:
         """Получить ID текущего скоупа."""
@@ -80,45 +400,200 @@ class IoC:
         return cls._current_scope.scope_id
 
     @classmethod
-    def _get_scope_data(cls, scope_id: str) -> dict[str, Any]:
-        """Получить данные скоупа по ID."""
-        if scope_id not in cls._scopes:
-            cls._scopes[scope_id] = {}
-        return cls._scopes[scope_id]
+    def _get_scope_data(cls, scope_id: str) -> Mapping[str, Any]:
+        """Получить опубликованный снимок скоупа по ID. Снимок изменять нельзя."""
+        return cls._scopes.get(scope_id, _EMPTY_SCOPE)
+
+    @classmethod
+    def _get_flattened_scope(cls, scope_id: str) -> Mapping[str, Any]:
+        """Получить регистрации скоупа вместе с унаследованными от предков."""
+        scope_data = cls._scopes.get(scope_id)
+        if scope_data is None:
+            return _EMPTY_SCOPE
+        flattened = scope_data.flattened
+        if flattened is not None:
+            return flattened
+        # Построение идёт под блокировкой писателей, иначе представление, собранное
+        # по старому родителю, могло бы быть сохранено уже после сброса
+        with cls._lock:
+            scope_data = cls._scopes.get(scope_id)
+            if scope_data is None:
+                return _EMPTY_SCOPE
+            if scope_data.flattened is None:
+                parent_id = scope_data.parent_id
+                inherited = (
+                    _EMPTY_SCOPE if parent_id is None else cls._get_flattened_scope(parent_id)
+                )
+                scope_data.flattened = {**inherited, **scope_data} if inherited else scope_data
+            return scope_data.flattened
+
+    @classmethod
+    def _publish_scope(cls, scope_id: str, scope_data: _ScopeData) -> None:
+        """Опубликовать новый снимок скоупа. Вызывается писателями под _lock."""
+        previous = cls._scopes.get(scope_id)
+        if previous is not None:
+            scope_data.children = previous.children
+        cls._scopes[scope_id] = scope_data
+        cls._drop_flattened(scope_data.children)
+        cls._scope_usage[scope_id] = None
+        cls._scope_usage.move_to_end(scope_id)
+        cls._reclaim_orphaned_scopes()
+        cls._enforce_scope_limit(protected=scope_id)
+        cls._invalidate()
+
+    @classmethod
+    def _remove_scope(cls, scope_id: str) -> bool:
+        """Удалить скоуп, его объекты SCOPED и финализатор владельца. Вызывается под _lock."""
+        cls._scoped_instances.pop(scope_id, None)
+        cls._scope_usage.pop(scope_id, None)
+        owner = cls._scope_owners.pop(scope_id, None)
+        if owner is not None:
+            owner.detach()
+        scope_data = cls._scopes.pop(scope_id, None)
+        if scope_data is None:
+            return False
+        # Дочерние скоупы остаются, но больше ничего не наследуют
+        for child_id in scope_data.children:
+            child = cls._scopes.get(child_id)
+            if child is not None:
+                child.parent_id = None
+        cls._drop_flattened(scope_data.children)
+        parent = cls._scopes.get(scope_data.parent_id)
+        if parent is not None:
+            parent.children.discard(scope_id)
+        cls._invalidate()
+        return True
+
+    @classmethod
+    def _set_scope_owner(cls, scope_id: str, owner: object | None) -> None:
+        """Привязать скоуп к владельцу: когда владелец собран, скоуп будет удалён."""
+        previous = cls._scope_owners.pop(scope_id, None)
+        if previous is not None:
+            previous.detach()
+        if owner is not None:
+            cls._scope_owners[scope_id] = weakref.finalize(
+                owner, cls._orphaned_scopes.append, scope_id
+            )
+
+    @classmethod
+    def _reclaim_orphaned_scopes(cls) -> None:
+        """
+        Удалить скоупы, владельцы которых собраны. Финализатор только ставит скоуп
+        в очередь: он может сработать посреди записи, и менять скоупы в нём небезопасно.
+        """
+        while cls._orphaned_scopes:
+            scope_id = cls._orphaned_scopes.popleft()
+            finalizer = cls._scope_owners.get(scope_id)
+            # Скоуп пересоздан после сборки прежнего владельца: запись в очереди устарела
+            if finalizer is None or finalizer.alive:
+                continue
+            if cls._remove_scope(scope_id):
+                cls._reclaimed_scopes += 1
+
+    @classmethod
+    def _enforce_scope_limit(cls, protected: str | None = None) -> None:
+        """Вытеснить самые давно изменённые скоупы сверх лимита, кроме root и предков protected."""
+        limit = cls._scope_limit
+        if limit is None or len(cls._scopes) <= limit:
+            return
+        keep = {"root"}
+        ancestor_id = protected
+        while ancestor_id is not None and ancestor_id not in keep:
+            keep.add(ancestor_id)
+            ancestor = cls._scopes.get(ancestor_id)
+            ancestor_id = None if ancestor is None else ancestor.parent_id
+        for scope_id in list(cls._scope_usage):
+            if len(cls._scopes) <= limit:
+                break
+            if scope_id in keep:
+                continue
+            if cls._remove_scope(scope_id):
+                cls._evicted_scopes += 1
+
+    @classmethod
+    def _drop_flattened(cls, scope_ids: set[str]) -> None:
+        """Сбросить плоские представления скоупов и всех их потомков."""
+        pending = list(scope_ids)
+        while pending:
+            scope_data = cls._scopes.get(pending.pop())
+            if scope_data is not None:
+                scope_data.flattened = None
+                pending.extend(scope_data.children)
 
 
 class RegisterCommand(CommandInterface):
     """Команда для регистрации зависимости в IoC контейнере."""
 
-    def __init__(self, key: str, strategy: Callable[..., Any]):
+    def __init__(
+        self, key: Hashable, strategy: Callable[..., Any], lifetime: Lifetime = Lifetime.TRANSIENT
+    ):
         self.key = key
-        self.strategy = strategy
+        self.strategy = _apply_lifetime(strategy, lifetime)
 
     def execute(self) -> None:
         current_scope_id = IoC._get_current_scope_id()
-        scope_data = IoC._get_scope_data(current_scope_id)
-        scope_data[self.key] = self.strategy
+        with IoC._lock:
+            previous = IoC._scopes.get(current_scope_id)
+            parent_id = None if previous is None else previous.parent_id
+            scope_data = _ScopeData(IoC._get_scope_data(current_scope_id), parent_id)
+            scope_data[self.key] = self.strategy
+            IoC._publish_scope(current_scope_id, scope_data)
 
 
 class RegisterGlobalCommand(CommandInterface):
     """Команда для глобальной регистрации зависимости в IoC контейнере."""
 
-    def __init__(self, key: str, strategy: Callable[..., Any]):
+    def __init__(
+        self, key: Hashable, strategy: Callable[..., Any], lifetime: Lifetime = Lifetime.TRANSIENT
+    ):
         self.key = key
-        self.strategy = strategy
+        self.strategy = _apply_lifetime(strategy, lifetime)
 
     def execute(self) -> None:
-        IoC._strategies[self.key] = self.strategy
+        with IoC._lock:
+            strategies = dict(IoC._strategies)
+            strategies[self.key] = self.strategy
+            IoC._strategies = strategies
+            IoC._invalidate()
 
 
 class NewScopeCommand(CommandInterface):
-    """Команда для создания нового скоупа."""
+    """
+    Команда для создания нового скоупа.
+    Если задан parent_id, скоуп наследует регистрации родителя и всех его предков.
+    Если задан owner, скоуп удаляется автоматически, когда владелец (например, объект игры)
+    собран сборщиком мусора.
+    """
 
-    def __init__(self, scope_id: str):
+    def __init__(self, scope_id: str, parent_id: str | None = None, owner: object | None = None):
         self.scope_id = scope_id
+        self.parent_id = parent_id
+        self.owner = owner
 
     def execute(self) -> None:
-        IoC._scopes[self.scope_id] = {}
+        with IoC._lock:
+            if self.parent_id is not None:
+                self._attach_to_parent()
+            previous = IoC._scopes.get(self.scope_id)
+            if previous is not None and previous.parent_id is not None:
+                previous_parent = IoC._scopes.get(previous.parent_id)
+                if previous_parent is not None and self.parent_id != previous.parent_id:
+                    previous_parent.children.discard(self.scope_id)
+            IoC._scoped_instances.pop(self.scope_id, None)
+            IoC._set_scope_owner(self.scope_id, self.owner)
+            IoC._publish_scope(self.scope_id, _ScopeData(parent_id=self.parent_id))
+
+    def _attach_to_parent(self) -> None:
+        parent = IoC._scopes.get(self.parent_id)
+        if parent is None:
+            raise ValueError(f"Родительский скоуп '{self.parent_id}' не найден")
+        ancestor_id = self.parent_id
+        while ancestor_id is not None:
+            if ancestor_id == self.scope_id:
+                raise ValueError(f"Скоуп '{self.scope_id}' не может быть собственным предком")
+            ancestor = IoC._scopes.get(ancestor_id)
+            ancestor_id = None if ancestor is None else ancestor.parent_id
+        parent.children.add(self.scope_id)
 
 
 class SetCurrentScopeCommand(CommandInterface):
@@ -138,7 +613,16 @@ class ClearScopeCommand(CommandInterface):
         self.scope_id = scope_id
 
     def execute(self) -> None:
-        if self.scope_id in IoC._scopes:
-            del IoC._scopes[self.scope_id]
+        with IoC._lock:
+            IoC._remove_scope(self.scope_id)
         if hasattr(IoC._current_scope, "scope_id") and IoC._current_scope.scope_id == self.scope_id:
             IoC._current_scope.scope_id = "root"
+
+
+_BUILTIN_COMMANDS: dict[str, type[CommandInterface]] = {
+    "IoC.Register": RegisterCommand,
+    "IoC.RegisterGlobal": RegisterGlobalCommand,
+    "Scopes.New": NewScopeCommand,
+    "Scopes.Current": SetCurrentScopeCommand,
+    "Scopes.Clear": ClearScopeCommand,
+}
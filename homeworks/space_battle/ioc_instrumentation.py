@@ -0,0 +1,219 @@
+import threading
+import time
+from collections.abc import Hashable
+from typing import Any
+
+from homeworks.space_battle.ioc import _BUILTIN_COMMANDS, IoC
+
+__all__ = [
+    "IoCInstrumentation",
+    "KeyStats",
+]
+
+# Корзины гистограммы по степеням двойки в наносекундах: корзина i — до 2**i нс
+HISTOGRAM_BUCKETS = 64
+
+
+class KeyStats:
+    """Счётчики разрешения одного ключа: вызовы, попадания в кеш, ошибки и гистограмма времени."""
+
+    __slots__ = ("buckets", "calls", "errors", "hits", "misses", "total_ns")
+
+    def __init__(self):
+        self.calls = 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+
+    def merge(self, other: "KeyStats") -> None:
+        self.calls += other.calls
+        self.hits += other.hits
+        self.misses += other.misses
+        self.errors += other.errors
+        self.total_ns += other.total_ns
+        self.buckets = [
+            mine + theirs for mine, theirs in zip(self.buckets, other.buckets, strict=True)
+        ]
+
+    def percentile_ns(self, fraction: float) -> int:
+        """Верхняя граница корзины, в которую попадает заданная доля вызовов стратегии."""
+        timed = sum(self.buckets)
+        if not timed:
+            return 0
+        rank = max(1, round(fraction * timed))
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return 1 << index
+        return 1 << (HISTOGRAM_BUCKETS - 1)
+
+
+def _key_name(key: Hashable) -> str:
+    """Имя ключа в отчёте: строка как есть, тип — с модулем, остальное — repr."""
+    if isinstance(key, str):
+        return key
+    if isinstance(key, type):
+        return f"{key.__module__}.{key.__qualname__}"
+    return repr(key)
+
+
+class IoCInstrumentation:
+    """
+    Сбор статистики IoC.resolve по ключам: число вызовов, попадания и промахи кеша
+    разрешения, ошибки и гистограмма времени выполнения стратегии.
+
+    enable() подменяет IoC.resolve инструментированной версией, disable() возвращает
+    исходную, поэтому в выключенном состоянии накладных расходов нет. Поиск стратегии
+    идёт через общий IoC._strategy_for, а промахи кеша отмечает обёртка
+    IoC._lookup_strategy. Счётчики ведутся отдельно в каждом потоке без блокировок
+    и складываются при построении отчёта.
+    Встроенные команды, IoC.compile и IoCContainer.resolve не учитываются.
+    """
+
+    _active: "IoCInstrumentation | None" = None
+
+    def __init__(self):
+        self._original_resolve: Any = None
+        self._original_lookup: Any = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._thread_stats: list[dict[Hashable, KeyStats]] = []
+
+    @property
+    def enabled(self) -> bool:
+        return IoCInstrumentation._active is self
+
+    def enable(self) -> None:
+        if IoCInstrumentation._active is not None:
+            raise RuntimeError("Инструментирование IoC уже включено")
+        IoCInstrumentation._active = self
+        self._original_resolve = IoC.__dict__["resolve"]
+        self._original_lookup = IoC.__dict__["_lookup_strategy"]
+        IoC._lookup_strategy = classmethod(self._make_lookup(self._original_lookup.__func__))
+        IoC.resolve = classmethod(self._make_resolve())
+
+    def disable(self) -> None:
+        if IoCInstrumentation._active is not self:
+            return
+        IoC.resolve = self._original_resolve
+        IoC._lookup_strategy = self._original_lookup
+        IoCInstrumentation._active = None
+        self._original_resolve = None
+        self._original_lookup = None
+
+    def reset(self) -> None:
+        with self._lock:
+            for stats in self._thread_stats:
+                stats.clear()
+
+    def _current_thread_stats(self) -> dict[Hashable, KeyStats]:
+        try:
+            return self._local.stats
+        except AttributeError:
+            stats: dict[Hashable, KeyStats] = {}
+            self._local.stats = stats
+            with self._lock:
+                self._thread_stats.append(stats)
+            return stats
+
+    def _make_lookup(self, lookup):
+        thread_local = self._local
+
+        def lookup_strategy(cls, key: Hashable) -> Any:
+            # IoC._strategy_for обращается сюда только при промахе кеша разрешения
+            thread_local.missed = True
+            return lookup(cls, key)
+
+        return lookup_strategy
+
+    def _make_resolve(self):
+        perf_counter_ns = time.perf_counter_ns
+        thread_local = self._local
+
+        def resolve(cls, key: Hashable, *args, **kwargs) -> Any:
+            builtin = _BUILTIN_COMMANDS.get(key)
+            if builtin is not None:
+                return builtin(*args, **kwargs)
+
+            try:
+                thread_stats = thread_local.stats
+            except AttributeError:
+                thread_stats = self._current_thread_stats()
+            stats = thread_stats.get(key)
+            if stats is None:
+                stats = thread_stats[key] = KeyStats()
+            stats.calls += 1
+
+            thread_local.missed = False
+            try:
+                try:
+                    strategy = cls._strategy_for(key)
+                finally:
+                    if thread_local.missed:
+                        stats.misses += 1
+                    else:
+                        stats.hits += 1
+                if not callable(strategy):
+                    return strategy
+                start = perf_counter_ns()
+                try:
+                    return strategy(*args, **kwargs)
+                finally:
+                    elapsed = perf_counter_ns() - start
+                    stats.total_ns += elapsed
+                    stats.buckets[min(elapsed.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+            except Exception:
+                stats.errors += 1
+                raise
+
+        return resolve
+
+    def snapshot(self) -> dict[Hashable, KeyStats]:
+        """Суммарная статистика по всем потокам."""
+        total: dict[Hashable, KeyStats] = {}
+        with self._lock:
+            per_thread = [dict(stats) for stats in self._thread_stats]
+        for stats in per_thread:
+            for key, key_stats in stats.items():
+                total.setdefault(key, KeyStats()).merge(key_stats)
+        return total
+
+    def export(self) -> dict[str, dict[str, Any]]:
+        """Статистика в виде, пригодном для json.dumps."""
+        exported: dict[str, dict[str, Any]] = {}
+        for key, stats in self.snapshot().items():
+            name = _key_name(key)
+            if name in exported:
+                # Разные ключи с одинаковым именем не должны затирать статистику друг друга
+                name = f"{name} ({type(key).__name__} {id(key):#x})"
+            exported[name] = {
+                "calls": stats.calls,
+                "hits": stats.hits,
+                "misses": stats.misses,
+                "errors": stats.errors,
+                "total_ns": stats.total_ns,
+                "p50_ns": stats.percentile_ns(0.5),
+                "p99_ns": stats.percentile_ns(0.99),
+                "histogram_ns": {
+                    str(1 << index): count for index, count in enumerate(stats.buckets) if count
+                },
+            }
+        return exported
+
+    def report(self, limit: int = 20) -> str:
+        """Текстовый отчёт: ключи по убыванию суммарного времени стратегий."""
+        rows = sorted(self.export().items(), key=lambda item: item[1]["total_ns"], reverse=True)
+        lines = [
+            f"{'key':<40} {'calls':>10} {'hits':>10} {'misses':>8} {'errors':>7}"
+            f" {'total ms':>10} {'p50 ns':>9} {'p99 ns':>9}"
+        ]
+        for name, stats in rows[:limit]:
+            lines.append(
+                f"{name[:40]:<40} {stats['calls']:>10} {stats['hits']:>10} {stats['misses']:>8}"
+                f" {stats['errors']:>7} {stats['total_ns'] / 1e6:>10.3f}"
+                f" {stats['p50_ns']:>9} {stats['p99_ns']:>9}"
+            )
+        return "\n".join(lines)
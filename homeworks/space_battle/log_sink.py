@@ -0,0 +1,125 @@
+import sys
+import threading
+from collections import deque
+from enum import Enum
+from typing import TextIO
+
+__all__ = [
+    "LogSink",
+    "OverflowPolicy",
+]
+
+
+class OverflowPolicy(Enum):
+    DROP_NEWEST = "drop_newest"
+    DROP_OLDEST = "drop_oldest"
+
+
+class LogSink:
+    """
+    Буферизованный журнал ошибок команд.
+
+    write() только кладёт пару (тип команды, исключение) в ограниченный кольцевой буфер,
+    без форматирования строк и ввода-вывода. Фоновый поток раз в flush_interval секунд
+    или при заполнении половины буфера забирает записи, форматирует их
+    и пишет в поток одним вызовом write.
+
+    При переполнении буфера запись отбрасывается по политике overflow:
+    DROP_NEWEST отбрасывает новую запись, DROP_OLDEST — самую старую из буфера.
+    Число отброшенных записей доступно в dropped.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        *,
+        capacity: int = 4096,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_NEWEST,
+        flush_interval: float = 0.05,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("Размер буфера должен быть положительным")
+        self.stream = stream if stream is not None else sys.stdout
+        self.capacity = capacity
+        self.overflow = overflow
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        # deque с maxlen — кольцевой буфер на C: при заполнении append сам вытесняет
+        # самую старую запись. Проверка заполнения и append выполняются под _lock,
+        # иначе несколько писателей переполнят буфер мимо счётчика dropped
+        self._records: deque[tuple[type, BaseException | type[BaseException]]] = deque(
+            maxlen=capacity
+        )
+        self._drop_newest = overflow is OverflowPolicy.DROP_NEWEST
+        self._wake_size = max(1, capacity // 2)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __enter__(self) -> "LogSink":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, command: object, exc: BaseException | type[BaseException]) -> None:
+        """Записать ошибку команды в буфер."""
+        records = self._records
+        with self._lock:
+            size = len(records)
+            if size >= self.capacity:
+                # Буфер полон, фоновый поток не успевает
+                self.dropped += 1
+                if self._drop_newest:
+                    return
+            records.append((type(command), exc))
+        if size + 1 == self._wake_size:
+            self._wake.set()
+
+    def start(self) -> None:
+        """Запускает фоновый поток записи."""
+        if self._thread is not None:
+            raise RuntimeError("Журнал уже запущен")
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Останавливает фоновый поток и записывает оставшиеся записи."""
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def flush(self) -> int:
+        """Забирает записи из буфера и пишет их в поток. Возвращает число записей."""
+        with self._flush_lock:
+            popleft = self._records.popleft
+            # Забираем столько записей, сколько было на начало: новые допишет следующий flush
+            records = [popleft() for _ in range(len(self._records))]
+            if not records:
+                return 0
+            self.stream.write(
+                "".join(
+                    f"[LOG] Exception in {command_type.__name__}: {exc}\n"
+                    for command_type, exc in records
+                )
+            )
+            self.stream.flush()
+            self.written += len(records)
+            return len(records)
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
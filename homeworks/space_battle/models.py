@@ -1,55 +1,141 @@
 import math
 from dataclasses import dataclass
 
+# Угол целочисленный, поэтому синус и косинус считаются один раз на каждый градус
+COS_TABLE: tuple[float, ...] = tuple(math.cos(math.radians(degrees)) for degrees in range(360))
+SIN_TABLE: tuple[float, ...] = tuple(math.sin(math.radians(degrees)) for degrees in range(360))
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Point:
     x: int
     y: int
 
     def __add__(self, other: "Vector") -> "Point":
-        if not isinstance(other, Vector):
+        if type(other) is Vector:
+            x = self.x + other.x
+            y = self.y + other.y
+            if type(x) is int and type(y) is int:
+                # Горячий путь без вызова _new_point: лишний кадр стека заметен на фоне сложения
+                point = _new_object(Point)
+                _set_point_x(point, x)
+                _set_point_y(point, y)
+                return point
+        elif not isinstance(other, Vector):
             return NotImplemented
-        # Ensure integer addition and result
-        return Point(int(self.x + other.x), int(self.y + other.y))
+        x = self.x + other.x
+        y = self.y + other.y
+        # Ensure integer result; int() only for non-int operands
+        if type(x) is not int:
+            x = int(x)
+        if type(y) is not int:
+            y = int(y)
+        return _new_point(x, y)
+
+    def translate(self, dx: int, dy: int) -> "Point":
+        """Сдвиг на целые dx, dy без промежуточного Vector и проверок типов — для горячих циклов."""
+        return _new_point(self.x + dx, self.y + dy)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Vector:
     x: int
     y: int
 
     def __add__(self, other: "Vector") -> "Vector":
-        if not isinstance(other, Vector):
+        if type(other) is Vector:
+            x = self.x + other.x
+            y = self.y + other.y
+            if type(x) is int and type(y) is int:
+                # Горячий путь без вызова _new_vector: лишний кадр стека заметен на фоне сложения
+                vector = _new_object(Vector)
+                _set_vector_x(vector, x)
+                _set_vector_y(vector, y)
+                return vector
+        elif not isinstance(other, Vector):
             return NotImplemented
-        # Ensure integer addition and result
-        return Vector(int(self.x + other.x), int(self.y + other.y))
+        x = self.x + other.x
+        y = self.y + other.y
+        # Ensure integer result; int() only for non-int operands
+        if type(x) is not int:
+            x = int(x)
+        if type(y) is not int:
+            y = int(y)
+        return _new_vector(x, y)
+
+    def translate(self, dx: int, dy: int) -> "Vector":
+        """Сложение с целыми dx, dy без промежуточного Vector и проверок типов."""
+        return _new_vector(self.x + dx, self.y + dy)
+
+
+# __init__ замороженного dataclass присваивает поля через object.__setattr__;
+# запись напрямую через дескрипторы слотов заметно дешевле
+_new_object = object.__new__
+_set_point_x = Point.x.__set__
+_set_point_y = Point.y.__set__
+_set_vector_x = Vector.x.__set__
+_set_vector_y = Vector.y.__set__
+
+
+def _new_point(x: int, y: int) -> Point:
+    point = _new_object(Point)
+    _set_point_x(point, x)
+    _set_point_y(point, y)
+    return point
+
 
+def _new_vector(x: int, y: int) -> Vector:
+    vector = _new_object(Vector)
+    _set_vector_x(vector, x)
+    _set_vector_y(vector, y)
+    return vector
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Angle:
+    """
+    Целочисленный угол в градусах.
+    Углы из [0, 360), которые возвращают of(), normalized() и арифметика, берутся
+    из заранее созданного набора экземпляров и не создаются заново.
+    """
+
     degrees: int
 
+    @classmethod
+    def of(cls, degrees: int) -> "Angle":
+        """Угол без создания нового объекта, если degrees лежит в [0, 360)."""
+        if 0 <= degrees < 360:  # noqa: PLR2004
+            return _ANGLES[degrees]
+        return cls(degrees)
+
     def radians(self) -> float:
         """Возвращает угол в радианах."""
         return math.radians(self.degrees)
 
+    def cos(self) -> float:
+        """Косинус угла из предрассчитанной таблицы."""
+        return COS_TABLE[self.degrees % 360]
+
+    def sin(self) -> float:
+        """Синус угла из предрассчитанной таблицы."""
+        return SIN_TABLE[self.degrees % 360]
+
     def normalized(self) -> "Angle":
         """Возвращает угол, приведённый к диапазону [0, 360)."""
-        return Angle(self.degrees % 360)
+        return _ANGLES[self.degrees % 360]
 
     def __add__(self, other: "Angle | int") -> "Angle":
         if isinstance(other, Angle):
-            return Angle(self.degrees + other.degrees)
+            return Angle.of(self.degrees + other.degrees)
         if isinstance(other, int):
-            return Angle(self.degrees + other)
+            return Angle.of(self.degrees + other)
         return NotImplemented
 
     def __sub__(self, other: "Angle | int") -> "Angle":
         if isinstance(other, Angle):
-            return Angle(self.degrees - other.degrees)
+            return Angle.of(self.degrees - other.degrees)
         if isinstance(other, int):
-            return Angle(self.degrees - other)
+            return Angle.of(self.degrees - other)
         return NotImplemented
 
     def __eq__(self, other: "Angle | int") -> bool:
@@ -58,3 +144,6 @@ class Angle:
         if isinstance(other, int):
             return self.degrees == other
         return False
+
+
+_ANGLES: tuple[Angle, ...] = tuple(Angle(degrees) for degrees in range(360))
@@ -0,0 +1,95 @@
+import heapq
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from itertools import count
+from queue import Queue, SimpleQueue
+
+from homeworks.space_battle.interfaces import CommandInterface
+
+__all__ = [
+    "Backoff",
+    "RetryScheduler",
+]
+
+# Ограничение показателя степени: дальше задержка всё равно упирается в max_delay
+_MAX_EXPONENT = 64
+
+
+@dataclass(frozen=True, slots=True)
+class Backoff:
+    """
+    Экспоненциальная задержка повторов.
+
+    base — задержка перед первым повтором в секундах;
+    factor — во сколько раз растёт задержка с каждым следующим повтором;
+    max_delay — верхняя граница задержки;
+    jitter — доля случайного разброса: задержка умножается на число из [1 - jitter, 1 + jitter],
+    чтобы команды, упавшие одновременно, не повторялись тоже одновременно.
+    """
+
+    base: float = 0.01
+    factor: float = 2.0
+    max_delay: float = 1.0
+    jitter: float = 0.1
+
+    def delay(self, attempt: int) -> float:
+        """Задержка перед повтором с номером attempt, начиная с 1."""
+        exponent = min(max(attempt - 1, 0), _MAX_EXPONENT)
+        delay = min(self.max_delay, self.base * self.factor**exponent)
+        if self.jitter:
+            delay *= 1 + self.jitter * (2 * random.random() - 1)  # noqa: S311
+        return delay
+
+
+class RetryScheduler:
+    """
+    Отложенные повторы команд.
+
+    Команды хранятся в куче по сроку выполнения и переносятся в очередь сервера
+    методом promote_due, когда срок наступил. Игровой цикл вызывает его на каждом тике:
+    если ни один повтор ещё не готов, это одно сравнение с вершиной кучи.
+    Постановка и перенос повтора стоят O(log n) от числа ожидающих повторов.
+    """
+
+    def __init__(
+        self,
+        queue: Queue | SimpleQueue,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.queue = queue
+        self._clock = clock
+        self._heap: list[tuple[float, int, CommandInterface]] = []
+        # Порядковый номер разрешает равные сроки без сравнения команд
+        self._sequence = count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, command: CommandInterface, delay: float) -> None:
+        """Поставить команду в очередь сервера через delay секунд."""
+        due = self._clock() + delay
+        with self._lock:
+            heapq.heappush(self._heap, (due, next(self._sequence), command))
+
+    def promote_due(self) -> float | None:
+        """
+        Перенести в очередь сервера все повторы, срок которых наступил.
+
+        Returns:
+            Сколько секунд осталось до ближайшего повтора, или None, если повторов нет
+        """
+        heap = self._heap
+        if not heap:
+            return None
+        now = self._clock()
+        with self._lock:
+            while heap and heap[0][0] <= now:
+                self.queue.put(heapq.heappop(heap)[2])
+            if not heap:
+                return None
+            return heap[0][0] - now
@@ -0,0 +1,419 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from queue import Empty, Queue, SimpleQueue
+from typing import Any
+
+from homeworks.space_battle.commands import LowPriorityCommand, unwrap_command
+from homeworks.space_battle.handlers import ExceptionsStorage, LogExceptionHandler
+from homeworks.space_battle.interfaces import (
+    CommandInterface,
+    ExceptionHandlerInterface,
+    GameServerInterface,
+)
+from homeworks.space_battle.retry import RetryScheduler
+
+__all__ = [
+    "BaseGameServer",
+    "GameServer",
+    "HardStopCommand",
+    "PauseCommand",
+    "ResumeCommand",
+    "ServerState",
+    "SoftStopCommand",
+    "TickConfig",
+    "TickStats",
+    "TickSummary",
+]
+
+
+class ServerState(Enum):
+    RUNNING = "running"
+    PAUSED = "paused"
+    SOFT_STOP = "soft_stop"
+    HARD_STOP = "hard_stop"
+
+
+class _WakeUpCommand(CommandInterface):
+    """Пустая команда: будит потоки, заблокированные на чтении очереди."""
+
+    def execute(self) -> None:
+        pass
+
+
+_WAKE_UP = _WakeUpCommand()
+
+# Как долго поток с планировщиком повторов ждёт очередь, прежде чем снова проверить кучу:
+# повтор может поставить другой поток, пока этот заблокирован на чтении
+_RETRY_POLL_INTERVAL = 0.01
+
+
+@dataclass(frozen=True, slots=True)
+class TickConfig:
+    """
+    Настройки потикового режима.
+
+    budget — бюджет времени на тик в секундах;
+    shed_watermark — длина очереди, выше которой сбрасываются LowPriorityCommand;
+    stats_window — сколько последних тиков хранится для статистики.
+    """
+
+    budget: float = 0.01
+    shed_watermark: int | None = None
+    stats_window: int = 1024
+
+
+@dataclass(frozen=True, slots=True)
+class TickStats:
+    """Статистика одного тика."""
+
+    executed: int
+    deferred: int
+    dropped: int
+    degraded: int
+    duration: float
+
+
+@dataclass(frozen=True, slots=True)
+class TickSummary:
+    """Сводка по последним тикам: суммы счётчиков и перцентили длительности тика."""
+
+    ticks: int
+    executed: int
+    deferred: int
+    dropped: int
+    degraded: int
+    p50: float
+    p99: float
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    """Перцентиль методом ближайшего ранга."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class BaseGameServer(GameServerInterface):
+    """
+    Общая часть синхронного и асинхронного игровых циклов: управляющий флаг,
+    команды остановки и паузы, выбор обработчика исключения.
+
+    Наследник задаёт queue, _default_handler и _resumed — threading.Event
+    или asyncio.Event: установка и сброс у них одинаковые, а ожидание паузы
+    наследник выполняет сам.
+    """
+
+    queue: Any
+    _default_handler: ExceptionHandlerInterface
+    _resumed: Any
+    _control: ServerState | None
+
+    @property
+    def state(self) -> ServerState:
+        return self._control or ServerState.RUNNING
+
+    def put(self, command: CommandInterface) -> None:
+        self.queue.put(command)
+
+    def hard_stop(self) -> None:
+        self._control = ServerState.HARD_STOP
+        self._resumed.set()
+
+    def soft_stop(self) -> None:
+        self._control = ServerState.SOFT_STOP
+        self._resumed.set()
+
+    def pause(self) -> None:
+        self._resumed.clear()
+        self._control = ServerState.PAUSED
+
+    def resume(self) -> None:
+        if self._control is ServerState.PAUSED:
+            self._control = None
+        self._resumed.set()
+
+    def _handle_exception(self, command: CommandInterface, exc: Exception) -> None:
+        # Повторитель упал — обработчик тот же, что и для исходной команды
+        handler = ExceptionsStorage.resolve(unwrap_command(command), exc) or self._default_handler
+        try:
+            handler.handle(exc=exc, command=command)
+        except Exception as handler_exc:
+            self._handler_failed(handler, command, handler_exc)
+
+    def _handler_failed(
+        self, handler: ExceptionHandlerInterface, command: CommandInterface, exc: Exception
+    ) -> None:
+        """
+        Ошибка в обработчике не должна останавливать игровой цикл: её получает обработчик
+        по умолчанию, а если упал и он — ошибка только печатается.
+        """
+        default_handler = self._default_handler
+        if handler is not default_handler:
+            try:
+                default_handler.handle(exc=exc, command=command)
+            except Exception as default_exc:
+                exc = default_exc
+            else:
+                return
+        print(f"[LOG] Exception in handler for {type(command).__name__}: {exc}")
+
+    def _stop_requested(self, control: ServerState | None) -> bool:
+        """Нужно ли завершить цикл при флаге control, прочитанном после паузы."""
+        if control is ServerState.HARD_STOP:
+            return True
+        if control is ServerState.SOFT_STOP:
+            return self._drained()
+        return False
+
+    def _drained(self) -> bool:
+        return self.queue.empty()
+
+
+class GameServer(BaseGameServer):
+    """
+    Игровой цикл: потоки-обработчики читают Команды из очереди и выполняют их.
+
+    Вызов execute() обёрнут в единственный блок try/except, который перехватывает
+    только базовое Exception. Обработчик выбирается через ExceptionsStorage по команде
+    (для повторителей — по исходной команде) и исключению, если подходящего нет —
+    используется обработчик по умолчанию. Ошибка внутри обработчика не останавливает
+    поток: она передаётся обработчику по умолчанию.
+
+    Управление циклом выполняется Командами, которые кладутся в ту же очередь:
+    HardStopCommand, SoftStopCommand и PauseCommand. Флаг проверяется после каждой
+    команды, поэтому поток, ждущий на пустой очереди, отреагирует на паузу
+    после следующей полученной команды.
+
+    Кроме непрерывного режима (run/start) есть потиковый (run_tick/run_ticks):
+    за тик выполняются команды, пока не исчерпан бюджет времени из TickConfig,
+    остальные переносятся на следующий тик. Если очередь длиннее порога,
+    команды LowPriorityCommand отбрасываются или заменяются упрощённой версией.
+
+    Если задан retry_scheduler, отложенные повторы, срок которых наступил, переносятся
+    в очередь в начале каждого тика, а в непрерывном режиме — перед чтением очереди;
+    чтение очереди тогда ждёт не дольше _RETRY_POLL_INTERVAL, чтобы заметить повтор,
+    поставленный из другого потока.
+    Мягкая остановка дожидается и отложенных повторов.
+    """
+
+    def __init__(
+        self,
+        *,
+        queue: Queue | SimpleQueue | None = None,
+        workers: int = 1,
+        default_handler: ExceptionHandlerInterface | None = None,
+        tick_config: TickConfig | None = None,
+        retry_scheduler: RetryScheduler | None = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("Количество потоков должно быть положительным")
+        # SimpleQueue реализована на C и заметно дешевле Queue на put/get
+        self.queue = queue if queue is not None else SimpleQueue()
+        self._workers_count = workers
+        self._default_handler = default_handler or LogExceptionHandler(queue=self.queue)
+        self._threads: list[threading.Thread] = []
+        self._alive = 0
+        self._alive_lock = threading.Lock()
+        # None — штатная работа, проверка в цикле сводится к одному сравнению
+        self._control: ServerState | None = None
+        self._resumed = threading.Event()
+        self._resumed.set()
+        self.tick_config = tick_config or TickConfig()
+        self.ticks: deque[TickStats] = deque(maxlen=self.tick_config.stats_window)
+        self.retry_scheduler = retry_scheduler
+
+    def start(self) -> None:
+        """Запускает потоки-обработчики очереди."""
+        if self._threads:
+            raise RuntimeError("Сервер уже запущен")
+        self._control = None
+        for number in range(self._workers_count):
+            thread = threading.Thread(target=self.run, name=f"game-loop-{number}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def join(self, timeout: float | None = None) -> None:
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+
+    def run(self) -> None:
+        """Цикл обработки очереди в текущем потоке."""
+        with self._alive_lock:
+            self._alive += 1
+        try:
+            self._loop()
+        finally:
+            with self._alive_lock:
+                self._alive -= 1
+                others_alive = self._alive > 0
+            if others_alive:
+                # Будим следующий поток, ждущий на get(), чтобы он тоже проверил флаг
+                self.queue.put(_WAKE_UP)
+
+    def _loop(self) -> None:
+        get = self.queue.get
+        handle_exception = self._handle_exception
+        scheduler = self.retry_scheduler
+        while True:
+            if scheduler is None:
+                command = get()
+            else:
+                # Ждём не дольше, чем до срока ближайшего отложенного повтора
+                timeout = scheduler.promote_due()
+                if timeout is None or timeout > _RETRY_POLL_INTERVAL:
+                    timeout = _RETRY_POLL_INTERVAL
+                try:
+                    command = get(timeout=timeout)
+                except Empty:
+                    continue
+            try:
+                command.execute()
+            except Exception as exc:
+                handle_exception(command, exc)
+            if self._control is not None and self._should_exit():
+                return
+
+    def run_tick(self) -> TickStats:
+        """
+        Выполняет один тик: команды, стоявшие в очереди на его начало,
+        пока не исчерпан бюджет времени. Команды, поставленные во время тика
+        (например, повторы от обработчиков исключений), выполнятся в следующем.
+        """
+        clock = time.perf_counter
+        start = clock()
+        if self.retry_scheduler is not None:
+            self.retry_scheduler.promote_due()
+        config = self.tick_config
+        deadline = start + config.budget
+        pending = self.queue.qsize()
+        shedding = config.shed_watermark is not None and pending > config.shed_watermark
+        get = self.queue.get_nowait
+        handle_exception = self._handle_exception
+        taken = executed = dropped = degraded = 0
+        while taken < pending and clock() < deadline:
+            try:
+                command = get()
+            except Empty:
+                break
+            taken += 1
+            if shedding and type(command) is LowPriorityCommand:
+                if command.degraded is None:
+                    dropped += 1
+                    continue
+                command = command.degraded
+                degraded += 1
+            try:
+                command.execute()
+            except Exception as exc:
+                handle_exception(command, exc)
+            executed += 1
+            # Пауза и жёсткая остановка прерывают тик, мягкая — нет
+            if self._control is not None and self._control is not ServerState.SOFT_STOP:
+                break
+        stats = TickStats(
+            executed=executed,
+            deferred=pending - taken,
+            dropped=dropped,
+            degraded=degraded,
+            duration=clock() - start,
+        )
+        self.ticks.append(stats)
+        return stats
+
+    def run_ticks(self, interval: float | None = None) -> None:
+        """
+        Потиковый цикл в текущем потоке: тик запускается раз в interval секунд
+        (по умолчанию — сразу после предыдущего) до остановки сервера.
+        """
+        clock = time.perf_counter
+        next_tick = clock()
+        while True:
+            self.run_tick()
+            control = self._control
+            if control is ServerState.PAUSED:
+                self._resumed.wait()
+                control = self._control
+            if self._stop_requested(control):
+                return
+            if interval is not None:
+                next_tick += interval
+                delay = next_tick - clock()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Не успеваем — не пытаемся догнать пропущенные тики
+                    next_tick = clock()
+
+    def tick_summary(self) -> TickSummary:
+        """Сводка по последним TickConfig.stats_window тикам."""
+        ticks = list(self.ticks)
+        durations = sorted(tick.duration for tick in ticks)
+        return TickSummary(
+            ticks=len(ticks),
+            executed=sum(tick.executed for tick in ticks),
+            deferred=sum(tick.deferred for tick in ticks),
+            dropped=sum(tick.dropped for tick in ticks),
+            degraded=sum(tick.degraded for tick in ticks),
+            p50=_percentile(durations, 50),
+            p99=_percentile(durations, 99),
+        )
+
+    def _should_exit(self) -> bool:
+        """Медленный путь цикла: вызывается, только если установлен управляющий флаг."""
+        control = self._control
+        if control is ServerState.PAUSED:
+            self._resumed.wait()
+            control = self._control
+        return self._stop_requested(control)
+
+    def _drained(self) -> bool:
+        """Очередь пуста и отложенных повторов нет."""
+        return self.queue.empty() and not self.retry_scheduler
+
+
+class HardStopCommand(CommandInterface):
+    """Немедленная остановка: потоки завершаются, не дожидаясь опустошения очереди."""
+
+    def __init__(self, *, server: GameServerInterface):
+        self._server = server
+
+    def execute(self) -> None:
+        self._server.hard_stop()
+
+
+class SoftStopCommand(CommandInterface):
+    """Мягкая остановка: потоки завершаются, когда очередь опустеет."""
+
+    def __init__(self, *, server: GameServerInterface):
+        self._server = server
+
+    def execute(self) -> None:
+        self._server.soft_stop()
+
+
+class PauseCommand(CommandInterface):
+    """Приостанавливает обработку очереди до ResumeCommand."""
+
+    def __init__(self, *, server: GameServerInterface):
+        self._server = server
+
+    def execute(self) -> None:
+        self._server.pause()
+
+
+class ResumeCommand(CommandInterface):
+    """
+    Возобновляет обработку очереди.
+    Выполняется вне очереди: приостановленные потоки её не читают.
+    """
+
+    def __init__(self, *, server: GameServerInterface):
+        self._server = server
+
+    def execute(self) -> None:
+        self._server.resume()
@@ -1,12 +1,255 @@
+from collections.abc import Callable, Iterable
+from functools import partial
 from typing import Any
 
+_MISSING = object()
+
+__all__ = [
+    "ChangeTracker",
+    "SchemaUObject",
+    "UObject",
+    "UObjectSchema",
+]
+
 
 class UObject:
-    def __init__(self):
+    """
+    Объект игры со свойствами по строковым именам.
+    Объект может ссылаться на прототип: отсутствующие у него свойства читаются из прототипа,
+    а первая запись свойства создаёт локальную копию только этого ключа.
+    Так флот из тысяч кораблей хранит общие значения один раз, в шаблоне.
+    """
+
+    __slots__ = ("_cache", "_dirty", "_enqueued", "_properties", "_prototype", "_tracker")
+
+    def __init__(self, prototype: "UObject | None" = None):
         self._properties = {}
+        self._prototype = prototype
+        # Множество изменённых свойств создаётся при первой записи и затем переиспользуется
+        self._dirty: set[str] | None = None
+        self._tracker: ChangeTracker | None = None
+        # Трекер, в список которого объект уже поставлен и ещё не забран drain
+        self._enqueued: ChangeTracker | None = None
+        self._cache: dict[str, Any] | None = None
+
+    @property
+    def prototype(self) -> "UObject | None":
+        return self._prototype
 
     def get_property(self, property_) -> Any:
-        return self._properties.get(property_)
+        value = self._properties.get(property_, _MISSING)
+        if value is not _MISSING:
+            return value
+        if self._prototype is not None:
+            return self._prototype.get_property(property_)
+        return None
+
+    def has_own_property(self, property_: str) -> bool:
+        """Задано ли свойство у самого объекта, а не унаследовано от прототипа."""
+        return property_ in self._properties
 
     def set_property(self, property_: str, value: Any) -> None:
         self._properties[property_] = value
+        dirty = self._dirty
+        if not dirty:
+            dirty = self._mark_first_change()
+        dirty.add(property_)
+
+    def _mark_first_change(self) -> set[str]:
+        # Вызывается только на первой записи после drain: объект попадает в список трекера.
+        # Повторные записи лишь добавляют имя в уже существующее множество без аллокаций
+        if self._dirty is None:
+            self._dirty = set()
+        tracker = self._tracker
+        if tracker is not None and self._enqueued is not tracker:
+            tracker.dirty.append(self)
+            self._enqueued = tracker
+        return self._dirty
+
+    @property
+    def cache(self) -> dict[str, Any]:
+        """
+        Производные значения, вычисленные по свойствам, например вектор скорости.
+        Это не свойства объекта: они не наследуются от прототипа
+        и не попадают в отслеживание изменений.
+        """
+        cache = self._cache
+        if cache is None:
+            cache = self._cache = {}
+        return cache
+
+    @property
+    def dirty_properties(self) -> frozenset[str]:
+        """Имена свойств, изменённых с последнего drain_changes или ChangeTracker.drain."""
+        return frozenset(self._dirty or ())
+
+    def drain_changes(self) -> frozenset[str]:
+        """Возвращает имена изменённых свойств и сбрасывает отметки."""
+        dirty = self._dirty
+        if not dirty:
+            return frozenset()
+        changes = frozenset(dirty)
+        dirty.clear()
+        return changes
+
+    def property_getter(self, property_: str) -> Callable[[], Any]:
+        """
+        Возвращает функцию чтения свойства без аргументов.
+        Адаптеры и команды получают её один раз при создании, чтобы на горячем пути
+        не искать свойство по строковому ключу через get_property.
+        """
+        # Локальное свойство не удаляется, поэтому его можно читать прямо из словаря.
+        # Унаследованное может быть скопировано позже, и чтение идёт с учётом прототипа
+        if self._prototype is None or property_ in self._properties:
+            return partial(self._properties.get, property_)
+        return partial(self.get_property, property_)
+
+    def property_setter(self, property_: str) -> Callable[[Any], None]:
+        """
+        Возвращает функцию записи свойства с одним аргументом — значением.
+        Запись идёт через set_property, чтобы изменение попало в отслеживание.
+        """
+        return partial(self.set_property, property_)
+
+
+class ChangeTracker:
+    """
+    Список объектов, изменённых с последнего drain.
+    Позволяет собирать снимки и дельты для клиентов за O(изменённых объектов),
+    не обходя свойства всех объектов мира.
+    """
+
+    __slots__ = ("dirty",)
+
+    def __init__(self):
+        self.dirty: list[UObject] = []
+
+    def __len__(self) -> int:
+        return len(self.dirty)
+
+    def track(self, uobj: UObject) -> None:
+        if uobj._tracker is self:
+            return
+        uobj._tracker = self
+        if uobj._dirty and uobj._enqueued is not self:
+            self.dirty.append(uobj)
+            uobj._enqueued = self
+
+    def untrack(self, uobj: UObject) -> None:
+        if uobj._tracker is self:
+            uobj._tracker = None
+
+    def drain(self) -> list[tuple[UObject, frozenset[str]]]:
+        """
+        Возвращает пары (объект, имена изменённых свойств) и сбрасывает отметки.
+        Текущие значения свойств читаются у самих объектов.
+        """
+        dirty, self.dirty = self.dirty, []
+        for uobj in dirty:
+            if uobj._enqueued is self:
+                uobj._enqueued = None
+        return [(uobj, uobj.drain_changes()) for uobj in dirty]
+
+
+class UObjectSchema:
+    """
+    Описание набора свойств типа объекта.
+    Каждому свойству один раз сопоставляется целочисленное смещение в массиве значений.
+    """
+
+    __slots__ = ("offsets", "properties")
+
+    def __init__(self, properties: Iterable[str]):
+        self.properties: tuple[str, ...] = tuple(properties)
+        if len(set(self.properties)) != len(self.properties):
+            raise ValueError("Свойства схемы не должны повторяться")
+        self.offsets: dict[str, int] = {name: i for i, name in enumerate(self.properties)}
+
+    def __len__(self) -> int:
+        return len(self.properties)
+
+    def offset(self, property_: str) -> int:
+        try:
+            return self.offsets[property_]
+        except KeyError:
+            raise KeyError(f"Свойство '{property_}' не объявлено в схеме") from None
+
+    def create(self, **values: Any) -> "SchemaUObject":
+        uobj = SchemaUObject(self)
+        for property_, value in values.items():
+            uobj.set_property(property_, value)
+        return uobj
+
+
+class SchemaUObject(UObject):
+    """
+    UObject со схемой: объявленные свойства лежат в списке по смещениям из UObjectSchema,
+    а не в словаре на каждый объект. Необъявленные свойства по-прежнему можно
+    записать через set_property — для них словарь создаётся при первой записи.
+    Прототипы не поддерживаются: значения по умолчанию задаются в UObjectSchema.create.
+    """
+
+    __slots__ = ("_schema", "_values")
+
+    def __init__(self, schema: UObjectSchema):
+        self._schema = schema
+        self._values: list[Any] = [None] * len(schema)
+        self._properties = None
+        self._prototype = None
+        self._dirty = None
+        self._tracker = None
+        self._enqueued = None
+        self._cache = None
+
+    @property
+    def schema(self) -> UObjectSchema:
+        return self._schema
+
+    def get_property(self, property_) -> Any:
+        offset = self._schema.offsets.get(property_)
+        if offset is not None:
+            return self._values[offset]
+        if self._properties is None:
+            return None
+        return self._properties.get(property_)
+
+    def has_own_property(self, property_: str) -> bool:
+        """Объявленные в схеме свойства есть всегда, необъявленные — после первой записи."""
+        if property_ in self._schema.offsets:
+            return True
+        return self._properties is not None and property_ in self._properties
+
+    def set_property(self, property_: str, value: Any) -> None:
+        offset = self._schema.offsets.get(property_)
+        if offset is not None:
+            self._values[offset] = value
+        else:
+            if self._properties is None:
+                self._properties = {}
+            self._properties[property_] = value
+        dirty = self._dirty
+        if not dirty:
+            dirty = self._mark_first_change()
+        dirty.add(property_)
+
+    def get_slot(self, offset: int) -> Any:
+        return self._values[offset]
+
+    def set_slot(self, offset: int, value: Any) -> None:
+        self._values[offset] = value
+        dirty = self._dirty
+        if not dirty:
+            dirty = self._mark_first_change()
+        dirty.add(self._schema.properties[offset])
+
+    def property_getter(self, property_: str) -> Callable[[], Any]:
+        offset = self._schema.offsets.get(property_)
+        if offset is None:
+            return partial(self.get_property, property_)
+        return partial(self._values.__getitem__, offset)
+
+    def property_setter(self, property_: str) -> Callable[[Any], None]:
+        offset = self._schema.offsets.get(property_)
+        if offset is None:
+            return partial(self.set_property, property_)
+        return partial(self.set_slot, offset)
@@ -0,0 +1,153 @@
+from array import array
+from collections.abc import Hashable, Iterable
+
+from homeworks.space_battle.models import COS_TABLE, SIN_TABLE, Angle, Point, Vector
+from homeworks.space_battle.uobject import UObject
+
+__all__ = ["World"]
+
+
+def _velocity_x(velocity: float, degrees: int) -> int:
+    return int(velocity * COS_TABLE[degrees % 360])
+
+
+def _velocity_y(velocity: float, degrees: int) -> int:
+    return int(velocity * SIN_TABLE[degrees % 360])
+
+
+class World:
+    """
+    Хранилище кораблей в виде «структуры массивов».
+
+    Каждое свойство лежит в своём непрерывном массиве, строка массива — один корабль,
+    object_id -> номер строки хранится в словаре. Пакетные команды обновляют весь
+    массив за один проход map() на уровне C вместо вызова адаптеров для каждого корабля.
+
+    Вектор скорости (vx, vy) хранится рядом и пересчитывается только при изменении
+    угла или скорости по тем же таблицам и с тем же усечением до int, что и
+    MovingObjectAdapter.get_velocity, поэтому результат движения совпадает побитно.
+    """
+
+    def __init__(self) -> None:
+        self.ids: list[Hashable] = []
+        self._rows: dict[Hashable, int] = {}
+        self.x = array("q")
+        self.y = array("q")
+        self.angle = array("q")
+        self.velocity = array("d")
+        self.vx = array("q")
+        self.vy = array("q")
+        self.fuel = array("q")
+        self.fuel_burn_rate = array("q")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, object_id: Hashable) -> bool:
+        return object_id in self._rows
+
+    def add(self, object_id: Hashable, uobj: UObject) -> int:
+        """
+        Добавляет корабль, копируя свойства location, angle, velocity, fuel и fuel_burn_rate
+        из uobj, и возвращает номер его строки. Топливо по умолчанию — 0.
+        """
+        if object_id in self._rows:
+            raise ValueError(f"Объект '{object_id}' уже есть в мире")
+        location: Point = uobj.get_property("location")
+        angle: Angle = uobj.get_property("angle")
+        velocity: float = uobj.get_property("velocity")
+        if location is None or angle is None or velocity is None:
+            raise ValueError("Для добавления в мир нужны location, angle и velocity")
+        row = len(self.ids)
+        self._rows[object_id] = row
+        self.ids.append(object_id)
+        self.x.append(int(location.x))
+        self.y.append(int(location.y))
+        self.angle.append(angle.degrees)
+        self.velocity.append(velocity)
+        self.vx.append(_velocity_x(velocity, angle.degrees))
+        self.vy.append(_velocity_y(velocity, angle.degrees))
+        self.fuel.append(uobj.get_property("fuel") or 0)
+        self.fuel_burn_rate.append(uobj.get_property("fuel_burn_rate") or 0)
+        return row
+
+    def remove(self, object_id: Hashable) -> None:
+        """Удаляет корабль, переставляя последнюю строку на освободившееся место."""
+        row = self._rows.pop(object_id)
+        last = len(self.ids) - 1
+        columns = self._columns()
+        if row != last:
+            moved_id = self.ids[last]
+            self.ids[row] = moved_id
+            self._rows[moved_id] = row
+            for column in columns:
+                column[row] = column[last]
+        self.ids.pop()
+        for column in columns:
+            column.pop()
+
+    def row(self, object_id: Hashable) -> int:
+        return self._rows[object_id]
+
+    def rows(self, object_ids: Iterable[Hashable]) -> list[int]:
+        rows = self._rows
+        return [rows[object_id] for object_id in object_ids]
+
+    def get_location(self, object_id: Hashable) -> Point:
+        row = self._rows[object_id]
+        return Point(self.x[row], self.y[row])
+
+    def set_location(self, object_id: Hashable, location: Point) -> None:
+        row = self._rows[object_id]
+        self.x[row] = int(location.x)
+        self.y[row] = int(location.y)
+
+    def get_angle(self, object_id: Hashable) -> Angle:
+        return Angle(self.angle[self._rows[object_id]])
+
+    def set_angle(self, object_id: Hashable, angle: Angle) -> None:
+        row = self._rows[object_id]
+        self.angle[row] = angle.degrees
+        self._update_velocity(row)
+
+    def get_velocity(self, object_id: Hashable) -> Vector:
+        row = self._rows[object_id]
+        return Vector(self.vx[row], self.vy[row])
+
+    def set_velocity(self, object_id: Hashable, velocity: float) -> None:
+        row = self._rows[object_id]
+        self.velocity[row] = velocity
+        self._update_velocity(row)
+
+    def get_fuel(self, object_id: Hashable) -> int:
+        return self.fuel[self._rows[object_id]]
+
+    def set_fuel(self, object_id: Hashable, fuel: int) -> None:
+        self.fuel[self._rows[object_id]] = fuel
+
+    def recompute_velocities(self, rows: Iterable[int] | None = None) -> None:
+        """Пересчитывает (vx, vy) для указанных строк, по умолчанию — для всех."""
+        if rows is None:
+            self.vx[:] = array("q", map(_velocity_x, self.velocity, self.angle))
+            self.vy[:] = array("q", map(_velocity_y, self.velocity, self.angle))
+            return
+        for row in rows:
+            self._update_velocity(row)
+
+    def _update_velocity(self, row: int) -> None:
+        velocity = self.velocity[row]
+        degrees = self.angle[row]
+        self.vx[row] = _velocity_x(velocity, degrees)
+        self.vy[row] = _velocity_y(velocity, degrees)
+
+    def _columns(self) -> tuple[array, ...]:
+        return (
+            self.x,
+            self.y,
+            self.angle,
+            self.velocity,
+            self.vx,
+            self.vy,
+            self.fuel,
+            self.fuel_burn_rate,
+        )
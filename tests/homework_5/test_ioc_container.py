@@ -0,0 +1,87 @@
+"""
+Тесты типизированного IoC контейнера домашнего задания №5.
+"""
+
+import pytest
+
+from homeworks.homework_5 import (
+    Command,
+    CurrentScopeCommand,
+    IoC,
+    IoCContainer,
+    NewScopeCommand,
+    RegisterCommand,
+)
+from homeworks.space_battle.ioc import Lifetime
+
+
+class Engine:
+    def __init__(self, power: int = 1):
+        self.power = power
+
+
+class Radar:
+    pass
+
+
+@pytest.fixture(autouse=True)
+def setup():
+    """Очистка состояния перед каждым тестом."""
+    IoC._strategies.clear()
+    IoC._scopes.clear()
+    IoC._current_scope = type("MockThreadLocal", (), {})()
+    IoC._current_scope.scope_id = "root"
+
+
+def test_register_and_resolve_by_type():
+    """Зависимость регистрируется и разрешается по типу с аргументами."""
+    IoCContainer.register(Engine, Engine)
+
+    engine = IoCContainer.resolve(Engine, power=5)
+
+    assert isinstance(engine, Engine)
+    assert engine.power == 5
+
+
+def test_type_keys_do_not_clash_with_string_keys():
+    """Тип и строка с тем же именем — разные ключи."""
+    IoCContainer.register(Engine, "typed")
+    IoC.resolve("IoC.Register", "Engine", "string").execute()
+
+    assert IoCContainer.resolve(Engine) == "typed"
+    assert IoC.resolve("Engine") == "string"
+
+
+def test_resolve_unknown_type_raises():
+    with pytest.raises(ValueError):
+        IoCContainer.resolve(Radar)
+
+
+def test_typed_registration_shares_scopes_with_string_ioc():
+    """Скоупы общие со строковым IoC: команды Scopes.New и Scopes.Current, наследование."""
+    IoCContainer.register_global(Radar, Radar, Lifetime.SINGLETON)
+    NewScopeCommand("game").execute()
+    NewScopeCommand("player", "game").execute()
+    CurrentScopeCommand("game").execute()
+    RegisterCommand(Engine, lambda: Engine(10)).execute()
+
+    IoC.resolve("Scopes.Current", "player").execute()
+    assert IoCContainer.resolve(Engine).power == 10
+    assert IoCContainer.resolve(Radar) is IoC.resolve(Radar)
+
+    IoC.resolve("Scopes.Current", "root").execute()
+    with pytest.raises(ValueError):
+        IoCContainer.resolve(Engine)
+
+
+def test_register_command_via_resolve_and_compile():
+    """Регистрация через IoC.resolve("IoC.Register", ...) и компиляция ключа-типа."""
+    register = IoC.resolve("IoC.Register", Engine, lambda power: Engine(power))
+    assert isinstance(register, Command)
+    register.execute()
+
+    resolve_engine = IoCContainer.compile(Engine)
+
+    assert resolve_engine(3).power == 3
+    IoCContainer.register(Engine, lambda power: Engine(power * 2))
+    assert resolve_engine(3).power == 6
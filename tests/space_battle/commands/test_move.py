@@ -2,7 +2,7 @@ import pytest
 
 from homeworks.space_battle.actions import Move
 from homeworks.space_battle.adapters import MovingObjectAdapter
-from homeworks.space_battle.models import Angle, Point
+from homeworks.space_battle.models import Angle, Point, Vector
 from homeworks.space_battle.uobject import UObject
 
 
@@ -67,3 +67,24 @@ def test_move_set_location_error():
     adapter.set_location = broken_set_location
     with pytest.raises(Exception):
         move.execute()
+
+
+def test_velocity_cached_until_angle_or_velocity_changes():
+    """
+    Проверяет, что вектор скорости пересчитывается только после изменения
+    угла или модуля скорости
+    """
+    ship = UObject()
+    ship.set_property("angle", Angle(90))
+    ship.set_property("velocity", 10)
+    adapter = MovingObjectAdapter(ship)
+
+    first = adapter.get_velocity()
+    assert first == Vector(0, 10)
+    assert adapter.get_velocity() is first
+
+    ship.set_property("angle", Angle(180))
+    assert adapter.get_velocity() == Vector(-10, 0)
+
+    ship.set_property("velocity", 3)
+    assert adapter.get_velocity() == Vector(-3, 0)
@@ -8,3 +8,16 @@ from homeworks.space_battle.interfaces import CommandInterface
 @pytest.fixture
 def command() -> CommandInterface:
     return Mock(spec=CommandInterface)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
@@ -0,0 +1,10 @@
+from homeworks.space_battle.interfaces import CommandInterface
+
+
+class RecordCommand(CommandInterface):
+    def __init__(self, log: list, value):
+        self._log = log
+        self._value = value
+
+    def execute(self) -> None:
+        self._log.append(self._value)
@@ -0,0 +1,164 @@
+from abc import ABC, abstractmethod
+
+import pytest
+
+from homeworks.space_battle.actions import Move, Rotate
+from homeworks.space_battle.adapters import (
+    ADAPTER_KEY,
+    MovingObjectAdapter,
+    RotatableObjectAdapter,
+    create_adapter,
+    generate_adapter,
+)
+from homeworks.space_battle.commands import RotateCommand
+from homeworks.space_battle.interfaces import (
+    CommandInterface,
+    MovingObjectInterface,
+    RotatableObjectInterface,
+)
+from homeworks.space_battle.ioc import IoC
+from homeworks.space_battle.models import Angle, Point, Vector
+from homeworks.space_battle.uobject import UObject, UObjectSchema
+
+
+class FuelableInterface(ABC):
+    @abstractmethod
+    def get_fuel(self) -> int:
+        pass
+
+    @abstractmethod
+    def set_fuel(self, fuel: int) -> None:
+        pass
+
+    @abstractmethod
+    def refuel(self, amount: int) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def setup():
+    IoC._strategies.clear()
+    IoC._scopes.clear()
+    IoC._current_scope = type("MockThreadLocal", (), {})()
+    IoC._current_scope.scope_id = "root"
+    IoC._invalidate()
+
+
+def test_generated_class_cached_per_interface():
+    adapter_cls = generate_adapter(RotatableObjectInterface)
+
+    assert generate_adapter(RotatableObjectInterface) is adapter_cls
+    assert issubclass(adapter_cls, RotatableObjectInterface)
+    assert generate_adapter(MovingObjectInterface) is not adapter_cls
+
+
+@pytest.mark.parametrize(
+    "make",
+    [UObject, UObjectSchema(("angle",)).create],
+)
+def test_generated_adapter_maps_properties(make):
+    ship = make()
+    ship.set_property("angle", Angle(45))
+    adapter = create_adapter(RotatableObjectInterface, ship)
+
+    RotateCommand(rotatable=adapter, delta_angle=Angle(15)).execute()
+
+    assert adapter.uobj is ship
+    assert adapter.get_angle() == Angle(60)
+    assert ship.get_property("angle") == Angle(60)
+    assert ship.dirty_properties == {"angle"}
+
+
+def test_generated_adapter_matches_hand_written():
+    ship = UObject()
+    ship.set_property("angle", Angle(10))
+    generated = create_adapter(RotatableObjectInterface, ship)
+    hand_written = RotatableObjectAdapter(ship)
+
+    generated.set_angle(Angle(20))
+
+    assert hand_written.get_angle() == generated.get_angle() == Angle(20)
+
+
+def test_other_methods_resolve_through_ioc():
+    def refuel(uobj, amount):
+        uobj.set_property("fuel", uobj.get_property("fuel") + amount)
+
+    IoC.resolve("IoC.Register", "FuelableInterface.refuel", refuel).execute()
+    ship = UObject()
+    ship.set_property("fuel", 1)
+    adapter = create_adapter(FuelableInterface, ship)
+
+    adapter.refuel(4)
+    adapter.set_fuel(adapter.get_fuel() * 2)
+
+    assert ship.get_property("fuel") == 10
+
+
+def test_adapter_key_in_ioc():
+    IoC.resolve("IoC.RegisterGlobal", ADAPTER_KEY, create_adapter).execute()
+    ship = UObject()
+    ship.set_property("location", Point(1, 2))
+
+    adapter = IoC.resolve(ADAPTER_KEY, MovingObjectInterface, ship)
+    command = IoC.resolve(ADAPTER_KEY, CommandInterface, ship)
+
+    assert isinstance(adapter, MovingObjectInterface)
+    assert adapter.get_location() == Point(1, 2)
+    IoC.resolve("IoC.Register", "CommandInterface.execute", lambda _uobj: "executed").execute()
+    assert command.execute() == "executed"
+
+
+def test_move_and_rotate_through_adapter_key():
+    IoC.resolve("IoC.RegisterGlobal", ADAPTER_KEY, create_adapter).execute()
+    ship = UObject()
+    ship.set_property("location", Point(12, 5))
+    ship.set_property("angle", Angle(0))
+    ship.set_property("velocity", 5)
+
+    moving = IoC.resolve(ADAPTER_KEY, MovingObjectInterface, ship)
+    Move(moving).execute()
+    Rotate(IoC.resolve(ADAPTER_KEY, RotatableObjectInterface, ship)).execute(Angle(90))
+    Move(moving).execute()
+
+    assert isinstance(moving, MovingObjectAdapter)
+    assert ship.get_property("location") == Point(17, 10)
+    assert ship.get_property("angle") == Angle(90)
+
+
+def test_property_methods_use_ioc_overrides():
+    ship = UObject()
+    ship.set_property("location", Point(1.7, 2.2))
+    ship.set_property("angle", Angle(0))
+    ship.set_property("velocity", 3)
+    reference = UObject()
+    reference.set_property("location", Point(1.7, 2.2))
+    reference.set_property("angle", Angle(0))
+    reference.set_property("velocity", 3)
+    hand_written = MovingObjectAdapter(reference)
+    for method_name in ("get_location", "get_velocity", "set_location"):
+        IoC.resolve(
+            "IoC.Register",
+            f"MovingObjectInterface.{method_name}",
+            lambda uobj, *args, name=method_name: getattr(MovingObjectAdapter(uobj), name)(*args),
+        ).execute()
+
+    generated = generate_adapter(MovingObjectInterface)(ship)
+    Move(generated).execute()
+    Move(hand_written).execute()
+
+    assert generated.get_velocity() == Vector(3, 0)
+    assert ship.get_property("location") == reference.get_property("location") == Point(4, 2)
+
+
+def test_overrides_follow_registrations():
+    ship = UObject()
+    ship.set_property("angle", Angle(10))
+    adapter_cls = generate_adapter(RotatableObjectInterface)
+    assert adapter_cls(ship).get_angle() == Angle(10)
+
+    IoC.resolve(
+        "IoC.Register", "RotatableObjectInterface.get_angle", lambda _uobj: Angle(0)
+    ).execute()
+
+    assert adapter_cls(ship).get_angle() == Angle(0)
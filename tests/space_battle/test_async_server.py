@@ -0,0 +1,168 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from homeworks.space_battle.async_server import AsyncCommandQueue, AsyncGameServer
+from homeworks.space_battle.commands import AsyncMacroCommand
+from homeworks.space_battle.exceptions import CommandException
+from homeworks.space_battle.handlers import ExceptionsStorage
+from homeworks.space_battle.interfaces import AsyncCommandInterface, CommandInterface
+from homeworks.space_battle.server import (
+    HardStopCommand,
+    PauseCommand,
+    ResumeCommand,
+    ServerState,
+    SoftStopCommand,
+)
+from tests.space_battle.helpers import RecordCommand
+
+
+class AsyncRecordCommand(AsyncCommandInterface):
+    def __init__(self, log: list, value):
+        self._log = log
+        self._value = value
+
+    async def execute(self) -> None:
+        await asyncio.sleep(0)
+        self._log.append(self._value)
+
+
+class AsyncFailingCommand(AsyncCommandInterface):
+    async def execute(self) -> None:
+        raise RuntimeError("async boom")
+
+
+def test_async_macro_command_runs_sync_and_async_commands():
+    """AsyncMacroCommand выполняет синхронные и асинхронные команды по порядку."""
+    log: list[int] = []
+    macro = AsyncMacroCommand(
+        commands=[RecordCommand(log, 1), AsyncRecordCommand(log, 2), RecordCommand(log, 3)]
+    )
+
+    asyncio.run(macro.execute())
+
+    assert log == [1, 2, 3]
+
+
+def test_async_macro_command_stops_on_exception():
+    log: list[int] = []
+    macro = AsyncMacroCommand(commands=[AsyncFailingCommand(), RecordCommand(log, 1)])
+
+    with pytest.raises(CommandException):
+        asyncio.run(macro.execute())
+
+    assert log == []
+
+
+def test_async_server_soft_stop_runs_whole_queue():
+    log: list[int] = []
+    server = AsyncGameServer()
+    server.put(RecordCommand(log, 1))
+    server.put(SoftStopCommand(server=server))
+    server.put(AsyncRecordCommand(log, 2))
+    server.put(AsyncMacroCommand(commands=[RecordCommand(log, 3)]))
+
+    asyncio.run(server.run())
+
+    assert log == [1, 2, 3]
+    assert server.state is ServerState.SOFT_STOP
+
+
+def test_async_server_hard_stop():
+    log: list[int] = []
+    server = AsyncGameServer()
+    server.put(HardStopCommand(server=server))
+    server.put(RecordCommand(log, 1))
+
+    asyncio.run(server.run())
+
+    assert log == []
+    assert server.queue.qsize() == 1
+
+
+def test_async_server_dispatches_exceptions():
+    """Исключение асинхронной команды уходит в обработчик из ExceptionsStorage."""
+    server = AsyncGameServer()
+    command = AsyncFailingCommand()
+    handler = Mock()
+    server._default_handler = handler
+    server.put(command)
+    server.put(SoftStopCommand(server=server))
+
+    asyncio.run(server.run())
+
+    handler.handle.assert_called_once()
+    assert handler.handle.call_args.kwargs["command"] is command
+    assert ExceptionsStorage.resolve(command, RuntimeError()) is None
+
+
+def test_async_server_default_handler_logs(capsys):
+    server = AsyncGameServer()
+    server.put(AsyncFailingCommand())
+    server.put(SoftStopCommand(server=server))
+
+    asyncio.run(server.run())
+
+    assert "[LOG] Exception in AsyncFailingCommand: async boom" in capsys.readouterr().out
+
+
+def test_many_games_share_one_loop():
+    """Тысяча игр выполняется в одном цикле событий."""
+    games = 1000
+    logs: list[list[int]] = [[] for _ in range(games)]
+    servers = []
+    for log in logs:
+        server = AsyncGameServer(batch_size=2)
+        for value in range(5):
+            server.put(RecordCommand(log, value))
+        server.put(SoftStopCommand(server=server))
+        servers.append(server)
+
+    async def main() -> None:
+        await asyncio.gather(*(server.run() for server in servers))
+
+    asyncio.run(main())
+
+    assert all(log == [0, 1, 2, 3, 4] for log in logs)
+
+
+def test_async_server_waits_for_commands_and_pauses():
+    log: list[int] = []
+
+    async def main() -> None:
+        server = AsyncGameServer()
+        task = asyncio.create_task(server.run())
+        await asyncio.sleep(0)
+        server.put(PauseCommand(server=server))
+        server.put(RecordCommand(log, 1))
+        await asyncio.sleep(0.01)
+        assert server.state is ServerState.PAUSED
+        assert log == []
+
+        ResumeCommand(server=server).execute()
+        server.put(HardStopCommand(server=server))
+        await asyncio.wait_for(task, timeout=5)
+
+    asyncio.run(main())
+
+    assert log == [1]
+
+
+def test_async_queue_get():
+    """get() ждёт появления команды в пустой очереди."""
+
+    async def main() -> None:
+        queue = AsyncCommandQueue()
+        getter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        command = Mock(spec=CommandInterface)
+        queue.put(command)
+        assert await getter is command
+
+    asyncio.run(main())
+
+
+def test_batch_size_must_be_positive():
+    with pytest.raises(ValueError):
+        AsyncGameServer(batch_size=0)
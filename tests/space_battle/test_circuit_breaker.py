@@ -0,0 +1,149 @@
+from queue import SimpleQueue
+from unittest.mock import Mock
+
+import pytest
+
+from homeworks.space_battle.circuit_breaker import (
+    CircuitBreakerConfig,
+    CircuitBreakerExceptionHandler,
+    CircuitState,
+    CircuitStats,
+)
+from homeworks.space_battle.commands import RetryIfExceptionCommand
+from homeworks.space_battle.handlers import ExceptionsStorage, RetryNThenLogExceptionHandler
+from homeworks.space_battle.interfaces import CommandInterface
+
+
+class CheckFuelCommand(CommandInterface):
+    def execute(self) -> None:
+        raise RuntimeError("config error")
+
+
+class MoveCommand(CommandInterface):
+    def execute(self) -> None:
+        pass
+
+
+@pytest.fixture
+def inner() -> Mock:
+    return Mock()
+
+
+@pytest.fixture
+def breaker(inner: Mock, clock) -> CircuitBreakerExceptionHandler:
+    return CircuitBreakerExceptionHandler(
+        inner,
+        config=CircuitBreakerConfig(failure_threshold=3, window=1.0, open_timeout=5.0),
+        clock=clock,
+    )
+
+
+def fail(breaker: CircuitBreakerExceptionHandler, command: CommandInterface, times: int = 1):
+    for _ in range(times):
+        breaker.handle(exc=RuntimeError("x"), command=command)
+
+
+def test_opens_after_threshold_within_window(breaker, inner, clock) -> None:
+    """Порог ошибок за окно размыкает цепь, дальше ошибки не доходят до обработчика"""
+    fail(breaker, CheckFuelCommand(), 2)
+    assert inner.handle.call_count == 2
+    assert breaker.state(CheckFuelCommand) is CircuitState.CLOSED
+
+    fail(breaker, CheckFuelCommand(), 3)
+    assert inner.handle.call_count == 2
+    assert breaker.metrics()[CheckFuelCommand] == CircuitStats(
+        state=CircuitState.OPEN, opened=1, closed=0, rejected=3
+    )
+    # Другой тип команды не затронут
+    fail(breaker, MoveCommand())
+    assert inner.handle.call_count == 3
+    assert breaker.state(MoveCommand) is CircuitState.CLOSED
+
+
+def test_sparse_failures_do_not_open(breaker, inner, clock) -> None:
+    for _ in range(10):
+        fail(breaker, CheckFuelCommand())
+        clock.now += 0.6
+    assert breaker.state(CheckFuelCommand) is CircuitState.CLOSED
+    assert inner.handle.call_count == 10
+
+
+def test_half_open_probe_closes_after_quiet_window(breaker, inner, clock) -> None:
+    fail(breaker, CheckFuelCommand(), 3)
+    clock.now = 5.0
+    fail(breaker, CheckFuelCommand())
+    assert breaker.state(CheckFuelCommand) is CircuitState.HALF_OPEN
+    assert inner.handle.call_count == 3
+
+    clock.now = 6.5
+    stats = breaker.metrics()[CheckFuelCommand]
+    assert stats.state is CircuitState.CLOSED
+    assert stats.closed == 1
+
+
+def test_open_circuit_recovers_without_failures(breaker, inner, clock) -> None:
+    """Разомкнутая цепь полуоткрывается по таймауту и замыкается, даже если ошибок больше нет"""
+    fail(breaker, CheckFuelCommand(), 3)
+    assert breaker.state(CheckFuelCommand) is CircuitState.OPEN
+
+    clock.now = 5.5
+    assert breaker.state(CheckFuelCommand) is CircuitState.HALF_OPEN
+    clock.now = 10_000.0
+    stats = breaker.metrics()[CheckFuelCommand]
+    assert stats.state is CircuitState.CLOSED
+    assert (stats.opened, stats.closed) == (1, 1)
+
+    fail(breaker, CheckFuelCommand())
+    assert inner.handle.call_count == 3
+
+
+def test_half_open_failure_reopens(breaker, inner, clock) -> None:
+    fail(breaker, CheckFuelCommand(), 3)
+    clock.now = 5.0
+    fail(breaker, CheckFuelCommand(), 2)
+    stats = breaker.metrics()[CheckFuelCommand]
+    assert stats.state is CircuitState.OPEN
+    assert stats.opened == 2
+
+
+def test_retry_wrappers_count_for_original_type(breaker) -> None:
+    fail(breaker, RetryIfExceptionCommand(command=CheckFuelCommand()), 3)
+    assert breaker.state(CheckFuelCommand) is CircuitState.OPEN
+
+
+def test_rejected_go_to_fallback(inner, clock) -> None:
+    fallback = Mock()
+    breaker = CircuitBreakerExceptionHandler(
+        inner, config=CircuitBreakerConfig(failure_threshold=1), fallback=fallback, clock=clock
+    )
+    command = CheckFuelCommand()
+    fail(breaker, command)
+    fallback.handle.assert_called_once()
+    assert fallback.handle.call_args.kwargs["command"] is command
+    inner.handle.assert_not_called()
+
+
+def test_plugs_into_storage_and_stops_retry_storm(clock) -> None:
+    """Через ExceptionsStorage: после размыкания повторы перестают ставиться в очередь"""
+    queue: SimpleQueue = SimpleQueue()
+    breaker = CircuitBreakerExceptionHandler(
+        RetryNThenLogExceptionHandler(queue=queue, retries=3),
+        config=CircuitBreakerConfig(failure_threshold=5),
+        clock=clock,
+    )
+    ExceptionsStorage.clear()
+    ExceptionsStorage.register(CheckFuelCommand, RuntimeError, breaker)
+    try:
+        for command in [CheckFuelCommand() for _ in range(100)]:
+            exc = RuntimeError("config error")
+            ExceptionsStorage.resolve(command, exc).handle(exc=exc, command=command)
+    finally:
+        ExceptionsStorage.clear()
+
+    assert queue.qsize() == 4
+    assert breaker.metrics()[CheckFuelCommand].rejected == 96
+
+
+def test_threshold_must_be_positive() -> None:
+    with pytest.raises(ValueError, match="положительным"):
+        CircuitBreakerConfig(failure_threshold=0)
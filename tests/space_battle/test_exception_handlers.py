@@ -1,5 +1,8 @@
 from queue import Queue
 from typing import Any
+from unittest.mock import Mock
+
+import pytest
 
 from homeworks.space_battle.commands import (
     LogCommand,
@@ -7,8 +10,10 @@ from homeworks.space_battle.commands import (
     SecondRetryIfExceptionCommand,
 )
 from homeworks.space_battle.handlers import (
+    ExceptionsStorage,
     LogExceptionHandler,
     RetryIfExceptionHandler,
+    RetryNThenLogExceptionHandler,
     RetryOnceThenLogExceptionHandler,
     RetryTwiceThenLogExceptionHandler,
 )
@@ -94,3 +99,121 @@ def test_retry_twice_then_log(command: CommandInterface) -> None:
     third = dequeue_one(queue=queue)
     assert isinstance(third, LogCommand)
     third.execute()
+
+
+class MoveCommand(CommandInterface):
+    def execute(self) -> None:
+        pass
+
+
+class FastMoveCommand(MoveCommand):
+    pass
+
+
+@pytest.fixture
+def storage():
+    ExceptionsStorage.clear()
+    yield ExceptionsStorage
+    ExceptionsStorage.clear()
+
+
+def test_storage_resolves_by_types(storage) -> None:
+    """Обработчик, зарегистрированный на экземпляры, находится для любых объектов тех же типов"""
+    handler = Mock()
+    storage.register(MoveCommand(), RuntimeError("registered"), handler)
+
+    assert storage.resolve(MoveCommand(), RuntimeError("other")) is handler
+    assert storage.resolve(MoveCommand, RuntimeError) is handler
+    assert storage.resolve(MoveCommand(), ValueError()) is None
+
+
+def test_storage_walks_both_mro(storage) -> None:
+    """Поиск идёт по MRO команды и исключения, точный тип команды важнее"""
+    base_handler = Mock()
+    lookup_handler = Mock()
+    storage.register(MoveCommand, Exception, base_handler)
+    storage.register(FastMoveCommand, LookupError, lookup_handler)
+
+    assert storage.resolve(FastMoveCommand(), KeyError()) is lookup_handler
+    assert storage.resolve(FastMoveCommand(), RuntimeError()) is base_handler
+    assert storage.resolve(MoveCommand(), KeyError()) is base_handler
+    assert storage.resolve(Mock(spec=CommandInterface), KeyError()) is None
+
+
+def test_storage_cache_is_bounded_by_types(storage) -> None:
+    """Кеш хранит пары типов и сбрасывается при регистрации"""
+    handler = Mock()
+    storage.register(MoveCommand, RuntimeError, handler)
+    for _ in range(100):
+        storage.resolve(MoveCommand(), RuntimeError())
+        storage.resolve(FastMoveCommand(), ValueError())
+    assert len(storage._cache) == 2
+
+    new_handler = Mock()
+    storage.register(FastMoveCommand, ValueError, new_handler)
+    assert storage.resolve(FastMoveCommand(), ValueError()) is new_handler
+    assert storage.resolve(FastMoveCommand(), RuntimeError()) is handler
+
+
+def fail_through_server(handler: RetryNThenLogExceptionHandler, failed: CommandInterface) -> None:
+    # Обработчик не зарегистрирован в ExceptionsStorage — ошибку повтора передаёт сервер
+    try:
+        failed.execute()
+    except RuntimeError as error:
+        handler.handle(exc=error, command=failed)
+
+
+def test_retry_n_then_log_reuses_one_retry(command: CommandInterface) -> None:
+    """RetryN: повторяет команду retries раз одной и той же обёрткой, затем лог"""
+    queue: Queue = Queue()
+    h = RetryNThenLogExceptionHandler(queue=queue, retries=3)
+    command.execute.side_effect = RuntimeError("fail")
+
+    h.handle(exc=RuntimeError("first"), command=command)
+    retry = dequeue_one(queue=queue)
+    assert retry.command is command
+    for attempt in range(1, 4):
+        assert retry.attempt == attempt
+        fail_through_server(h, retry)
+        if attempt < 3:
+            assert dequeue_one(queue=queue) is retry
+
+    logged = dequeue_one(queue=queue)
+    assert isinstance(logged, LogCommand)
+    assert logged.command is command
+
+
+def test_retry_n_starts_over_after_successful_retry(command: CommandInterface) -> None:
+    """RetryN: после успешного повтора новая ошибка снова получает все повторы"""
+    queue: Queue = Queue()
+    h = RetryNThenLogExceptionHandler(queue=queue, retries=2)
+    exc = RuntimeError("fail")
+    command.execute.side_effect = exc
+
+    h.handle(exc=exc, command=command)
+    fail_through_server(h, dequeue_one(queue=queue))
+    command.execute.side_effect = None
+    dequeue_one(queue=queue).execute()
+    assert queue.empty()
+
+    command.execute.side_effect = exc
+    h.handle(exc=exc, command=command)
+    retry = dequeue_one(queue=queue)
+    assert retry.attempt == 1
+    fail_through_server(h, retry)
+    fail_through_server(h, dequeue_one(queue=queue))
+    logged = dequeue_one(queue=queue)
+    assert isinstance(logged, LogCommand)
+    assert logged.command is command
+
+
+def test_retry_n_zero_retries_logs_immediately(command: CommandInterface) -> None:
+    queue: Queue = Queue()
+    h = RetryNThenLogExceptionHandler(queue=queue, retries=0)
+    h.handle(exc=RuntimeError("x"), command=command)
+    assert isinstance(dequeue_one(queue=queue), LogCommand)
+
+
+def test_retry_n_validates_arguments() -> None:
+    with pytest.raises(ValueError, match="отрицательным"):
+        RetryNThenLogExceptionHandler(queue=Queue(), retries=-1)
@@ -3,13 +3,14 @@
 Тестируют потокобезопасность и работу в конкурентной среде.
 """
 
+import asyncio
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import pytest
 
-from homeworks.space_battle.ioc import IoC
+from homeworks.space_battle.ioc import IoC, Lifetime
 
 
 @pytest.fixture(autouse=True)
@@ -17,8 +18,8 @@ def setup():
     """Очистка состояния перед каждым тестом."""
     IoC._strategies.clear()
     IoC._scopes.clear()
-    IoC._current_scope = type("MockThreadLocal", (), {})()
-    IoC._current_scope.scope_id = "root"
+    # Настоящее хранилище на поток: общий для всех потоков объект смешивал бы их скоупы
+    IoC.use_thread_scopes()
 
 
 def test_thread_local_scope_isolation():
@@ -377,3 +378,136 @@ def test_thread_local_cleanup():
     for worker_num in range(5):
         scope_name = f"cleanup_{worker_num}"
         assert scope_name in IoC._scopes
+
+
+def test_registration_invalidates_other_threads_cache():
+    """Кеш разрешения каждого потока сбрасывается после регистрации в другом потоке."""
+    IoC._current_scope = threading.local()
+    IoC.resolve("IoC.RegisterGlobal", "config", "v1").execute()
+    cached = threading.Event()
+    registered = threading.Event()
+    seen = []
+
+    def reader():
+        seen.append(IoC.resolve("config"))
+        cached.set()
+        registered.wait(timeout=5)
+        seen.append(IoC.resolve("config"))
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    cached.wait(timeout=5)
+    IoC.resolve("IoC.RegisterGlobal", "config", "v2").execute()
+    registered.set()
+    thread.join(timeout=5)
+
+    assert seen == ["v1", "v2"]
+
+
+def test_readers_see_whole_scope_while_writer_rebuilds_it():
+    """Читатели видят скоуп либо до, либо после регистрации, без промежуточных состояний."""
+    IoC._current_scope = threading.local()
+    keys = [f"key_{number}" for number in range(20)]
+    IoC.resolve("IoC.RegisterGlobal", "version", 0).execute()
+    stop = threading.Event()
+    errors = []
+
+    def writer():
+        for version in range(1, 200):
+            for key in keys:
+                IoC.resolve("IoC.RegisterGlobal", key, version).execute()
+            IoC.resolve("IoC.RegisterGlobal", "version", version).execute()
+        stop.set()
+
+    def reader():
+        IoC.resolve("Scopes.Current", "reader").execute()
+        while not stop.is_set():
+            version = IoC.resolve("version")
+            if version and any(IoC.resolve(key) < version for key in keys):
+                errors.append(version)
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    writer()
+    for thread in readers:
+        thread.join(timeout=10)
+
+    assert errors == []
+    assert "reader" not in IoC._scopes
+
+
+def test_singleton_factory_called_once_under_contention():
+    """При одновременном первом разрешении фабрика одиночки вызывается ровно один раз."""
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def factory():
+        calls.append(threading.get_ident())
+        time.sleep(0.01)
+        return object()
+
+    IoC.resolve("IoC.RegisterGlobal", "service", factory, Lifetime.SINGLETON).execute()
+
+    def worker():
+        barrier.wait()
+        return IoC.resolve("service")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        instances = list(executor.map(lambda _: worker(), range(8)))
+
+    assert len(calls) == 1
+    assert all(instance is instances[0] for instance in instances)
+
+
+def test_context_scopes_isolate_asyncio_tasks():
+    """С contextvars каждая asyncio-задача работает в своём скоупе без переключений вокруг await."""
+    IoC.use_context_scopes()
+    for game in range(3):
+        IoC.resolve("Scopes.New", f"game_{game}").execute()
+        IoC.resolve("Scopes.Current", f"game_{game}").execute()
+        IoC.resolve("IoC.Register", "game_id", game).execute()
+    IoC.resolve("Scopes.Current", "root").execute()
+
+    async def play(game):
+        IoC.resolve("Scopes.Current", f"game_{game}").execute()
+        seen = []
+        for _ in range(5):
+            await asyncio.sleep(0)
+            seen.append(IoC.resolve("game_id"))
+        return seen
+
+    async def main():
+        return await asyncio.gather(*(play(game) for game in range(3)))
+
+    try:
+        results = asyncio.run(main())
+        assert results == [[game] * 5 for game in range(3)]
+        assert IoC._current_scope.scope_id == "root"
+    finally:
+        IoC.use_thread_scopes()
+
+
+def test_scoped_factory_does_not_hold_global_lock():
+    """Пока работает фабрика объекта на скоуп, регистрации в других потоках не ждут её."""
+    started, release = threading.Event(), threading.Event()
+
+    def slow_factory():
+        started.set()
+        release.wait(5)
+        return object()
+
+    IoC.resolve("IoC.RegisterGlobal", "slow", slow_factory, Lifetime.SCOPED).execute()
+    worker = threading.Thread(target=IoC.resolve, args=("slow",))
+    worker.start()
+    try:
+        assert started.wait(5)
+        registered = threading.Thread(
+            target=lambda: IoC.resolve("IoC.RegisterGlobal", "other", 1).execute()
+        )
+        registered.start()
+        registered.join(1)
+        assert not registered.is_alive()
+    finally:
+        release.set()
+        worker.join()
@@ -0,0 +1,137 @@
+import json
+import threading
+import time
+
+import pytest
+
+from homeworks.space_battle.ioc import IoC
+from homeworks.space_battle.ioc_instrumentation import IoCInstrumentation
+
+
+@pytest.fixture(autouse=True)
+def setup():
+    IoC._strategies.clear()
+    IoC._scopes.clear()
+    IoC._current_scope = threading.local()
+
+
+@pytest.fixture
+def instrumentation():
+    instrumentation = IoCInstrumentation()
+    instrumentation.enable()
+    yield instrumentation
+    instrumentation.disable()
+
+
+def test_disabled_by_default_and_restores_resolve():
+    original = IoC.__dict__["resolve"]
+    original_lookup = IoC.__dict__["_lookup_strategy"]
+    instrumentation = IoCInstrumentation()
+    assert not instrumentation.enabled
+
+    instrumentation.enable()
+    assert instrumentation.enabled
+    assert IoC.__dict__["resolve"] is not original
+    with pytest.raises(RuntimeError):
+        IoCInstrumentation().enable()
+
+    instrumentation.disable()
+    assert IoC.__dict__["resolve"] is original
+    assert IoC.__dict__["_lookup_strategy"] is original_lookup
+    assert not instrumentation.enabled
+
+
+def test_counts_calls_hits_and_misses(instrumentation):
+    IoC.resolve("IoC.RegisterGlobal", "speed", lambda: 5).execute()
+    for _ in range(3):
+        assert IoC.resolve("speed") == 5
+    IoC.resolve("IoC.RegisterGlobal", "speed", lambda: 6).execute()
+    assert IoC.resolve("speed") == 6
+
+    stats = instrumentation.export()["speed"]
+
+    assert stats["calls"] == 4
+    assert stats["misses"] == 2
+    assert stats["hits"] == 2
+    assert stats["errors"] == 0
+    assert sum(stats["histogram_ns"].values()) == 4
+    assert "IoC.RegisterGlobal" not in instrumentation.export()
+
+
+def test_counts_errors_and_latency(instrumentation):
+    def slow():
+        time.sleep(0.002)
+        return "done"
+
+    def broken():
+        raise KeyError("broken")
+
+    IoC.resolve("IoC.Register", "slow", slow).execute()
+    IoC.resolve("IoC.Register", "broken", broken).execute()
+    IoC.resolve("slow")
+    with pytest.raises(KeyError):
+        IoC.resolve("broken")
+    with pytest.raises(ValueError):
+        IoC.resolve("missing")
+
+    export = instrumentation.export()
+
+    assert export["slow"]["p50_ns"] >= 2_000_000
+    assert export["slow"]["total_ns"] >= 2_000_000
+    assert export["broken"]["errors"] == 1
+    assert export["missing"] == {
+        "calls": 1,
+        "hits": 0,
+        "misses": 1,
+        "errors": 1,
+        "total_ns": 0,
+        "p50_ns": 0,
+        "p99_ns": 0,
+        "histogram_ns": {},
+    }
+    assert json.loads(json.dumps(export)) == export
+
+
+def test_aggregates_threads_and_reports(instrumentation):
+    IoC.resolve("IoC.RegisterGlobal", int, 7).execute()
+
+    def worker():
+        for _ in range(100):
+            IoC.resolve(int)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert instrumentation.export()["builtins.int"]["calls"] == 400
+    report = instrumentation.report()
+    assert report.splitlines()[0].split()[:2] == ["key", "calls"]
+    assert "builtins.int" in report
+
+    instrumentation.reset()
+    assert instrumentation.export() == {}
+
+
+class Engine:
+    pass
+
+
+def test_export_keeps_keys_with_same_name_apart(instrumentation):
+    IoC.resolve("IoC.RegisterGlobal", "Engine", "by name").execute()
+    IoC.resolve("IoC.RegisterGlobal", Engine, "by type").execute()
+    IoC.resolve(
+        "IoC.RegisterGlobal", "tests.space_battle.test_ioc_instrumentation.Engine", 1
+    ).execute()
+    IoC.resolve("Engine")
+    for _ in range(2):
+        IoC.resolve(Engine)
+    for _ in range(3):
+        IoC.resolve("tests.space_battle.test_ioc_instrumentation.Engine")
+
+    export = instrumentation.export()
+
+    assert len(export) == 3
+    assert export["Engine"]["calls"] == 1
+    assert sorted(stats["calls"] for stats in export.values()) == [1, 2, 3]
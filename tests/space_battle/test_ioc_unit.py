@@ -3,6 +3,7 @@
 Тестируют базовый функционал без многопоточности.
 """
 
+import gc
 from unittest.mock import Mock
 
 import pytest
@@ -10,6 +11,7 @@ import pytest
 from homeworks.space_battle.ioc import (
     ClearScopeCommand,
     IoC,
+    Lifetime,
     NewScopeCommand,
     RegisterCommand,
     SetCurrentScopeCommand,
@@ -267,3 +269,382 @@ def test_scope_nesting():
     assert IoC.resolve("outer_key") == "outer_value"
     with pytest.raises(ValueError):
         IoC.resolve("inner_key")  # Внешний скоуп не видит внутренний
+
+
+def test_reregister_invalidates_cached_resolution():
+    """Повторная регистрация ключа сбрасывает закешированную стратегию."""
+    IoC.resolve("IoC.Register", "cached_key", lambda: "old").execute()
+    assert IoC.resolve("cached_key") == "old"
+
+    IoC.resolve("IoC.Register", "cached_key", lambda: "new").execute()
+
+    assert IoC.resolve("cached_key") == "new"
+
+
+def test_global_registration_invalidates_cached_resolution():
+    """Глобальная регистрация видна сразу, а локальная по-прежнему её перекрывает."""
+    IoC.resolve("IoC.RegisterGlobal", "shared_key", "global_v1").execute()
+    assert IoC.resolve("shared_key") == "global_v1"
+
+    IoC.resolve("IoC.RegisterGlobal", "shared_key", "global_v2").execute()
+    assert IoC.resolve("shared_key") == "global_v2"
+
+    IoC.resolve("IoC.Register", "shared_key", "local").execute()
+    assert IoC.resolve("shared_key") == "local"
+
+
+def test_clear_and_recreate_scope_invalidates_cached_resolution():
+    """После очистки или пересоздания скоупа закешированные стратегии не используются."""
+    IoC.resolve("Scopes.New", "cached_scope").execute()
+    IoC.resolve("Scopes.Current", "cached_scope").execute()
+    IoC.resolve("IoC.Register", "scoped_key", "value").execute()
+    assert IoC.resolve("scoped_key") == "value"
+
+    IoC.resolve("Scopes.New", "cached_scope").execute()
+    with pytest.raises(ValueError):
+        IoC.resolve("scoped_key")
+
+    IoC.resolve("IoC.Register", "scoped_key", "value").execute()
+    IoC.resolve("Scopes.Clear", "cached_scope").execute()
+    IoC.resolve("Scopes.Current", "cached_scope").execute()
+    with pytest.raises(ValueError):
+        IoC.resolve("scoped_key")
+
+
+def test_registration_publishes_new_scope_snapshot():
+    """Регистрация не изменяет уже опубликованные словари скоупа и глобальных стратегий."""
+    IoC.resolve("IoC.Register", "first", "1").execute()
+    IoC.resolve("IoC.RegisterGlobal", "global_first", "1").execute()
+    scope_snapshot = IoC._scopes["root"]
+    global_snapshot = IoC._strategies
+
+    IoC.resolve("IoC.Register", "second", "2").execute()
+    IoC.resolve("IoC.RegisterGlobal", "global_second", "2").execute()
+
+    assert scope_snapshot == {"first": "1"}
+    assert global_snapshot == {"global_first": "1"}
+    assert IoC._scopes["root"] == {"first": "1", "second": "2"}
+    assert IoC._strategies == {"global_first": "1", "global_second": "2"}
+
+
+def test_resolve_does_not_create_scope():
+    """Разрешение в ещё не созданном скоупе не изменяет общее состояние."""
+    IoC.resolve("IoC.RegisterGlobal", "global_key", "value").execute()
+    IoC.resolve("Scopes.Current", "unknown").execute()
+
+    assert IoC.resolve("global_key") == "value"
+    assert "unknown" not in IoC._scopes
+
+
+def test_child_scope_inherits_parent_registrations():
+    """Дочерний скоуп видит регистрации всех предков и может их перекрыть."""
+    IoC.resolve("IoC.RegisterGlobal", "rules", "global_rules").execute()
+    IoC.resolve("Scopes.New", "game").execute()
+    IoC.resolve("Scopes.New", "player", "game").execute()
+    IoC.resolve("Scopes.New", "session", parent_id="player").execute()
+
+    IoC.resolve("Scopes.Current", "game").execute()
+    IoC.resolve("IoC.Register", "map", "game_map").execute()
+    IoC.resolve("IoC.Register", "speed", 1).execute()
+    IoC.resolve("Scopes.Current", "player").execute()
+    IoC.resolve("IoC.Register", "speed", 2).execute()
+
+    IoC.resolve("Scopes.Current", "session").execute()
+    assert IoC.resolve("map") == "game_map"
+    assert IoC.resolve("speed") == 2
+    assert IoC.resolve("rules") == "global_rules"
+
+    IoC.resolve("IoC.Register", "speed", 3).execute()
+    assert IoC.resolve("speed") == 3
+    IoC.resolve("Scopes.Current", "player").execute()
+    assert IoC.resolve("speed") == 2
+    IoC.resolve("Scopes.Current", "game").execute()
+    with pytest.raises(ValueError):
+        IoC.resolve("session_only")
+
+
+def test_ancestor_change_reaches_descendants():
+    """Изменение предка сразу видно во всех потомках с уже построенным представлением."""
+    IoC.resolve("Scopes.New", "game").execute()
+    IoC.resolve("Scopes.New", "player", "game").execute()
+    IoC.resolve("Scopes.New", "session", "player").execute()
+    IoC.resolve("Scopes.Current", "session").execute()
+    with pytest.raises(ValueError):
+        IoC.resolve("map")
+
+    IoC.resolve("Scopes.Current", "game").execute()
+    IoC.resolve("IoC.Register", "map", "v1").execute()
+    IoC.resolve("Scopes.Current", "session").execute()
+    assert IoC.resolve("map") == "v1"
+
+    IoC.resolve("Scopes.Current", "game").execute()
+    IoC.resolve("IoC.Register", "map", "v2").execute()
+    IoC.resolve("Scopes.Current", "session").execute()
+    assert IoC.resolve("map") == "v2"
+
+    IoC.resolve("Scopes.New", "game").execute()
+    assert "player" in IoC._scopes["game"].children
+    with pytest.raises(ValueError):
+        IoC.resolve("map")
+
+
+def test_clear_parent_detaches_children():
+    """После очистки родителя дочерний скоуп сохраняет свои регистрации и теряет унаследованные."""
+    IoC.resolve("Scopes.New", "game").execute()
+    IoC.resolve("Scopes.New", "player", "game").execute()
+    IoC.resolve("Scopes.Current", "game").execute()
+    IoC.resolve("IoC.Register", "map", "game_map").execute()
+    IoC.resolve("Scopes.Current", "player").execute()
+    IoC.resolve("IoC.Register", "name", "player_1").execute()
+    assert IoC.resolve("map") == "game_map"
+
+    IoC.resolve("Scopes.Clear", "game").execute()
+    IoC.resolve("Scopes.New", "game").execute()
+    IoC.resolve("Scopes.Current", "game").execute()
+    IoC.resolve("IoC.Register", "map", "new_map").execute()
+
+    IoC.resolve("Scopes.Current", "player").execute()
+    assert IoC.resolve("name") == "player_1"
+    with pytest.raises(ValueError):
+        IoC.resolve("map")
+
+
+def test_new_scope_with_invalid_parent_raises():
+    """Родитель должен существовать, а цепочка предков не может замыкаться."""
+    with pytest.raises(ValueError, match="не найден"):
+        NewScopeCommand("player", "missing").execute()
+
+    IoC.resolve("Scopes.New", "game").execute()
+    IoC.resolve("Scopes.New", "player", "game").execute()
+    with pytest.raises(ValueError, match="собственным предком"):
+        NewScopeCommand("game", "player").execute()
+    with pytest.raises(ValueError, match="собственным предком"):
+        NewScopeCommand("game", "game").execute()
+
+
+def test_transient_lifetime_calls_factory_each_time():
+    """По умолчанию стратегия вызывается при каждом разрешении."""
+    IoC.resolve("IoC.Register", "transient", object).execute()
+
+    assert IoC.resolve("transient") is not IoC.resolve("transient")
+
+
+def test_singleton_lifetime_creates_instance_once():
+    """Одиночка создаётся при первом разрешении и общий для всех скоупов."""
+    factory = Mock(side_effect=lambda name: {"name": name})
+    IoC.resolve("IoC.RegisterGlobal", "config", factory, Lifetime.SINGLETON).execute()
+    factory.assert_not_called()
+
+    first = IoC.resolve("config", "first")
+    IoC.resolve("Scopes.Current", "other").execute()
+    second = IoC.resolve("config", "second")
+
+    assert first is second
+    assert first == {"name": "first"}
+    factory.assert_called_once()
+
+
+def test_scoped_lifetime_creates_instance_per_scope():
+    """Объект на скоуп переиспользуется внутри скоупа и сбрасывается его очисткой."""
+    IoC.resolve("IoC.RegisterGlobal", "queue", list, Lifetime.SCOPED).execute()
+    IoC.resolve("Scopes.New", "game").execute()
+    IoC.resolve("Scopes.New", "player", "game").execute()
+
+    IoC.resolve("Scopes.Current", "game").execute()
+    game_queue = IoC.resolve("queue")
+    assert IoC.resolve("queue") is game_queue
+
+    IoC.resolve("Scopes.Current", "player").execute()
+    player_queue = IoC.resolve("queue")
+    assert player_queue is not game_queue
+    assert IoC.resolve("queue") is player_queue
+
+    IoC.resolve("Scopes.Clear", "player").execute()
+    assert "player" not in IoC._scoped_instances
+    IoC.resolve("Scopes.Current", "game").execute()
+    assert IoC.resolve("queue") is game_queue
+
+
+def test_scoped_lifetime_rejects_dead_scopes():
+    """Из удалённого или не созданного скоупа объект на скоуп не создаётся и не запоминается."""
+    IoC.resolve("IoC.RegisterGlobal", "queue", list, Lifetime.SCOPED).execute()
+    assert IoC.resolve("queue") is IoC.resolve("queue")
+
+    for scope_id in ("never_created", "removed"):
+        if scope_id == "removed":
+            IoC.resolve("Scopes.New", scope_id).execute()
+            IoC.resolve("Scopes.Clear", scope_id).execute()
+        IoC.resolve("Scopes.Current", scope_id).execute()
+        with pytest.raises(ValueError, match="не существует"):
+            IoC.resolve("queue")
+        assert scope_id not in IoC._scoped_instances
+
+
+def test_lifetime_keeps_plain_values():
+    """Для значения, которое не является стратегией, время жизни ни на что не влияет."""
+    value = {"speed": 1}
+    IoC.resolve("IoC.Register", "value", value, Lifetime.SCOPED).execute()
+
+    assert IoC.resolve("value") is value
+
+
+@pytest.fixture
+def scope_limit():
+    """Сбросить лимит скоупов после теста."""
+    yield IoC.set_scope_limit
+    IoC.set_scope_limit(None)
+
+
+def test_scope_context_manager():
+    """Скоуп из with удаляется на выходе, а текущим снова становится прежний скоуп."""
+    IoC.resolve("Scopes.New", "game").execute()
+    IoC.resolve("Scopes.Current", "game").execute()
+    IoC.resolve("IoC.Register", "map", "game_map").execute()
+
+    with IoC.scope("session", parent_id="game") as scope_id:
+        assert scope_id == "session"
+        assert IoC._current_scope.scope_id == "session"
+        IoC.resolve("IoC.Register", "turn", 1).execute()
+        assert IoC.resolve("map") == "game_map"
+
+    assert "session" not in IoC._scopes
+    assert IoC._current_scope.scope_id == "game"
+    with pytest.raises(ValueError):
+        IoC.resolve("turn")
+
+
+def test_owned_scope_reclaimed_with_owner():
+    """Скоуп, привязанный к владельцу, удаляется после сборки владельца."""
+
+    class Game:
+        pass
+
+    game = Game()
+    IoC.resolve("Scopes.New", "game_1", owner=game).execute()
+    before = IoC.scope_stats()
+    assert before.live == 1
+
+    del game
+    gc.collect()
+    stats = IoC.scope_stats()
+
+    assert "game_1" not in IoC._scopes
+    assert stats.live == 0
+    assert stats.reclaimed == before.reclaimed + 1
+
+
+def test_replaced_scope_is_not_reclaimed_by_previous_owner():
+    """Пересозданный скоуп больше не зависит от владельца прежнего скоупа."""
+
+    class Game:
+        pass
+
+    game = Game()
+    IoC.resolve("Scopes.New", "game_1", owner=game).execute()
+    IoC.resolve("Scopes.New", "game_1").execute()
+
+    del game
+    gc.collect()
+
+    assert IoC.scope_stats().live == 1
+
+
+@pytest.mark.parametrize("new_owner", [True, False])
+def test_scope_recreated_after_owner_collected_survives(new_owner):
+    """Скоуп, пересозданный до удаления осиротевшего, не удаляется вместе с ним."""
+
+    class Game:
+        pass
+
+    game = Game()
+    IoC.resolve("Scopes.New", "game_1", owner=game).execute()
+    reclaimed = IoC.scope_stats().reclaimed
+    del game
+    gc.collect()
+
+    next_game = Game() if new_owner else None
+    IoC.resolve("Scopes.New", "game_1", owner=next_game).execute()
+
+    assert "game_1" in IoC._scopes
+    assert IoC.scope_stats().reclaimed == reclaimed
+    if new_owner:
+        del next_game
+        gc.collect()
+        assert IoC.scope_stats().reclaimed == reclaimed + 1
+        assert "game_1" not in IoC._scopes
+
+
+def test_scope_limit_evicts_least_recently_changed(scope_limit):
+    """При превышении лимита вытесняются давно не изменявшиеся скоупы, но не root и не предки."""
+    IoC.resolve("IoC.Register", "root_key", 1).execute()
+    IoC.resolve("Scopes.New", "game").execute()
+    IoC.resolve("Scopes.New", "old").execute()
+    IoC.resolve("Scopes.New", "recent").execute()
+    IoC.resolve("Scopes.Current", "old").execute()
+    IoC.resolve("IoC.Register", "key", 1).execute()
+    evicted = IoC.scope_stats().evicted
+
+    scope_limit(3)
+    assert set(IoC._scopes) == {"root", "recent", "old"}
+
+    IoC.resolve("Scopes.New", "player", "recent").execute()
+
+    assert set(IoC._scopes) == {"root", "recent", "player"}
+    assert IoC.scope_stats().evicted == evicted + 2
+
+
+def test_scope_stats_counts_bytes():
+    """Размер скоупов растёт вместе с регистрациями."""
+    empty = IoC.scope_stats()
+    IoC.resolve("Scopes.New", "game").execute()
+    IoC.resolve("Scopes.Current", "game").execute()
+    for number in range(100):
+        IoC.resolve("IoC.Register", f"key_{number}", number).execute()
+
+    stats = IoC.scope_stats()
+
+    assert stats.live == 1
+    assert stats.bytes > empty.bytes
+
+
+def test_invalid_scope_limit_raises():
+    with pytest.raises(ValueError):
+        IoC.set_scope_limit(0)
+
+
+def test_compiled_resolver_calls_strategy():
+    """Скомпилированный ключ разрешается с аргументами, как через resolve."""
+    IoC.resolve("IoC.Register", "sum", lambda a, b=0: a + b).execute()
+    IoC.resolve("IoC.Register", "value", 42).execute()
+
+    resolve_sum = IoC.compile("sum")
+    resolve_value = IoC.compile("value")
+
+    assert resolve_sum(1, b=2) == IoC.resolve("sum", 1, b=2) == 3
+    assert resolve_value() == 42
+
+
+def test_compiled_resolver_follows_reregistration():
+    """После новой регистрации скомпилированный ключ использует новую стратегию."""
+    resolver = IoC.compile("speed")
+    with pytest.raises(ValueError):
+        resolver()
+
+    IoC.resolve("IoC.RegisterGlobal", "speed", lambda: 1).execute()
+    assert resolver() == 1
+    IoC.resolve("IoC.Register", "speed", lambda: 2).execute()
+    assert resolver() == 2
+
+
+def test_compiled_resolver_keeps_compile_time_scope():
+    """Скомпилированный ключ привязан к скоупу, текущему при компиляции."""
+    IoC.resolve("Scopes.New", "game").execute()
+    IoC.resolve("Scopes.Current", "game").execute()
+    IoC.resolve("IoC.Register", "map", "game_map").execute()
+    resolver = IoC.compile("map")
+
+    IoC.resolve("Scopes.Current", "root").execute()
+
+    assert resolver() == "game_map"
+    with pytest.raises(ValueError):
+        IoC.resolve("map")
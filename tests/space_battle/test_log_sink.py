@@ -0,0 +1,109 @@
+import io
+import sys
+import threading
+
+import pytest
+
+from homeworks.space_battle.commands import LogCommand
+from homeworks.space_battle.interfaces import CommandInterface
+from homeworks.space_battle.log_sink import LogSink, OverflowPolicy
+
+
+class MoveCommand(CommandInterface):
+    def execute(self) -> None:
+        pass
+
+
+def test_log_command_writes_record_to_sink() -> None:
+    """LogCommand с sink не печатает, а кладёт запись в буфер"""
+    stream = io.StringIO()
+    sink = LogSink(stream)
+    LogCommand(exc=RuntimeError("boom"), command=MoveCommand(), sink=sink).execute()
+
+    assert stream.getvalue() == ""
+    assert len(sink) == 1
+    assert sink.flush() == 1
+    assert stream.getvalue() == "[LOG] Exception in MoveCommand: boom\n"
+    assert len(sink) == 0
+
+
+def test_log_command_without_sink_prints(capsys) -> None:
+    LogCommand(exc=RuntimeError("boom"), command=MoveCommand()).execute()
+    assert capsys.readouterr().out == "[LOG] Exception in MoveCommand: boom\n"
+
+
+@pytest.mark.parametrize(
+    ("overflow", "expected"),
+    [
+        (OverflowPolicy.DROP_NEWEST, ["0", "1", "2"]),
+        (OverflowPolicy.DROP_OLDEST, ["2", "3", "4"]),
+    ],
+)
+def test_overflow_policy(overflow: OverflowPolicy, expected: list[str]) -> None:
+    stream = io.StringIO()
+    sink = LogSink(stream, capacity=3, overflow=overflow)
+    for number in range(5):
+        sink.write(MoveCommand(), RuntimeError(str(number)))
+
+    assert sink.dropped == 2
+    sink.flush()
+    assert [line.rsplit(": ", 1)[1] for line in stream.getvalue().splitlines()] == expected
+
+
+def test_ring_buffer_wraps_around() -> None:
+    stream = io.StringIO()
+    sink = LogSink(stream, capacity=4, overflow=OverflowPolicy.DROP_OLDEST)
+    for number in range(6):
+        sink.write(MoveCommand(), RuntimeError(str(number)))
+    sink.flush()
+    sink.write(MoveCommand(), RuntimeError("6"))
+    sink.flush()
+
+    lines = stream.getvalue().splitlines()
+    assert [line.rsplit(": ", 1)[1] for line in lines] == ["2", "3", "4", "5", "6"]
+    assert sink.written == 5
+
+
+def test_background_writer_flushes_and_close_drains() -> None:
+    """Фоновый поток пишет записи, close дописывает оставшиеся"""
+    stream = io.StringIO()
+    with LogSink(stream, capacity=8, flush_interval=10) as sink:
+        for number in range(100):
+            sink.write(MoveCommand(), RuntimeError(str(number)))
+    assert sink.written + sink.dropped == 100
+    assert len(stream.getvalue().splitlines()) == sink.written
+    assert len(sink) == 0
+
+
+def test_capacity_must_be_positive() -> None:
+    with pytest.raises(ValueError, match="положительным"):
+        LogSink(io.StringIO(), capacity=0)
+
+
+@pytest.mark.parametrize("overflow", list(OverflowPolicy))
+def test_concurrent_writers_account_for_every_record(overflow: OverflowPolicy) -> None:
+    """Каждая запись из нескольких потоков либо записана, либо учтена в dropped"""
+    stream = io.StringIO()
+    sink = LogSink(stream, capacity=8, overflow=overflow, flush_interval=0)
+    writers, per_writer = 8, 5_000
+    command, exc = MoveCommand(), RuntimeError("boom")
+
+    def write() -> None:
+        for _ in range(per_writer):
+            sink.write(command, exc)
+
+    interval = sys.getswitchinterval()
+    # Частое переключение потоков, пока фоновый поток держит буфер почти полным
+    sys.setswitchinterval(1e-6)
+    try:
+        with sink:
+            threads = [threading.Thread(target=write) for _ in range(writers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert sink.written + sink.dropped == writers * per_writer
+    assert sink.written == stream.getvalue().count("\n")
@@ -0,0 +1,63 @@
+import math
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from homeworks.space_battle.models import Angle, Point, Vector
+
+
+@pytest.mark.parametrize("degrees", [0, 1, 45, 90, 179, 180, 270, 359])
+def test_angle_trig_table_matches_math(degrees: int):
+    """Табличные синус и косинус совпадают с math для углов из [0, 360)."""
+    angle = Angle(degrees)
+    assert angle.cos() == math.cos(math.radians(degrees))
+    assert angle.sin() == math.sin(math.radians(degrees))
+
+
+@pytest.mark.parametrize("degrees", [-90, 360, 405, 1000])
+def test_angle_trig_table_normalizes(degrees: int):
+    """Углы вне [0, 360) берутся из таблицы по остатку от деления на 360."""
+    angle = Angle(degrees)
+    assert angle.cos() == angle.normalized().cos()
+    assert angle.sin() == angle.normalized().sin()
+
+
+def test_point_and_vector_are_immutable():
+    point = Point(1, 2)
+    vector = Vector(3, 4)
+    with pytest.raises(FrozenInstanceError):
+        point.x = 5
+    with pytest.raises(FrozenInstanceError):
+        vector.y = 5
+    assert not hasattr(point, "__dict__")
+
+
+def test_point_add_truncates_non_int_components():
+    """Сложение с дробными компонентами по-прежнему даёт целые координаты."""
+    result = Point(1, 2) + Vector(1.7, -0.5)
+    assert result == Point(2, 1)
+    assert type(result.x) is int
+    assert type(result.y) is int
+    assert Vector(1, 1) + Vector(0.5, 2) == Vector(1, 3)
+
+
+def test_add_with_wrong_type_is_not_implemented():
+    with pytest.raises(TypeError):
+        Point(1, 2) + Point(1, 2)
+    with pytest.raises(TypeError):
+        Vector(1, 2) + 1
+
+
+def test_translate():
+    assert Point(1, 2).translate(3, -4) == Point(4, -2)
+    assert Vector(1, 2).translate(1, 1) == Vector(2, 3)
+
+
+def test_angles_in_normal_range_are_interned():
+    """Углы из [0, 360) не создаются заново."""
+    assert Angle.of(90) is Angle.of(90)
+    assert Angle(45) + Angle(45) is Angle.of(90)
+    assert Angle(100) - 10 is Angle.of(90)
+    assert Angle(450).normalized() is Angle.of(90)
+    assert Angle(350) + 20 == 370
+    assert Angle.of(-5) == Angle(-5)
@@ -0,0 +1,224 @@
+import threading
+import time
+from queue import SimpleQueue
+from unittest.mock import Mock
+
+import pytest
+
+from homeworks.space_battle.commands import (
+    LogCommand,
+    RetryIfExceptionCommand,
+    SecondRetryIfExceptionCommand,
+)
+from homeworks.space_battle.handlers import (
+    ExceptionsStorage,
+    RetryIfExceptionHandler,
+    RetryNThenLogExceptionHandler,
+    RetryTwiceThenLogExceptionHandler,
+)
+from homeworks.space_battle.interfaces import CommandInterface
+from homeworks.space_battle.retry import Backoff, RetryScheduler
+from homeworks.space_battle.server import GameServer, SoftStopCommand
+
+
+@pytest.fixture
+def scheduler(clock) -> RetryScheduler:
+    return RetryScheduler(SimpleQueue(), clock=clock)
+
+
+def test_backoff_grows_exponentially_up_to_max() -> None:
+    backoff = Backoff(base=0.01, factor=2.0, max_delay=0.05, jitter=0)
+    assert [backoff.delay(attempt) for attempt in range(1, 5)] == [0.01, 0.02, 0.04, 0.05]
+    assert backoff.delay(10_000) == 0.05
+
+
+def test_backoff_jitter_stays_in_range() -> None:
+    backoff = Backoff(base=1.0, jitter=0.25, max_delay=10)
+    delays = [backoff.delay(1) for _ in range(200)]
+    assert all(0.75 <= delay <= 1.25 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_scheduler_promotes_only_due_commands(scheduler: RetryScheduler, clock) -> None:
+    """Повтор попадает в очередь сервера только после истечения задержки, по порядку сроков"""
+    late, early = Mock(spec=CommandInterface), Mock(spec=CommandInterface)
+    scheduler.schedule(late, 0.2)
+    scheduler.schedule(early, 0.1)
+
+    assert scheduler.promote_due() == pytest.approx(0.1)
+    assert scheduler.queue.empty()
+
+    clock.now = 0.15
+    assert scheduler.promote_due() == pytest.approx(0.05)
+    assert scheduler.queue.get_nowait() is early
+    assert len(scheduler) == 1
+
+    clock.now = 1.0
+    assert scheduler.promote_due() is None
+    assert scheduler.queue.get_nowait() is late
+    assert len(scheduler) == 0
+
+
+def test_handler_defers_retry_with_backoff(scheduler: RetryScheduler, clock) -> None:
+    """Обработчик с планировщиком не ставит повтор в очередь сразу"""
+    queue: SimpleQueue = SimpleQueue()
+    handler = RetryTwiceThenLogExceptionHandler(
+        queue=queue, scheduler=scheduler, backoff=Backoff(base=1.0, jitter=0, max_delay=10)
+    )
+    command = Mock(spec=CommandInterface)
+
+    handler.handle(exc=RuntimeError(), command=command)
+    assert queue.empty()
+    clock.now = 1.0
+    scheduler.promote_due()
+    first = scheduler.queue.get_nowait()
+    assert isinstance(first, RetryIfExceptionCommand)
+
+    # Вторая попытка ждёт вдвое дольше
+    handler.handle(exc=RuntimeError(), command=first)
+    clock.now = 2.5
+    scheduler.promote_due()
+    assert scheduler.queue.empty()
+    clock.now = 3.0
+    scheduler.promote_due()
+    assert isinstance(scheduler.queue.get_nowait(), SecondRetryIfExceptionCommand)
+
+
+def test_handler_without_scheduler_retries_immediately() -> None:
+    queue: SimpleQueue = SimpleQueue()
+    RetryIfExceptionHandler(queue=queue).handle(
+        exc=RuntimeError(), command=Mock(spec=CommandInterface)
+    )
+    assert isinstance(queue.get_nowait(), RetryIfExceptionCommand)
+
+
+def test_tick_promotes_due_retries(clock) -> None:
+    server = GameServer()
+    server.retry_scheduler = RetryScheduler(server.queue, clock=clock)
+    command = Mock(spec=CommandInterface)
+    server.retry_scheduler.schedule(command, 0.5)
+
+    assert server.run_tick().executed == 0
+    clock.now = 0.5
+    assert server.run_tick().executed == 1
+    command.execute.assert_called_once()
+
+
+def test_soft_stop_waits_for_delayed_retries() -> None:
+    """Непрерывный режим дожидается отложенного повтора и выполняет его до остановки"""
+    server = GameServer()
+    server.retry_scheduler = RetryScheduler(server.queue)
+    command = Mock(spec=CommandInterface)
+    server.retry_scheduler.schedule(command, 0.01)
+    server.put(SoftStopCommand(server=server))
+
+    server.run()
+
+    command.execute.assert_called_once()
+    assert len(server.retry_scheduler) == 0
+
+
+class FlakyCommand(CommandInterface):
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    def execute(self) -> None:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("temporarily unavailable")
+
+
+@pytest.fixture
+def storage():
+    ExceptionsStorage.clear()
+    yield ExceptionsStorage
+    ExceptionsStorage.clear()
+
+
+@pytest.mark.parametrize("registered", [FlakyCommand, CommandInterface])
+@pytest.mark.parametrize(("failures", "logged"), [(2, False), (3, True)])
+def test_server_retries_through_registered_handler(
+    storage, capsys, registered, failures, logged
+) -> None:
+    """Упавший повторитель попадает в обработчик, зарегистрированный для исходной команды"""
+    server = GameServer()
+    server.retry_scheduler = RetryScheduler(server.queue)
+    handler = RetryTwiceThenLogExceptionHandler(
+        queue=server.queue,
+        scheduler=server.retry_scheduler,
+        backoff=Backoff(base=0.001, jitter=0),
+    )
+    storage.register(registered, RuntimeError, handler)
+    command = FlakyCommand(failures)
+    server.put(command)
+    server.put(SoftStopCommand(server=server))
+
+    server.run()
+
+    assert command.calls == 3
+    assert ("[LOG] Exception in FlakyCommand" in capsys.readouterr().out) is logged
+
+
+def test_loop_notices_retry_scheduled_from_other_thread() -> None:
+    """Поток, ждущий пустую очередь, выполняет повтор, поставленный из другого потока"""
+    server = GameServer()
+    server.retry_scheduler = RetryScheduler(server.queue)
+    executed = threading.Event()
+    command = Mock(spec=CommandInterface)
+    command.execute.side_effect = executed.set
+    server.start()
+    try:
+        time.sleep(0.02)
+        server.retry_scheduler.schedule(command, 0.0)
+        assert executed.wait(1.0)
+    finally:
+        server.hard_stop()
+        server.put(SoftStopCommand(server=server))
+        server.join(1.0)
+
+
+def test_server_retry_n_starts_over_after_recovery(storage) -> None:
+    """Ошибка → успешный повтор → ошибка: вторая серия снова получает все повторы"""
+    server = GameServer()
+    handler = RetryNThenLogExceptionHandler(queue=server.queue, retries=2)
+    storage.register(FlakyCommand, RuntimeError, handler)
+    sink = Mock()
+    command = FlakyCommand(failures=1)
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(LogCommand, "sink", sink)
+        server.put(command)
+        while not server.queue.empty():
+            server.run_tick()
+        assert command.calls == 2
+
+        command.failures = 5
+        server.put(command)
+        while not server.queue.empty():
+            server.run_tick()
+
+    # Исходное выполнение и два повтора, затем запись в лог
+    assert command.calls == 5
+    sink.write.assert_called_once()
+
+
+def test_server_retry_n_logs_every_command_in_flight(storage) -> None:
+    """Сколько бы команд ни падало одновременно, каждая получает retries повторов и лог"""
+    server = GameServer()
+    storage.register(
+        FlakyCommand, RuntimeError, RetryNThenLogExceptionHandler(queue=server.queue, retries=2)
+    )
+    sink = Mock()
+    commands = [FlakyCommand(failures=10) for _ in range(100)]
+    for command in commands:
+        server.put(command)
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(LogCommand, "sink", sink)
+        for _ in range(10):
+            server.run_tick()
+
+    assert server.queue.empty()
+    assert [command.calls for command in commands] == [3] * 100
+    assert sink.write.call_count == 100
@@ -0,0 +1,270 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from homeworks.space_battle.commands import LowPriorityCommand
+from homeworks.space_battle.handlers import ExceptionsStorage
+from homeworks.space_battle.interfaces import CommandInterface
+from homeworks.space_battle.server import (
+    GameServer,
+    HardStopCommand,
+    PauseCommand,
+    ResumeCommand,
+    ServerState,
+    SoftStopCommand,
+    TickConfig,
+)
+from tests.space_battle.helpers import RecordCommand
+
+
+@pytest.fixture(autouse=True)
+def clear_storage():
+    ExceptionsStorage.clear()
+    yield
+    ExceptionsStorage.clear()
+
+
+def test_run_executes_commands_until_soft_stop():
+    """Мягкая остановка дожидается выполнения всех команд из очереди."""
+    log: list[int] = []
+    server = GameServer()
+    server.put(RecordCommand(log, 1))
+    server.put(SoftStopCommand(server=server))
+    server.put(RecordCommand(log, 2))
+    server.put(RecordCommand(log, 3))
+
+    server.run()
+
+    assert log == [1, 2, 3]
+    assert server.state is ServerState.SOFT_STOP
+
+
+def test_hard_stop_leaves_rest_of_queue():
+    """Жёсткая остановка не выполняет оставшиеся в очереди команды."""
+    log: list[int] = []
+    server = GameServer()
+    server.put(RecordCommand(log, 1))
+    server.put(HardStopCommand(server=server))
+    server.put(RecordCommand(log, 2))
+
+    server.run()
+
+    assert log == [1]
+    assert not server.queue.empty()
+
+
+def test_exception_dispatched_through_storage():
+    """Обработчик исключения выбирается через ExceptionsStorage."""
+    server = GameServer()
+    exc = RuntimeError("boom")
+    failing = Mock(spec=CommandInterface)
+    failing.execute.side_effect = exc
+    handler = Mock()
+    ExceptionsStorage.register(failing, exc, handler)
+
+    server.put(failing)
+    server.put(SoftStopCommand(server=server))
+    server.run()
+
+    handler.handle.assert_called_once_with(exc=exc, command=failing)
+
+
+def test_default_handler_enqueues_log_command(capsys):
+    """Без зарегистрированного обработчика исключение пишется в лог через очередь."""
+    server = GameServer()
+    failing = Mock(spec=CommandInterface)
+    failing.execute.side_effect = RuntimeError("boom")
+
+    server.put(failing)
+    server.put(SoftStopCommand(server=server))
+    server.run()
+
+    assert "[LOG] Exception in" in capsys.readouterr().out
+
+
+def test_failing_handler_does_not_stop_worker(capsys):
+    """Ошибка в обработчике уходит обработчику по умолчанию, а поток продолжает работу."""
+    log: list[int] = []
+    default_handler = Mock()
+    server = GameServer(default_handler=default_handler)
+    failing = Mock(spec=CommandInterface)
+    error = RuntimeError("boom")
+    failing.execute.side_effect = error
+    handler_error = ValueError("handler bug")
+    ExceptionsStorage.register(failing, error, Mock(handle=Mock(side_effect=handler_error)))
+
+    server.put(failing)
+    server.put(RecordCommand(log, 1))
+    server.start()
+    server.put(SoftStopCommand(server=server))
+    server.join(timeout=5)
+
+    assert log == [1]
+    assert server._threads == []
+    default_handler.handle.assert_called_once_with(exc=handler_error, command=failing)
+
+    default_handler.handle.side_effect = KeyError("default bug")
+    server = GameServer(default_handler=default_handler)
+    server.put(failing)
+    server.put(RecordCommand(log, 2))
+    server.put(SoftStopCommand(server=server))
+    server.run()
+
+    assert log == [1, 2]
+    assert "[LOG] Exception in handler for" in capsys.readouterr().out
+
+
+def test_workers_must_be_positive():
+    with pytest.raises(ValueError):
+        GameServer(workers=0)
+
+
+def test_multiple_workers_soft_stop():
+    """Несколько потоков выполняют все команды и завершаются после мягкой остановки."""
+    log: list[int] = []
+    server = GameServer(workers=4)
+    server.start()
+    for value in range(1000):
+        server.put(RecordCommand(log, value))
+    server.put(SoftStopCommand(server=server))
+    server.join(timeout=5)
+
+    assert sorted(log) == list(range(1000))
+    assert server._threads == []
+
+
+def test_start_twice_raises():
+    server = GameServer()
+    server.start()
+    with pytest.raises(RuntimeError):
+        server.start()
+    server.put(HardStopCommand(server=server))
+    server.join(timeout=5)
+
+
+def test_pause_and_resume():
+    """После PauseCommand очередь не обрабатывается до ResumeCommand."""
+    log: list[int] = []
+    executed = threading.Event()
+    server = GameServer()
+    server.start()
+    server.put(PauseCommand(server=server))
+    server.put(RecordCommand(log, 1))
+    server.put(Mock(spec=CommandInterface, execute=executed.set))
+
+    assert not executed.wait(timeout=0.1)
+    assert server.state is ServerState.PAUSED
+    assert log == []
+
+    ResumeCommand(server=server).execute()
+    assert executed.wait(timeout=5)
+    assert log == [1]
+
+    server.put(HardStopCommand(server=server))
+    server.join(timeout=5)
+    assert server._threads == []
+
+
+def test_tick_executes_within_budget_and_defers_rest():
+    """Команды, не уложившиеся в бюджет тика, переносятся на следующий тик."""
+    log: list[int] = []
+    server = GameServer(tick_config=TickConfig(budget=0.0))
+    for value in range(3):
+        server.put(RecordCommand(log, value))
+
+    stats = server.run_tick()
+
+    assert stats.executed == 0
+    assert stats.deferred == 3
+
+    server.tick_config = TickConfig(budget=1.0)
+    stats = server.run_tick()
+
+    assert stats.executed == 3
+    assert stats.deferred == 0
+    assert log == [0, 1, 2]
+
+
+def test_tick_does_not_execute_commands_enqueued_during_tick():
+    """Команды, поставленные во время тика, выполняются в следующем тике."""
+    log: list[str] = []
+    server = GameServer(tick_config=TickConfig(budget=1.0))
+
+    class EnqueueCommand(CommandInterface):
+        def execute(self) -> None:
+            log.append("first")
+            server.put(RecordCommand(log, "second"))
+
+    server.put(EnqueueCommand())
+
+    assert server.run_tick().executed == 1
+    assert log == ["first"]
+    assert server.run_tick().executed == 1
+    assert log == ["first", "second"]
+
+
+def test_tick_sheds_low_priority_over_watermark():
+    """При очереди длиннее порога низкоприоритетные команды отбрасываются или упрощаются."""
+    log: list[str] = []
+    server = GameServer(tick_config=TickConfig(budget=1.0, shed_watermark=2))
+    server.put(RecordCommand(log, "normal"))
+    server.put(LowPriorityCommand(command=RecordCommand(log, "dropped")))
+    server.put(
+        LowPriorityCommand(
+            command=RecordCommand(log, "full"), degraded=RecordCommand(log, "degraded")
+        )
+    )
+
+    stats = server.run_tick()
+
+    assert log == ["normal", "degraded"]
+    assert stats.executed == 2
+    assert stats.dropped == 1
+    assert stats.degraded == 1
+
+
+def test_tick_keeps_low_priority_under_watermark():
+    log: list[str] = []
+    server = GameServer(tick_config=TickConfig(budget=1.0, shed_watermark=5))
+    server.put(LowPriorityCommand(command=RecordCommand(log, "low")))
+
+    stats = server.run_tick()
+
+    assert log == ["low"]
+    assert stats.dropped == 0
+
+
+def test_run_ticks_until_soft_stop_and_summary():
+    log: list[int] = []
+    server = GameServer(tick_config=TickConfig(budget=1.0))
+    server.put(RecordCommand(log, 1))
+    server.put(SoftStopCommand(server=server))
+    server.put(RecordCommand(log, 2))
+
+    server.run_ticks(interval=0.001)
+
+    summary = server.tick_summary()
+    assert log == [1, 2]
+    assert summary.ticks == 1
+    assert summary.executed == 3
+    assert summary.dropped == 0
+    assert 0 < summary.p50 <= summary.p99
+
+
+def test_run_ticks_hard_stop_interrupts_tick():
+    log: list[int] = []
+    server = GameServer(tick_config=TickConfig(budget=1.0))
+    server.put(HardStopCommand(server=server))
+    server.put(RecordCommand(log, 1))
+
+    server.run_ticks()
+
+    assert log == []
+    assert server.ticks[-1].deferred == 1
+
+
+def test_tick_summary_empty():
+    summary = GameServer().tick_summary()
+    assert summary.ticks == 0
+    assert summary.p50 == summary.p99 == 0.0
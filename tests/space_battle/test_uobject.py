@@ -0,0 +1,217 @@
+import pytest
+
+from homeworks.space_battle.actions import Move
+from homeworks.space_battle.adapters import MovingObjectAdapter, RotatableObjectAdapter
+from homeworks.space_battle.commands import MoveWithFuelMacroCommand, RotateCommand
+from homeworks.space_battle.exceptions import CommandException
+from homeworks.space_battle.models import Angle, Point, Vector
+from homeworks.space_battle.uobject import ChangeTracker, SchemaUObject, UObject, UObjectSchema
+
+SHIP = UObjectSchema(("location", "angle", "velocity", "fuel", "fuel_burn_rate"))
+
+
+def test_schema_offsets():
+    assert len(SHIP) == 5
+    assert SHIP.offset("location") == 0
+    assert SHIP.offset("fuel_burn_rate") == 4
+    with pytest.raises(KeyError):
+        SHIP.offset("shield")
+
+
+def test_schema_duplicate_properties_raises():
+    with pytest.raises(ValueError):
+        UObjectSchema(("location", "location"))
+
+
+def test_schema_object_keeps_property_api():
+    ship = SHIP.create(location=Point(1, 2), fuel=10)
+
+    assert isinstance(ship, SchemaUObject)
+    assert ship.schema is SHIP
+    assert ship.get_property("location") == Point(1, 2)
+    assert ship.get_property("angle") is None
+    assert ship.get_slot(SHIP.offset("fuel")) == 10
+
+    ship.set_slot(SHIP.offset("fuel"), 7)
+    assert ship.get_property("fuel") == 7
+
+
+def test_schema_object_stores_undeclared_properties():
+    ship = SHIP.create()
+    assert ship.get_property("shield") is None
+
+    ship.set_property("shield", 3)
+
+    assert ship.get_property("shield") == 3
+
+
+@pytest.mark.parametrize("make", [UObject, SHIP.create])
+def test_bound_accessors(make):
+    ship = make()
+    get_fuel = ship.property_getter("fuel")
+    set_fuel = ship.property_setter("fuel")
+    get_shield = ship.property_getter("shield")
+    set_shield = ship.property_setter("shield")
+
+    set_fuel(5)
+    set_shield(1)
+
+    assert get_fuel() == 5
+    assert ship.get_property("fuel") == 5
+    assert get_shield() == 1
+    ship.set_property("fuel", 2)
+    assert get_fuel() == 2
+
+
+def test_commands_on_schema_object():
+    ship = SHIP.create(location=Point(0, 0), angle=Angle(90), velocity=4, fuel=3, fuel_burn_rate=2)
+    moving = MovingObjectAdapter(ship)
+
+    MoveWithFuelMacroCommand(uobj=ship, moving=moving).execute()
+    assert ship.get_property("location") == Point(0, 4)
+    assert ship.get_property("fuel") == 1
+    with pytest.raises(CommandException):
+        MoveWithFuelMacroCommand(uobj=ship, moving=moving).execute()
+
+    RotateCommand(rotatable=RotatableObjectAdapter(ship), delta_angle=Angle(90)).execute()
+    Move(moving).execute()
+    assert moving.get_velocity() == Vector(-4, 0)
+    assert ship.get_property("location") == Point(-4, 4)
+
+
+@pytest.mark.parametrize("make", [UObject, SHIP.create])
+def test_dirty_properties(make):
+    ship = make()
+    assert ship.drain_changes() == frozenset()
+
+    ship.set_property("fuel", 1)
+    ship.property_setter("location")(Point(0, 0))
+    ship.set_property("fuel", 2)
+
+    assert ship.dirty_properties == {"fuel", "location"}
+    assert ship.drain_changes() == {"fuel", "location"}
+    assert ship.dirty_properties == frozenset()
+
+
+def test_change_tracker_lists_each_changed_object_once():
+    tracker = ChangeTracker()
+    idle, moved, fuelled = UObject(), SHIP.create(), UObject()
+    for ship in (idle, moved, fuelled):
+        tracker.track(ship)
+
+    MovingObjectAdapter(moved).set_location(Point(1, 1))
+    moved.set_slot(SHIP.offset("fuel"), 5)
+    fuelled.set_property("fuel", 3)
+    fuelled.set_property("fuel", 4)
+
+    assert len(tracker) == 2
+    assert tracker.drain() == [(moved, {"location", "fuel"}), (fuelled, {"fuel"})]
+    assert tracker.drain() == []
+
+    fuelled.set_property("fuel", 5)
+    assert tracker.drain() == [(fuelled, {"fuel"})]
+
+
+def test_change_tracker_track_and_untrack():
+    tracker = ChangeTracker()
+    ship = UObject()
+    ship.set_property("fuel", 1)
+
+    tracker.track(ship)
+    tracker.track(ship)
+    assert tracker.drain() == [(ship, {"fuel"})]
+
+    tracker.untrack(ship)
+    ship.set_property("fuel", 2)
+    assert tracker.drain() == []
+    assert ship.dirty_properties == {"fuel"}
+
+
+@pytest.mark.parametrize("make", [UObject, SHIP.create])
+def test_velocity_cache_is_not_tracked(make):
+    """Кеш вектора скорости не свойство: не попадает в дельты и не читается через get_property"""
+    tracker = ChangeTracker()
+    ship = make()
+    ship.set_property("location", Point(0, 0))
+    ship.set_property("angle", Angle(0))
+    ship.set_property("velocity", 3)
+    tracker.track(ship)
+    tracker.drain()
+
+    Move(MovingObjectAdapter(ship)).execute()
+
+    assert tracker.drain() == [(ship, {"location"})]
+    assert ship.get_property("velocity_cache") is None
+    assert ship.cache
+
+
+def test_direct_drain_does_not_enqueue_object_twice():
+    tracker = ChangeTracker()
+    ship = UObject()
+    tracker.track(ship)
+    ship.set_property("fuel", 1)
+    assert ship.drain_changes() == {"fuel"}
+
+    ship.set_property("fuel", 2)
+    assert len(tracker) == 1
+    assert tracker.drain() == [(ship, {"fuel"})]
+
+
+def make_template() -> UObject:
+    template = UObject()
+    template.set_property("velocity", 4)
+    template.set_property("fuel_burn_rate", 1)
+    template.set_property("angle", Angle(0))
+    return template
+
+
+def test_prototype_reads_fall_through():
+    template = make_template()
+    ship = UObject(prototype=template)
+
+    assert ship.prototype is template
+    assert ship.get_property("velocity") == 4
+    assert ship.get_property("shield") is None
+    assert not ship.has_own_property("velocity")
+
+    template.set_property("velocity", 6)
+    assert ship.get_property("velocity") == 6
+
+
+def test_schema_object_has_own_property():
+    ship = UObjectSchema(("location",)).create()
+
+    assert ship.has_own_property("location")
+    assert not ship.has_own_property("fuel")
+    ship.set_property("fuel", 10)
+    assert ship.has_own_property("fuel")
+
+
+def test_prototype_copy_on_write_per_key():
+    template = make_template()
+    ship = UObject(prototype=template)
+    other = UObject(prototype=template)
+    get_velocity = ship.property_getter("velocity")
+
+    ship.property_setter("velocity")(9)
+
+    assert ship.has_own_property("velocity")
+    assert not ship.has_own_property("fuel_burn_rate")
+    assert get_velocity() == 9
+    assert template.get_property("velocity") == 4
+    assert other.get_property("velocity") == 4
+    assert ship.dirty_properties == {"velocity"}
+
+
+def test_prototype_chain_and_commands():
+    base = make_template()
+    fighter = UObject(prototype=base)
+    fighter.set_property("fuel", 2)
+    ship = UObject(prototype=fighter)
+    ship.set_property("location", Point(0, 0))
+
+    MoveWithFuelMacroCommand(uobj=ship, moving=MovingObjectAdapter(ship)).execute()
+
+    assert ship.get_property("location") == Point(4, 0)
+    assert ship.get_property("fuel") == 1
+    assert fighter.get_property("fuel") == 2
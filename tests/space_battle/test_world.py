@@ -0,0 +1,190 @@
+import random
+
+import pytest
+
+from homeworks.space_battle.actions import Move
+from homeworks.space_battle.adapters import MovingObjectAdapter, RotatableObjectAdapter
+from homeworks.space_battle.commands import (
+    MoveAllCommand,
+    MoveWithFuelBatchCommand,
+    MoveWithFuelMacroCommand,
+    RotateBatchCommand,
+    RotateCommand,
+)
+from homeworks.space_battle.exceptions import CommandException
+from homeworks.space_battle.models import Angle, Point, Vector
+from homeworks.space_battle.uobject import UObject
+from homeworks.space_battle.world import World
+
+
+def make_ship(location: Point, angle: Angle, velocity: float, fuel: int | None = None) -> UObject:
+    ship = UObject()
+    ship.set_property("location", location)
+    ship.set_property("angle", angle)
+    ship.set_property("velocity", velocity)
+    ship.set_property("fuel", fuel)
+    return ship
+
+
+def make_fleet(size: int, seed: int = 42) -> tuple[World, list[UObject]]:
+    rnd = random.Random(seed)  # noqa: S311
+    world = World()
+    ships = []
+    for ship_id in range(size):
+        location = Point(rnd.randint(-1000, 1000), rnd.randint(-1000, 1000))
+        angle = Angle(rnd.randint(-720, 720))
+        velocity = rnd.choice([rnd.randint(0, 50), rnd.uniform(0, 50)])
+        ship = make_ship(location, angle, velocity)
+        world.add(ship_id, ship)
+        ships.append(ship)
+    return world, ships
+
+
+def test_move_all_matches_move_action():
+    """Пакетное движение побитно совпадает с Move через MovingObjectAdapter."""
+    world, ships = make_fleet(500)
+
+    for _ in range(5):
+        MoveAllCommand(world=world).execute()
+        for ship in ships:
+            Move(MovingObjectAdapter(ship)).execute()
+
+    for ship_id, ship in enumerate(ships):
+        assert world.get_location(ship_id) == ship.get_property("location")
+
+
+def test_rotate_batch_matches_rotate_command():
+    """Пакетный поворот с последующим движением совпадает с покомандной обработкой."""
+    world, ships = make_fleet(300)
+    delta = Angle(37)
+
+    RotateBatchCommand(world=world, delta_angle=delta).execute()
+    MoveAllCommand(world=world).execute()
+    for ship in ships:
+        RotateCommand(rotatable=RotatableObjectAdapter(ship), delta_angle=delta).execute()
+        Move(MovingObjectAdapter(ship)).execute()
+
+    for ship_id, ship in enumerate(ships):
+        assert world.get_angle(ship_id) == ship.get_property("angle")
+        assert world.get_location(ship_id) == ship.get_property("location")
+
+
+def test_rotate_batch_subset():
+    world = World()
+    world.add("a", make_ship(Point(0, 0), Angle(0), 10))
+    world.add("b", make_ship(Point(0, 0), Angle(0), 10))
+
+    RotateBatchCommand(world=world, delta_angle=Angle(90), object_ids=["b"]).execute()
+
+    assert world.get_angle("a") == 0
+    assert world.get_angle("b") == 90
+    assert world.get_velocity("a") == Vector(10, 0)
+    assert world.get_velocity("b") == Vector(0, 10)
+
+
+def test_setters_recompute_velocity():
+    world = World()
+    world.add("ship", make_ship(Point(1, 1), Angle(0), 5))
+
+    world.set_velocity("ship", 7)
+    assert world.get_velocity("ship") == Vector(7, 0)
+
+    world.set_angle("ship", Angle(180))
+    assert world.get_velocity("ship") == Vector(-7, 0)
+
+    world.set_location("ship", Point(3, 4))
+    MoveAllCommand(world=world).execute()
+    assert world.get_location("ship") == Point(-4, 4)
+
+
+def test_remove_keeps_rows_consistent():
+    world = World()
+    for ship_id in range(3):
+        world.add(ship_id, make_ship(Point(ship_id, 0), Angle(0), 1, fuel=ship_id))
+
+    world.remove(0)
+
+    assert len(world) == 2
+    assert 0 not in world
+    assert world.get_location(2) == Point(2, 0)
+    assert world.get_fuel(2) == 2
+    assert world.row(2) == 0
+
+    world.remove(1)
+    world.set_fuel(2, 9)
+    assert world.ids == [2]
+    assert world.get_fuel(2) == 9
+
+
+def test_add_duplicate_raises():
+    world = World()
+    ship = make_ship(Point(0, 0), Angle(0), 1)
+    world.add("ship", ship)
+    with pytest.raises(ValueError):
+        world.add("ship", ship)
+
+
+def test_add_without_location_raises():
+    ship = UObject()
+    ship.set_property("angle", Angle(0))
+    with pytest.raises(ValueError):
+        World().add("ship", ship)
+
+
+def make_fuel_fleet(size: int, seed: int = 7) -> tuple[World, list[UObject]]:
+    rnd = random.Random(seed)  # noqa: S311
+    world = World()
+    ships = []
+    for ship_id in range(size):
+        ship = make_ship(
+            Point(rnd.randint(-100, 100), rnd.randint(-100, 100)),
+            Angle(rnd.randint(0, 359)),
+            rnd.randint(1, 20),
+            fuel=rnd.randint(0, 10),
+        )
+        ship.set_property("fuel_burn_rate", rnd.randint(0, 5))
+        world.add(ship_id, ship)
+        ships.append(ship)
+    return world, ships
+
+
+def test_move_with_fuel_batch_matches_macro_command():
+    """Пакетное движение с расходом топлива совпадает с MoveWithFuelMacroCommand."""
+    world, ships = make_fuel_fleet(300)
+    batch = MoveWithFuelBatchCommand(world=world)
+
+    for _ in range(4):
+        batch.execute()
+        expected_failed = []
+        for ship_id, ship in enumerate(ships):
+            try:
+                MoveWithFuelMacroCommand(uobj=ship, moving=MovingObjectAdapter(ship)).execute()
+            except CommandException:
+                expected_failed.append(ship_id)
+        assert batch.failed_ids == expected_failed
+
+    for ship_id, ship in enumerate(ships):
+        assert world.get_location(ship_id) == ship.get_property("location")
+        assert world.get_fuel(ship_id) == ship.get_property("fuel")
+
+
+def test_move_with_fuel_batch_reports_empty_tanks():
+    world = World()
+    full = make_ship(Point(0, 0), Angle(0), 5, fuel=3)
+    full.set_property("fuel_burn_rate", 2)
+    empty = make_ship(Point(0, 0), Angle(0), 5, fuel=1)
+    empty.set_property("fuel_burn_rate", 2)
+    world.add("full", full)
+    world.add("empty", empty)
+
+    command = MoveWithFuelBatchCommand(world=world)
+    command.execute()
+
+    assert command.failed_ids == ["empty"]
+    assert world.get_location("full") == Point(5, 0)
+    assert world.get_fuel("full") == 1
+    assert world.get_location("empty") == Point(0, 0)
+    assert world.get_fuel("empty") == 1
+
+    command.execute()
+    assert command.failed_ids == ["full", "empty"]